@@ -0,0 +1,271 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+from app.core.schemas import AnalysisSignal, BehaviorType, RiskEvent, RiskLevel
+from app.config import settings
+
+# Risk level codes of BatchRiskEngine.levels
+LEVELS = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH)
+# Detection kinds of the object rules
+PERSON, FORBIDDEN = 1, 2
+# (present, yaw, pitch) of a frame without a face
+NO_POSE = (0.0, 0.0, 0.0)
+
+def _slots(slots: Optional[Sequence[int]], count: int) -> np.ndarray:
+    return np.arange(count) if slots is None else np.asarray(slots, dtype=np.intp)
+
+class BatchBehaviorAnalyzer:
+    """
+    BehaviorAnalyzer for many sessions at once (struct of arrays).
+    - Each session owns a slot; its counters live in one NumPy array per counter.
+    - analyze() takes one frame per session and updates every session's face counters
+      (no face / yaw / pitch) in one vectorized pass; object and audio rules are
+      stateless and vectorized over the flattened detections.
+    - Signals are identical to the scalar analyzer's, in the same order (the order of
+      each session's results_map). Custom handlers (register_handler) are not supported.
+    """
+    def __init__(self, size: int = 0):
+        self.frames_no_face = np.zeros(size, dtype=np.int64)
+        self.frames_looking_away = np.zeros(size, dtype=np.int64)
+        self.frames_pitch_violation = np.zeros(size, dtype=np.int64)
+
+    @property
+    def size(self) -> int:
+        return len(self.frames_no_face)
+
+    def ensure_size(self, size: int):
+        """Grows the counter arrays to `size` slots (new slots start reset)"""
+        extra = size - self.size
+        if extra > 0:
+            pad = np.zeros(extra, dtype=np.int64)
+            self.frames_no_face = np.concatenate([self.frames_no_face, pad])
+            self.frames_looking_away = np.concatenate([self.frames_looking_away, pad])
+            self.frames_pitch_violation = np.concatenate([self.frames_pitch_violation, pad])
+
+    def reset(self, slot: Optional[int] = None):
+        """Resets one slot's counters (None = every slot)"""
+        index = slice(None) if slot is None else slot
+        self.frames_no_face[index] = 0
+        self.frames_looking_away[index] = 0
+        self.frames_pitch_violation[index] = 0
+
+    def _face_signals(self, slots: np.ndarray, timestamps: Sequence[float], rows: List[int],
+                      faces: list, poses: List[float]) -> Dict[int, list]:
+        if not rows:
+            return {}
+        index = slots[rows]
+        poses = np.array(poses, dtype=np.float64).reshape(-1, 3)
+        present, yaw, pitch = poses[:, 0] > 0, poses[:, 1], poses[:, 2]
+
+        # 1. Counters: each one counts up while its condition holds and resets when a face
+        #    is present without it; a missing face leaves yaw / pitch counters untouched
+        no_face = np.where(present, 0, self.frames_no_face[index] + 1)
+        away = present & (np.abs(yaw) > settings.face.yaw_threshold)
+        looking_away = np.where(away, self.frames_looking_away[index] + 1,
+                                np.where(present, 0, self.frames_looking_away[index]))
+        off_pitch = present & ((pitch < -settings.face.pitch_threshold_up) | (pitch > settings.face.pitch_threshold_down))
+        pitch_violation = np.where(off_pitch, self.frames_pitch_violation[index] + 1,
+                                   np.where(present, 0, self.frames_pitch_violation[index]))
+        self.frames_no_face[index] = no_face
+        self.frames_looking_away[index] = looking_away
+        self.frames_pitch_violation[index] = pitch_violation
+
+        # 2. Signals where a counter is over its limit
+        risk = settings.risk
+        fire_no_face = ~present & (no_face > risk.max_frames_missing_face)
+        fire_away = away & (looking_away > risk.max_frames_looking_away)
+        fire_pitch = off_pitch & (pitch_violation > risk.max_frames_pitch_violation)
+        signals = {}
+        for i in np.flatnonzero(fire_no_face | fire_away | fire_pitch).tolist():
+            row, face, found = rows[i], faces[i], []
+            if fire_no_face[i]:
+                found.append(AnalysisSignal(
+                    behavior_type=BehaviorType.FACE_NOT_VISIBLE,
+                    detected_at=timestamps[row],
+                    details=f"Face missing for {no_face[i]} frames",
+                    severity=RiskLevel.MEDIUM
+                ))
+            if fire_away[i]:
+                found.append(AnalysisSignal(
+                    behavior_type=BehaviorType.LOOKING_AWAY,
+                    detected_at=timestamps[row],
+                    details=f"Extensive looking away ({face.yaw:.2f})",
+                    severity=RiskLevel.LOW
+                ))
+            if fire_pitch[i]:
+                found.append(AnalysisSignal(
+                    behavior_type=BehaviorType.PITCH_VIOLATION,
+                    detected_at=timestamps[row],
+                    details=f"Looking Up/Down detected ({face.pitch:.2f})",
+                    severity=RiskLevel.MEDIUM
+                ))
+            signals[row] = found
+        return signals
+
+    def _object_signals(self, timestamps: Sequence[float], rows: List[int], detections: list) -> Dict[int, list]:
+        if not detections:
+            return {}
+        owners = np.array(rows, dtype=np.intp)
+        ages = np.array([det.age for det in detections], dtype=np.int64)
+        forbidden_labels = set(settings.objects.forbidden_objects)
+        kinds = np.array([PERSON if label == "person" else FORBIDDEN if label in forbidden_labels else 0
+                          for label in (det.label.lower() for det in detections)], dtype=np.int8)
+
+        # Persistent forbidden objects, persistent people per session
+        persistent = ages >= settings.risk.min_object_persistence_frames
+        forbidden = persistent & (kinds == FORBIDDEN)
+        people = np.bincount(owners[persistent & (kinds == PERSON)], minlength=len(timestamps))
+
+        signals: Dict[int, list] = {}
+        for i in np.flatnonzero(forbidden).tolist():
+            row = rows[i]
+            signals.setdefault(row, []).append(AnalysisSignal(
+                behavior_type=BehaviorType.OBJECT_DETECTED,
+                detected_at=timestamps[row],
+                details=f"Forbidden object detected: {detections[i].label}",
+                severity=RiskLevel.HIGH
+            ))
+        for row in np.flatnonzero(people > 1).tolist():
+            signals.setdefault(row, []).append(AnalysisSignal(
+                behavior_type=BehaviorType.PERSON_LIMIT_VIOLATION,
+                detected_at=timestamps[row],
+                details=f"Multiple people detected ({people[row]})",
+                severity=RiskLevel.HIGH
+            ))
+        return signals
+
+    def _audio_signals(self, timestamps: Sequence[float], rows: List[int], audio_results: list) -> Dict[int, list]:
+        return {
+            row: [AnalysisSignal(
+                behavior_type=BehaviorType.AUDIO_DETECTED,
+                detected_at=timestamps[row],
+                details=f"Audio/Speech Detected ({audio_result.decibels:.1f} dB)",
+                severity=RiskLevel.HIGH
+            )]
+            for row, audio_result in zip(rows, audio_results)
+        }
+
+    def analyze(self, timestamps: Sequence[float], results_maps: Sequence[Dict[str, Any]],
+                slots: Optional[Sequence[int]] = None) -> List[List[AnalysisSignal]]:
+        """
+        One frame for each of several sessions.
+        - `slots[i]` is the slot of the session that produced `results_maps[i]` (None = 0..n-1);
+          a slot appears at most once per call.
+        - Returns each session's signals, as BehaviorAnalyzer.analyze would.
+        """
+        slots = _slots(slots, len(results_maps))
+
+        # 1. One pass over the sessions: first face pose, flattened detections, speech
+        face_rows, faces, poses = [], [], []
+        object_rows, detections = [], []
+        audio_rows, audio_results = [], []
+        for row, results_map in enumerate(results_maps):
+            face_results = results_map.get("face")
+            if face_results: # None / [] = no change
+                face = face_results[0]
+                face_rows.append(row)
+                faces.append(face)
+                poses += (1.0, face.yaw, face.pitch) if face.face_present else NO_POSE
+            found = results_map.get("object")
+            if found:
+                object_rows += [row] * len(found)
+                detections += found
+            audio_result = results_map.get("audio")
+            if audio_result and audio_result.speech_detected:
+                audio_rows.append(row)
+                audio_results.append(audio_result)
+
+        # 2. Rules, vectorized across sessions
+        by_source = {
+            "face": self._face_signals(slots, timestamps, face_rows, faces, poses),
+            "object": self._object_signals(timestamps, object_rows, detections),
+            "audio": self._audio_signals(timestamps, audio_rows, audio_results),
+        }
+
+        # 3. Signals come stamped; concatenated in each session's results_map order
+        all_signals: List[List[AnalysisSignal]] = [[] for _ in results_maps]
+        for row in set().union(*by_source.values()):
+            signals = all_signals[row]
+            for source in results_maps[row]:
+                found = by_source.get(source)
+                if found and row in found:
+                    signals.extend(found[row])
+        return all_signals
+
+class BatchRiskEngine:
+    """
+    RiskEngine for many sessions at once (struct of arrays).
+    - Frame scores, risk levels and alert cooldowns of every session are computed in one
+      vectorized pass; events are identical to the scalar engine's.
+    - `now` is the current time, shared or per session (default: time.time()).
+    """
+    def __init__(self, size: int = 0):
+        self.last_alert_time = np.zeros(size, dtype=np.float64)
+        self.levels = np.zeros(size, dtype=np.int8) # Index into LEVELS
+
+    @property
+    def size(self) -> int:
+        return len(self.levels)
+
+    def ensure_size(self, size: int):
+        """Grows the state arrays to `size` slots (new slots start reset)"""
+        extra = size - self.size
+        if extra > 0:
+            self.last_alert_time = np.concatenate([self.last_alert_time, np.zeros(extra)])
+            self.levels = np.concatenate([self.levels, np.zeros(extra, dtype=np.int8)])
+
+    def reset(self, slot: Optional[int] = None):
+        """Resets one slot's risk state and cooldown (None = every slot)"""
+        index = slice(None) if slot is None else slot
+        self.last_alert_time[index] = 0
+        self.levels[index] = 0
+
+    def current_risk_level(self, slot: int) -> RiskLevel:
+        return LEVELS[self.levels[slot]]
+
+    def process(self, signal_lists: Sequence[List[AnalysisSignal]], slots: Optional[Sequence[int]] = None,
+                now: Optional[Union[float, Sequence[float]]] = None) -> List[Optional[RiskEvent]]:
+        """Each session's signals for one frame -> each session's RiskEvent (or None)"""
+        count = len(signal_lists)
+        slots = _slots(slots, count)
+        now = np.broadcast_to(np.asarray(time.time() if now is None else now, dtype=np.float64), (count,))
+
+        # 1. Frame scores: every signal's weight, summed per session in signal order
+        risk = settings.risk
+        weights = {
+            BehaviorType.PHONE_DETECTED: risk.weight_phone,
+            BehaviorType.OBJECT_DETECTED: risk.weight_phone,
+            BehaviorType.PERSON_LIMIT_VIOLATION: risk.weight_multiple_faces,
+            BehaviorType.FACE_NOT_VISIBLE: risk.weight_no_face,
+            BehaviorType.LOOKING_AWAY: risk.weight_gaze,
+            BehaviorType.PITCH_VIOLATION: risk.weight_pitch,
+            BehaviorType.AUDIO_DETECTED: risk.weight_audio,
+            BehaviorType.HEADPHONE_DETECTED: risk.weight_headphone,
+        }
+        counts = np.fromiter((len(signals) for signals in signal_lists), dtype=np.intp, count=count)
+        flat_weights = np.fromiter(
+            (weights.get(signal.behavior_type, 0.0) for signals in signal_lists for signal in signals),
+            dtype=np.float64, count=int(counts.sum())
+        )
+        scores = np.bincount(np.repeat(np.arange(count), counts), weights=flat_weights, minlength=count)
+
+        # 2. Risk levels (no signals = LOW)
+        levels = np.where(scores >= 0.8, 2, np.where(scores >= 0.4, 1, 0)).astype(np.int8)
+        levels[counts == 0] = 0
+        self.levels[slots] = levels
+
+        # 3. Cooldown check for events
+        alert = (levels > 0) & (now - self.last_alert_time[slots] > risk.alert_cooldown)
+        self.last_alert_time[slots[alert]] = now[alert]
+
+        events: List[Optional[RiskEvent]] = [None] * count
+        for row in np.flatnonzero(alert):
+            reasons = set()
+            for signal in signal_lists[row]:
+                reasons.add(signal.details)
+            events[row] = RiskEvent(
+                timestamp=float(now[row]),
+                risk_level=LEVELS[levels[row]],
+                reasons=list(reasons)
+            )
+        return events
@@ -90,6 +90,10 @@ class BehaviorAnalyzer:
         person_count = 0
         
         for det in detections:
+            # Ignore objects that have not persisted long enough (tracker age)
+            if det.age < settings.risk.min_object_persistence_frames:
+                continue
+                
             label = det.label.lower()
             
             if label == "person":
@@ -0,0 +1,99 @@
+import cv2
+import numpy as np
+from typing import Optional
+from pydantic import BaseModel
+from app.core.schemas import FrameData
+from app.config import settings
+
+class GateDecision(BaseModel):
+    run_detectors: bool
+    reason: str          # "motion", "static", "low_quality", "max_age", "first_frame", "disabled"
+    motion: float = 0.0      # Mean abs gray difference vs the last inferred frame (0-255)
+    sharpness: float = 0.0   # Laplacian variance
+    brightness: float = 0.0  # Mean luminance (0-255)
+
+class FrameGate:
+    """
+    Cheap per-frame gate in front of the expensive detectors.
+    - Works on the memoized downscaled grayscale view.
+    - Static scene (low frame-difference energy) or an unusable frame (blurred / dark):
+      reuse the detectors' last results instead of running them.
+    - Results are never reused for more than `max_reuse_frames` in a row, so a stale
+      result cannot hide a violation.
+    """
+    def __init__(self):
+        self._reference: Optional[np.ndarray] = None  # Gray view of the last frame detectors ran on
+        self._diff: Optional[np.ndarray] = None
+        self._laplacian: Optional[np.ndarray] = None
+        self.reuse_age = 0
+
+        # Telemetry
+        self.frames = 0
+        self.skipped = 0
+        self.last_decision: Optional[GateDecision] = None
+
+    def reset(self):
+        self._reference = None
+        self.reuse_age = 0
+        self.frames = 0
+        self.skipped = 0
+        self.last_decision = None
+
+    @property
+    def skip_ratio(self) -> float:
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def evaluate(self, frame_data: FrameData) -> GateDecision:
+        cfg = settings.gate
+        self.frames += 1
+        if not cfg.enabled:
+            decision = GateDecision(run_detectors=True, reason="disabled")
+            self.last_decision = decision
+            return decision
+
+        gray = frame_data.gray(cfg.width)
+        if self._laplacian is None or self._laplacian.shape != gray.shape:
+            self._laplacian = np.empty(gray.shape, dtype=np.int16)
+            self._diff = np.empty_like(gray)
+
+        # Quality: blur (Laplacian variance) and darkness (mean luminance)
+        cv2.Laplacian(gray, cv2.CV_16S, dst=self._laplacian)
+        sharpness = float(cv2.meanStdDev(self._laplacian)[1][0, 0] ** 2)
+        brightness = float(cv2.mean(gray)[0])
+        low_quality = sharpness < cfg.min_sharpness or brightness < cfg.min_brightness
+
+        # Motion: frame-difference energy against the last frame the detectors saw
+        motion = 0.0
+        if self._reference is not None and self._reference.shape == gray.shape:
+            cv2.absdiff(gray, self._reference, dst=self._diff)
+            motion = float(cv2.mean(self._diff)[0])
+
+        if self._reference is None or self._reference.shape != gray.shape:
+            run, reason = True, "first_frame"
+        elif self.reuse_age >= cfg.max_reuse_frames:
+            run, reason = True, "max_age"
+        elif low_quality:
+            run, reason = False, "low_quality"
+        elif motion < cfg.motion_threshold:
+            run, reason = False, "static"
+        else:
+            run, reason = True, "motion"
+
+        if run:
+            self.reuse_age = 0
+            if self._reference is None or self._reference.shape != gray.shape:
+                self._reference = np.empty_like(gray)
+            np.copyto(self._reference, gray)
+        else:
+            self.reuse_age += 1
+            self.skipped += 1
+
+        decision = GateDecision(
+            run_detectors=run,
+            reason=reason,
+            motion=motion,
+            sharpness=sharpness,
+            brightness=brightness
+        )
+        self.last_decision = decision
+        return decision
@@ -1,10 +1,11 @@
 from typing import List, Optional
-import time
+from app.core.clock import Clock, SystemClock
 from app.core.schemas import AnalysisSignal, RiskEvent, RiskLevel, BehaviorType
 from app.config import settings
 
 class RiskEngine:
-    def __init__(self):
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or SystemClock() # Cooldown time base (FrameClock for recordings)
         self.last_alert_time = 0
         self.current_risk_level = RiskLevel.LOW
         self.accumulated_score = 0.0
@@ -16,7 +17,7 @@ class RiskEngine:
         self.accumulated_score = 0.0
 
     def process(self, signals: List[AnalysisSignal]) -> Optional[RiskEvent]:
-        current_time = time.time()
+        current_time = self.clock.now()
         
         if not signals:
             # Decay score over time if no signals? (Optional, skipping for simplicity)
@@ -0,0 +1,189 @@
+"""
+Offline rescoring of many recorded sessions on a process pool.
+
+Recordings are sharded over worker processes (longest first, for balance).
+Each worker loads the models once (model registry) and reviews its sessions
+in turn with the headless pipeline (app.headless). A single JSONL results
+file gets, as each session completes:
+
+    {"type": "summary", ...}    the session's risk summary (+ worker, worker_fps)
+    {"type": "progress", ...}   sessions done / total, job frames/s, ETA
+    {"type": "error", ...}      a session that failed (retried on the next run)
+
+and a final {"type": "job", ...} record with frames/s per worker. A session's
+risk_event records (and frame records, with --frames signals|all) precede its
+summary. A session's records, summary and progress go out in one write,
+flushed and synced to disk; an interruption mid-write leaves a tail that is
+cut off on the next run. Re-running the same command skips every session
+that already has a summary (resume after an interruption).
+
+Usage:
+    python -m app.batch_review VIDEO_OR_FOLDER [...] -o results.jsonl [--workers 4]
+                               [--modules face object] [--no-calibration] [--frames none|signals|all]
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Set
+from app.config import settings
+from app.infrastructure.logger import logger
+from app.headless import find_videos
+
+# Records after which the results file is consistent (a session's frame / risk_event records come first)
+BLOCK_ENDS = ("summary", "error", "progress", "job")
+
+# Per-worker state (set by _init_worker in each pool process)
+_worker: Dict[str, object] = {}
+
+def completed_sessions(path: str) -> Set[str]:
+    """
+    Videos that already have a summary in the results file.
+    Whatever follows the last complete record of a block (a session cut short by an
+    interruption: its records without a summary, or half a line) is truncated away so
+    appends start clean.
+    """
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = pos = 0
+        for line in data.splitlines(keepends=True):
+            pos += len(line)
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("type") == "summary":
+                done.add(record["video"])
+            if record.get("type") in BLOCK_ENDS:
+                end = pos
+        if end < len(data):
+            f.truncate(end)
+    return done
+
+def _init_worker(modules: List[str], calibrate: bool, frames_output: str, threads: int):
+    # Workers share the cores: cap each one's intra-op threads
+    if settings.objects.num_threads is None:
+        settings.objects.num_threads = threads
+    import cv2
+    cv2.setNumThreads(threads)
+    settings.active_modules = set(modules)
+    _worker.update(calibrate=calibrate, frames_output=frames_output, frames=0, busy_s=0.0)
+
+def _review(video: str) -> dict:
+    """Runs in a worker: one session's records (text) and summary, or its error"""
+    from app.headless import review_video
+    buffer = io.StringIO()
+    t0 = time.perf_counter()
+    try:
+        summary = review_video(video, buffer, calibrate=_worker["calibrate"], frames_output=_worker["frames_output"])
+    except Exception as e:
+        return {"video": video, "error": f"{type(e).__name__}: {e}", "worker": os.getpid()}
+    _worker["frames"] += summary["frames"]
+    _worker["busy_s"] += time.perf_counter() - t0
+    text = buffer.getvalue()
+    return {
+        "video": video,
+        "records": text[:text.rfind("\n", 0, len(text) - 1) + 1], # Without the summary (rewritten by run())
+        "summary": summary,
+        "worker": os.getpid(),
+        "worker_frames": _worker["frames"],
+        "worker_fps": round(_worker["frames"] / _worker["busy_s"], 1) if _worker["busy_s"] > 0 else 0.0,
+    }
+
+def _line(record: dict) -> str:
+    return json.dumps(record) + "\n"
+
+def _write(out, text: str):
+    """One write per block, flushed and synced, so an interruption cuts at most the block being written"""
+    out.write(text)
+    out.flush()
+    os.fsync(out.fileno())
+
+def run(videos: List[str], output: str, workers: int, modules: List[str], calibrate: bool = True,
+        frames_output: str = "none") -> int:
+    """Reviews every video not yet summarized in `output`; returns the number of failures"""
+    done = completed_sessions(output) & set(videos)
+    todo = [video for video in videos if video not in done]
+    # Longest recordings first: the pool's tail is then made of short ones
+    todo.sort(key=os.path.getsize, reverse=True)
+    logger.info(f"{len(videos)} sessions, {len(done)} already done, {len(todo)} to review")
+    if not todo:
+        return 0
+
+    workers = max(1, min(workers, len(todo)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    # spawn: workers start clean (no inherited runtime threads or half-loaded models)
+    context = multiprocessing.get_context("spawn")
+    failures = frames = 0
+    per_worker: Dict[int, dict] = {}
+    t0 = time.perf_counter()
+    with open(output, "a") as out, context.Pool(
+        workers, initializer=_init_worker, initargs=(modules, calibrate, frames_output, threads)
+    ) as pool:
+        for i, result in enumerate(pool.imap_unordered(_review, todo), 1):
+            elapsed = time.perf_counter() - t0
+            if "error" in result:
+                failures += 1
+                logger.error(f"{result['video']} failed: {result['error']}")
+                block = _line({"type": "error", **result})
+            else:
+                summary = result["summary"]
+                frames += summary["frames"]
+                per_worker[result["worker"]] = {"frames": result["worker_frames"], "fps": result["worker_fps"]}
+                block = result["records"] + _line({**summary, "worker": result["worker"], "worker_fps": result["worker_fps"]})
+            remaining = len(todo) - i
+            _write(out, block + _line({
+                "type": "progress",
+                "done": len(done) + i - failures,
+                "failed": failures,
+                "total": len(videos),
+                "elapsed_s": round(elapsed, 1),
+                "fps": round(frames / elapsed, 1) if elapsed > 0 else 0.0,
+                "eta_s": round(elapsed / i * remaining, 1),
+            }))
+            status = "failed" if "error" in result else f"{result['summary']['fps']} fps"
+            logger.info(f"[{i}/{len(todo)}] {result['video']} ({status}), ETA {elapsed / i * remaining:.0f} s")
+
+        elapsed = time.perf_counter() - t0
+        _write(out, _line({
+            "type": "job",
+            "sessions": len(todo) - failures,
+            "failed": failures,
+            "frames": frames,
+            "elapsed_s": round(elapsed, 1),
+            "fps": round(frames / elapsed, 1) if elapsed > 0 else 0.0,
+            "workers": {str(pid): stats for pid, stats in per_worker.items()},
+        }))
+    logger.info(f"Reviewed {len(todo) - failures} sessions ({frames} frames) in {elapsed:.1f} s, {failures} failed")
+    return failures
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Video files or folders of videos")
+    parser.add_argument("-o", "--output", required=True, help="JSONL results file (appended to; resumes)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--modules", nargs="+", choices=["face", "object"],
+                        help="Detectors to run (default: the configured ones, without audio)")
+    parser.add_argument("--no-calibration", action="store_true", help="Monitor from the first frame")
+    parser.add_argument("--frames", choices=["none", "signals", "all"], default="none",
+                        help="Frame records to keep (besides risk events and summaries)")
+    args = parser.parse_args(argv)
+
+    videos = find_videos(args.inputs)
+    if not videos:
+        parser.error("no videos found")
+    modules = sorted(set(args.modules or settings.active_modules) - {"audio"})
+    failures = run(videos, args.output, args.workers, modules, calibrate=not args.no_calibration,
+                   frames_output=args.frames)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 import os
 from pydantic import BaseModel, Field
-from typing import List, Set
+from typing import Dict, List, Optional, Set
 
 class CalibrationConfig(BaseModel):
     MAX_CALIBRATION_OFFSET: float = 20.0
@@ -12,11 +12,35 @@ class CameraConfig(BaseModel):
     width: int = Field(1280, description="Capture Width")
     height: int = Field(720, description="Capture Height")
     fps: int = Field(30, description="Capture FPS")
+    frame_wait_timeout: float = Field(0.1, description="Max seconds step() blocks waiting for a new frame")
+    ring_size: int = Field(4, description="Preallocated frame buffers shared by capture and consumers")
+    mirror: bool = Field(True, description="Mirror the preview (applied at display time)")
+    keep_open_between_sessions: bool = Field(False, description="Opt-in: leave the camera running (light on) when an exam stops, so the next one starts instantly")
 
 class FaceDetectorConfig(BaseModel):
     min_detection_confidence: float = 0.5
     min_tracking_confidence: float = 0.5
     face_mesh_refine_landmarks: bool = True
+    input_width: Optional[int] = 640 # Landmarker input width (None = full capture resolution)
+    # MediaPipe running mode: IMAGE (detect every frame), VIDEO (tracking between frames),
+    # LIVE_STREAM (async, overlaps with YOLO; results may lag a frame)
+    running_mode: str = "VIDEO"
+    # Head pose: "matrix" (landmarker's facial transformation matrix) or "pnp" (solvePnP fallback)
+    pose_backend: str = "matrix"
+    
+    # ROI tracking: landmark only a padded crop around the previous face
+    # (mainly for IMAGE mode; VIDEO/LIVE_STREAM already track their own ROI internally)
+    roi_tracking: bool = False
+    roi_padding: float = 0.25            # Padding per side, as a fraction of the face box
+    roi_min_size: int = 160              # Minimum crop side (input-image pixels)
+    roi_full_search_interval: int = 30   # Full-frame search every N frames (~1 sec)
+    
+    # Optical-flow interpolation: run the full landmarker at this rate (Hz, None = every frame)
+    # and track the six pose keypoints with pyramidal Lucas-Kanade in between (IMAGE / VIDEO modes)
+    landmark_rate_hz: Optional[float] = None
+    flow_window_size: int = 21
+    flow_pyramid_levels: int = 3
+    flow_max_error: float = 20.0         # LK error above which tracking counts as lost
     
     # Sensitivity (Normalized -1.0 to 1.0)
     yaw_threshold: float = 0.20   # Left/Right
@@ -24,7 +48,7 @@ class FaceDetectorConfig(BaseModel):
     pitch_threshold_down: float = 0.15 # Looking Down (More sensitive)
     visualize_landmarks: bool = True # Show face mesh
     
-    # Generic 3D Face Model (X, Y, Z) - For PnP Solver
+    # Generic 3D Face Model (X, Y, Z) - For PnP Solver (pose_backend="pnp")
     # Left Eye, Right Eye, Nose, Left Mouth, Right Mouth, Chin
     generic_3d_face_model: List[List[float]] = [
             [-225.0, -170.0,  135.0], # 33: Left Eye
@@ -38,10 +62,45 @@ class FaceDetectorConfig(BaseModel):
 class ObjectDetectorConfig(BaseModel):
     model_path: str = "yolov8n.pt"
     confidence_threshold: float = 0.5
+    nms_iou_threshold: float = 0.7 # Ultralytics' predict() default
+    input_width: Optional[int] = 640 # Frame width handed to YOLO (it letterboxes to 640 anyway)
+    
+    # Inference runtime: "ultralytics" (PyTorch eager), "onnxruntime", "openvino" or "torchscript".
+    # Exported backends load `backend_model_path`, defaulting to where `yolo export` writes next to model_path.
+    backend: str = "ultralytics"
+    backend_model_path: Optional[str] = None
+    quantized: bool = False # onnxruntime only: load the INT8 model (<model>.int8.onnx)
+    imgsz: int = 640 # Square letterbox size (must match the exported model)
+    num_threads: Optional[int] = None # Intra-op threads (None = runtime default)
+    
+    # Adaptive resolution: step imgsz down/up the ladder to hold a per-inference latency target.
+    # Needs a backend with dynamic input (ultralytics, or ONNX/OpenVINO exported with dynamic=True).
+    latency_target_ms: Optional[float] = None # None = fixed imgsz
+    imgsz_ladder: list[int] = [640, 480, 320] # Multiples of 32
+    latency_ema_alpha: float = 0.2
+    imgsz_hysteresis: float = 0.15 # Fraction of the target kept as a dead band
+    imgsz_min_dwell: int = 10 # Inferences to wait after a switch
+    
+    # Cascade: low-res full-frame scan, then native-resolution crops around weak candidates
+    # (small phones held low). Replaces adaptive resolution when enabled.
+    cascade: bool = False
+    cascade_scan_imgsz: int = 320 # Scan input size (frame downscaled to this width)
+    cascade_classes: list[int] = [67] # Candidate classes worth a second look (cell phone)
+    cascade_pre_threshold: float = 0.15 # Scan confidence that makes a candidate
+    cascade_crop_size: int = 320 # Minimum crop side in frame pixels (also the crop imgsz)
+    cascade_crop_padding: float = 1.0 # Context around a candidate, in box sizes per side
+    cascade_max_crops: int = 3 # Strongest candidates re-checked per frame
     # targeted classes: person (0), cell phone (67)
     # Note: Headphones not standard in COCO, we will simulate or require custom model
     target_classes: list[int] = [0, 67] 
     forbidden_objects: list[str] = ["cell phone", "mobile phone", "headphone", "headset"] # Labels to trigger High Risk 
+    
+    # YOLO cadence: run every N frames (or every `detect_interval_s` seconds if set)
+    # and bridge the frames in between with an IoU/Kalman box tracker
+    detect_every_n_frames: int = 1
+    detect_interval_s: Optional[float] = None
+    tracker_iou_threshold: float = 0.3
+    tracker_max_misses: int = 2 # YOLO runs a track may go unmatched before it is dropped
 
 class AudioConfig(BaseModel):
     enabled: bool = True
@@ -49,6 +108,50 @@ class AudioConfig(BaseModel):
     sample_rate: int = 16000
     block_size: int = 1024
 
+class GateConfig(BaseModel):
+    # Motion / quality gate: reuse detector results on static or unusable frames
+    enabled: bool = True
+    width: int = 320                 # Grayscale view the gate works on
+    motion_threshold: float = 1.5    # Mean abs gray difference (0-255) below which the scene is static
+    min_sharpness: float = 20.0      # Laplacian variance below this = blurred
+    min_brightness: float = 35.0     # Mean luminance (0-255) below this = too dark
+    max_reuse_frames: int = 5        # Never reuse results for longer (~0.17 sec)
+
+class ExecutionConfig(BaseModel):
+    # Parallel mode: face, object and audio detectors of a frame run concurrently on a
+    # persistent thread pool (MediaPipe / PyTorch / ONNX release the GIL in native code)
+    parallel_detectors: bool = False
+    max_workers: int = 3
+    # Per-detector wait (ms) before the step moves on with that detector's last result
+    # (the late run keeps going and is not resubmitted until it finishes). Missing = wait.
+    detector_timeouts_ms: Dict[str, float] = Field(
+        default_factory=lambda: {"face_raw": 150.0, "object": 250.0, "audio": 20.0}
+    )
+    
+    # Staged pipeline: inference, analysis and render on their own threads, linked by
+    # bounded queues ("block" = never drop, "drop_oldest" = latest wins)
+    pipeline: bool = False
+    analysis_queue_size: int = 4
+    analysis_queue_policy: str = "block"
+    render_queue_size: int = 1
+    render_queue_policy: str = "drop_oldest"
+    
+    # Out-of-process detectors: these modules ("face", "object") run in their own host
+    # process; frames travel through shared memory, results come back compact
+    remote_modules: Set[str] = Field(default_factory=set)
+    remote_ring_slots: int = 4
+    remote_call_timeout_s: float = 2.0 # A host that does not answer in time is restarted
+    remote_startup_timeout_s: float = 120.0 # Model load + warmup
+    remote_max_restarts: int = 5
+    
+    # Multi-stream micro-batching: frames from several streams that reach a shared model
+    # within `batch_window_ms` of each other run as one batched forward pass
+    batch_max_size: int = 8
+    batch_window_ms: float = 5.0
+    batch_timeout_s: float = 1.0 # A stream waits this long for its batched result, then coasts on its tracker
+    # Multi-session host (SessionManager): worker threads serving the sessions (None = one per session)
+    session_workers: Optional[int] = None
+
 class RiskConfig(BaseModel):
     # Cooldowns in seconds
     alert_cooldown: float = 2.0
@@ -57,6 +160,7 @@ class RiskConfig(BaseModel):
     max_frames_missing_face: int = 30  # ~1 sec
     max_frames_looking_away: int = 3   # ~0.1 sec (Yaw)
     max_frames_pitch_violation: int = 5 # ~0.15 sec (Pitch)
+    min_object_persistence_frames: int = 1 # Object must be tracked this long before it fires
     
     # Weights for scoring (0.0 to 1.0)
     weight_phone: float = 1.0     
@@ -79,6 +183,8 @@ class AppConfig(BaseModel):
     audio: AudioConfig = Field(default_factory=AudioConfig)
     risk: RiskConfig = Field(default_factory=RiskConfig)
     calibration: CalibrationConfig = Field(default_factory=CalibrationConfig)
+    gate: GateConfig = Field(default_factory=GateConfig)
+    execution: ExecutionConfig = Field(default_factory=ExecutionConfig)
     
     log_level: str = "INFO"
     
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Sequence
+from app.infrastructure.logger import logger
+
+class MicroBatcher:
+    """
+    Gathers requests from several streams into batches for one shared model.
+    - submit() queues an item and returns a future for its own result.
+    - A batch closes when it reaches `max_batch` items or `window_ms` after its first
+      item arrived, whichever comes first; `run_batch(items)` then returns one result per
+      item and each future gets its own (results are routed back per stream).
+    - One worker thread runs the batches, so the model is never called concurrently.
+    - A failing batch fails the futures of that batch only.
+    """
+    def __init__(self, run_batch: Callable[[Sequence[Any]], List[Any]], max_batch: int = 8,
+                 window_ms: float = 5.0, name: str = "micro-batcher"):
+        self.run_batch = run_batch
+        self.max_batch = max(1, max_batch)
+        self.window_s = max(0.0, window_ms) / 1000
+        self.pending = deque() # (item, future, arrival time)
+        self.cond = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self.thread.start()
+
+        # Telemetry
+        self.batches = 0
+        self.items = 0
+        self.last_batch_size = 0
+        self.last_batch_ms = 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    def submit(self, item: Any) -> Future:
+        future = Future()
+        with self.cond:
+            if self.closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self.pending.append((item, future, time.perf_counter()))
+            self.cond.notify_all()
+        return future
+
+    def __call__(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Submits one item and waits for its result"""
+        return self.submit(item).result(timeout)
+
+    def _next_batch(self) -> list:
+        with self.cond:
+            self.cond.wait_for(lambda: self.closed or self.pending)
+            if not self.pending:
+                return []
+            # Hold the batch open until it is full or the first item has waited `window_s`
+            deadline = self.pending[0][2] + self.window_s
+            while not self.closed and len(self.pending) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self.cond.wait(remaining)
+            count = min(self.max_batch, len(self.pending))
+            return [self.pending.popleft() for _ in range(count)]
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return # Closed and drained
+
+            t0 = time.perf_counter()
+            try:
+                results = self.run_batch([item for item, _, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"run_batch returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                logger.error(f"Batch of {len(batch)} failed: {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+            self.batches += 1
+            self.items += len(batch)
+            self.last_batch_size = len(batch)
+            self.last_batch_ms = (time.perf_counter() - t0) * 1000
+
+    def close(self):
+        """Runs what is already queued, then stops the worker"""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.thread.join()
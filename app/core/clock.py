@@ -0,0 +1,34 @@
+import time
+from abc import ABC, abstractmethod
+
+class Clock(ABC):
+    """
+    Time source for time-based logic (risk alert cooldowns).
+    - now(): the current time, in seconds.
+    - observe(timestamp): called with each analyzed frame's timestamp.
+    """
+    @abstractmethod
+    def now(self) -> float:
+        pass
+
+    def observe(self, timestamp: float):
+        pass
+
+class SystemClock(Clock):
+    """Wall-clock time (live sessions)"""
+    def now(self) -> float:
+        return time.time()
+
+class FrameClock(Clock):
+    """
+    Time of the frame being analyzed (recordings): cooldowns follow the media timeline,
+    so results are the same at any playback speed.
+    """
+    def __init__(self, start: float = 0.0):
+        self.current = start
+
+    def now(self) -> float:
+        return self.current
+
+    def observe(self, timestamp: float):
+        self.current = timestamp
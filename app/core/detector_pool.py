@@ -0,0 +1,109 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+from app.infrastructure.logger import logger
+
+class DetectorPool:
+    """
+    Persistent thread pool that runs one frame's independent detectors concurrently.
+    - run() submits every job, then joins them; step latency ~ the slowest detector, not the sum.
+    - A detector that misses its timeout keeps running in the background. Until it finishes,
+      its last completed result is served and it is not resubmitted, so a slow detector never
+      piles up work (or runs concurrently with itself). Code that calls a detector outside the
+      pool (or resets it) join()s its in-flight job first.
+    - `on_submit` / `on_done` bracket each job that really runs (e.g. lease / release its frame).
+    """
+    def __init__(self, max_workers: int = 3):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="detector")
+        self.lock = threading.Lock()
+        self.in_flight: Dict[str, Future] = {}
+        self.latest: Dict[str, Any] = {}
+
+        # Telemetry
+        self.timeouts: Dict[str, int] = {}
+        self.busy_skips: Dict[str, int] = {}
+
+    def reset(self):
+        """Forgets results and counters (jobs still running finish on their own)"""
+        with self.lock:
+            self.latest = {}
+            self.timeouts = {}
+            self.busy_skips = {}
+
+    def join(self, names: Optional[Iterable[str]] = None):
+        """Waits for the in-flight jobs of `names` (default: all) to finish"""
+        with self.lock:
+            futures = [f for name, f in self.in_flight.items() if names is None or name in names]
+        wait(futures)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+    def _finished(self, name: str, future: Future, on_done: Optional[Callable[[], None]]):
+        with self.lock:
+            if self.in_flight.get(name) is future:
+                del self.in_flight[name]
+            if future.exception() is None:
+                self.latest[name] = future.result()
+        if on_done is not None:
+            on_done()
+
+    def submit(self, name: str, job: Callable[[], Any], on_done: Optional[Callable[[], None]] = None,
+               on_submit: Optional[Callable[[], None]] = None) -> Optional[Future]:
+        """Submits a detector job, or returns None if its previous run is still in flight"""
+        with self.lock:
+            if name in self.in_flight:
+                self.busy_skips[name] = self.busy_skips.get(name, 0) + 1
+                return None
+            if on_submit is not None:
+                on_submit()
+            future = self.executor.submit(job)
+            self.in_flight[name] = future
+        future.add_done_callback(lambda f: self._finished(name, f, on_done))
+        return future
+
+    def run(self, jobs: Dict[str, Callable[[], Any]], timeouts_ms: Dict[str, float],
+            on_submit: Optional[Callable[[], None]] = None,
+            on_done: Optional[Callable[[], None]] = None) -> Tuple[Dict[str, Any], Set[str]]:
+        """
+        Runs `jobs` concurrently and joins them.
+        Returns (results, stale): `stale` names got an earlier frame's result instead of a fresh one
+        (their previous run was still in flight, or this run missed its timeout).
+        A detector with no previous result is always waited for.
+        Exceptions raised by a job propagate to the caller.
+        """
+        start = time.perf_counter()
+        submitted: Dict[str, Future] = {}
+        for name, job in jobs.items():
+            future = self.submit(name, job, on_done, on_submit)
+            if future is not None:
+                submitted[name] = future
+
+        results: Dict[str, Any] = {}
+        stale: Set[str] = set()
+        for name in jobs:
+            future = submitted.get(name)
+            if future is None:
+                # Still busy with an earlier frame: wait for it only if there is nothing to serve
+                with self.lock:
+                    busy = self.in_flight.get(name)
+                    latest = self.latest.get(name)
+                    has_latest = name in self.latest
+                results[name] = latest if has_latest or busy is None else busy.result()
+                stale.add(name)
+                continue
+
+            # Timeouts count from submission, not from when the previous join returned
+            timeout = timeouts_ms.get(name) if name in self.latest else None
+            remaining = None if timeout is None else max(0.0, start + timeout / 1000.0 - time.perf_counter())
+            done, _ = wait([future], timeout=remaining)
+            if done:
+                results[name] = future.result()
+                continue
+
+            self.timeouts[name] = self.timeouts.get(name, 0) + 1
+            logger.debug(f"Detector '{name}' missed its {timeout:.0f} ms budget; reusing its last result")
+            results[name] = self.latest[name]
+            stale.add(name)
+        return results, stale
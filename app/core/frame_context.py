@@ -0,0 +1,41 @@
+from typing import Any, Callable, Dict
+from app.core.schemas import FrameData
+
+class FrameContext:
+    """
+    Per-frame result cache, keyed by frame_id.
+    - Each detector runs at most once per frame.
+    - Derived results (e.g. calibrated face data) are computed once and shared.
+    - Every consumer (calibrator, behavior, visualizer, worker stats) reads the same objects.
+    """
+    def __init__(self, frame_data: FrameData):
+        self.frame_data = frame_data
+        self.frame_id = frame_data.frame_id
+        self._results: Dict[str, Any] = {}
+
+        # Detector invocations for this frame (name -> count)
+        self.invocations: Dict[str, int] = {}
+
+    def detect(self, name: str, run: Callable[[], Any]) -> Any:
+        """Runs a detector once for this frame and caches its output"""
+        if name not in self._results:
+            self.invocations[name] = self.invocations.get(name, 0) + 1
+            self._results[name] = run()
+        return self._results[name]
+
+    def derive(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Caches a non-detector result (calibration, signals, render...)"""
+        if name not in self._results:
+            self._results[name] = compute()
+        return self._results[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._results.get(name, default)
+
+    def has(self, name: str) -> bool:
+        return name in self._results
+
+    @property
+    def invocation_count(self) -> int:
+        """Total detector invocations for this frame"""
+        return sum(self.invocations.values())
@@ -0,0 +1,66 @@
+import threading
+import cv2
+import numpy as np
+from typing import Dict, Optional, Set, Tuple
+
+VIEW_KINDS = ("bgr", "rgb", "gray")
+
+class FrameViews:
+    """
+    Lazily computed, memoized derived images of one frame (RGB, gray, downscales).
+    - Each view is computed once, on first request, and shared by every consumer.
+    - Views are read-only for consumers.
+    - Buffers survive invalidate(), so pooled (FrameRing) frames reuse them without allocating.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._buffers: Dict[Tuple[str, int], np.ndarray] = {}
+        self._valid: Set[Tuple[str, int]] = set()
+
+    def invalidate(self):
+        """Call whenever the underlying frame pixels change"""
+        with self.lock:
+            self._valid.clear()
+
+    def _buffer(self, key: Tuple[str, int], shape: Tuple[int, ...]) -> np.ndarray:
+        buf = self._buffers.get(key)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.uint8)
+            self._buffers[key] = buf
+        return buf
+
+    def _resize_source(self, frame: np.ndarray, width: int) -> np.ndarray:
+        """Smallest already-computed BGR view larger than `width` (pyramid), else the frame"""
+        larger = [w for (kind, w) in self._valid if kind == "bgr" and w > width]
+        return self._buffers[("bgr", min(larger))] if larger else frame
+
+    def get(self, frame: np.ndarray, kind: str = "bgr", width: Optional[int] = None) -> np.ndarray:
+        if kind not in VIEW_KINDS:
+            raise ValueError(f"Unknown view kind: {kind}")
+
+        h, w = frame.shape[:2]
+        # Never upscale
+        if width is None or width >= w:
+            width = w
+        if kind == "bgr" and width == w:
+            return frame
+
+        key = (kind, width)
+        with self.lock:
+            if key in self._valid:
+                return self._buffers[key]
+
+            out_h = round(h * width / w)
+            if kind == "bgr":
+                src = self._resize_source(frame, width)
+                dst = self._buffer(key, (out_h, width, 3))
+                cv2.resize(src, (width, out_h), dst=dst, interpolation=cv2.INTER_AREA)
+            elif kind == "rgb":
+                dst = self._buffer(key, (out_h, width, 3))
+                cv2.cvtColor(self.get(frame, "bgr", width), cv2.COLOR_BGR2RGB, dst=dst)
+            else:
+                dst = self._buffer(key, (out_h, width))
+                cv2.cvtColor(self.get(frame, "bgr", width), cv2.COLOR_BGR2GRAY, dst=dst)
+
+            self._valid.add(key)
+            return dst
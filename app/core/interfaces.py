@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Sequence
 from app.core.schemas import FrameData
 
 class IDetector(ABC):
@@ -30,7 +30,19 @@ class IFaceDetector(IDetector):
     def process(self, frame_data: FrameData) -> Any:
         pass
 
+    def detect_batch(self, frames: Sequence[FrameData]) -> List[Any]:
+        """
+        One result per frame, in order. Override when the model has a batched forward pass;
+        the default just loops. Trackers keep per-instance state, so stateful detectors
+        should only be given frames of one stream.
+        """
+        return [self.process(frame_data) for frame_data in frames]
+
 class IObjectDetector(IDetector):
     @abstractmethod
     def detect(self, frame_data: FrameData) -> Any:
         pass
+
+    def detect_batch(self, frames: Sequence[FrameData]) -> List[Any]:
+        """One result per frame, in order (see IFaceDetector.detect_batch)"""
+        return [self.detect(frame_data) for frame_data in frames]
@@ -0,0 +1,94 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+from app.infrastructure.logger import logger
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded, warmed detectors.
+    - get() builds a detector once per key (name + the config it was built from) and warms it;
+      every later session gets the same instance back in microseconds.
+    - Per-session state is cleared by the caller through the detector's reset(), not by reloading.
+    - A config change produces a new key, so the detector is rebuilt (the old one is closed).
+    - Thread-safe: concurrent get() calls for the same key load it only once.
+    - load_async() loads on a background thread pool, so several models load and warm
+      concurrently; the returned future resolves to the detector.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._models: Dict[str, Any] = {}
+        self._keys: Dict[str, Hashable] = {}
+        self._loading: Dict[str, threading.Lock] = {}
+
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+        # Telemetry: seconds spent loading + warming, per name
+        self.load_times: Dict[str, float] = {}
+
+    def get(self, name: str, factory: Callable[[], Any], key: Hashable = None) -> Any:
+        """The detector registered as `name`, built with factory() (and warmed) on first use"""
+        with self.lock:
+            if name in self._models and self._keys[name] == key:
+                return self._models[name]
+            loading = self._loading.setdefault(name, threading.Lock())
+
+        with loading:
+            stale = None
+            with self.lock:
+                if name in self._models:
+                    if self._keys[name] == key:
+                        return self._models[name] # Loaded by a concurrent caller
+                    stale = self._models.pop(name)
+            if stale is not None:
+                logger.info(f"Configuration of '{name}' changed, reloading it")
+                _close(stale)
+
+            t0 = time.perf_counter()
+            model = factory()
+            if hasattr(model, "warmup"):
+                model.warmup()
+            elapsed = time.perf_counter() - t0
+            logger.info(f"Loaded '{name}' in {elapsed:.2f} s")
+
+            with self.lock:
+                self._models[name] = model
+                self._keys[name] = key
+                self.load_times[name] = elapsed
+            return model
+
+    def load_async(self, name: str, factory: Callable[[], Any], key: Hashable = None) -> Future:
+        """Readiness future for get(name, factory, key); already resolved if the model is cached"""
+        with self.lock:
+            if name in self._models and self._keys[name] == key:
+                future = Future()
+                future.set_result(self._models[name])
+                return future
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="model-load")
+            executor = self.executor
+        return executor.submit(self.get, name, factory, key)
+
+    def peek(self, name: str) -> Optional[Any]:
+        """The loaded detector, or None (never loads)"""
+        with self.lock:
+            return self._models.get(name)
+
+    def clear(self):
+        """Closes and forgets every detector (e.g. at application exit)"""
+        with self.lock:
+            models = list(self._models.values())
+            self._models.clear()
+            self._keys.clear()
+        for model in models:
+            _close(model)
+
+def _close(model: Any):
+    if hasattr(model, "close"):
+        try:
+            model.close()
+        except Exception as e:
+            logger.warning(f"Error while closing {type(model).__name__}: {e}")
+
+# Shared by every SystemController in the process
+model_registry = ModelRegistry()
@@ -0,0 +1,195 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, List, Optional
+from app.config import settings
+from app.infrastructure.logger import logger
+from app.core.frame_context import FrameContext
+
+QUEUE_POLICIES = ("drop_oldest", "block")
+
+class StageQueue:
+    """
+    Bounded FIFO between two pipeline stages.
+    - "block" (never drop): put() waits for room, so the producer is throttled to the consumer.
+    - "drop_oldest": put() evicts the oldest item when full (latest-wins, e.g. preview);
+      evicted items go to `on_drop` so their frame leases can be released.
+    """
+    def __init__(self, maxsize: int, policy: str = "block", on_drop: Optional[Callable[[Any], None]] = None):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy} (expected one of {QUEUE_POLICIES})")
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.on_drop = on_drop
+        self.items = deque()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+
+    def put(self, item: Any) -> bool:
+        """Returns False (item not queued) once the queue is closed"""
+        evicted = None
+        with self.cond:
+            if self.policy == "block":
+                self.cond.wait_for(lambda: self.closed or len(self.items) < self.maxsize)
+            if self.closed:
+                return False
+            if len(self.items) >= self.maxsize:
+                evicted = self.items.popleft()
+                self.dropped += 1
+            self.items.append(item)
+            self.cond.notify_all()
+        if evicted is not None and self.on_drop is not None:
+            self.on_drop(evicted)
+        return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Next item, or None on timeout / once closed and empty"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.closed or self.items, timeout=timeout)
+            if not self.items:
+                return None
+            item = self.items.popleft()
+            self.cond.notify_all()
+            return item
+
+    def close(self) -> List[Any]:
+        """Wakes every waiter and returns the items left in the queue"""
+        with self.cond:
+            self.closed = True
+            leftover = list(self.items)
+            self.items.clear()
+            self.cond.notify_all()
+            return leftover
+
+    def __len__(self):
+        with self.cond:
+            return len(self.items)
+
+class StagePacket:
+    """One frame travelling through the pipeline (keeps its frame_id and capture timestamp)"""
+    def __init__(self, ctx: FrameContext):
+        self.ctx = ctx
+        self.frame_data = ctx.frame_data
+        self.frame_id = ctx.frame_id
+        self.timestamp = ctx.frame_data.timestamp
+        self.results: dict = {}
+        self.risk_event = None
+
+class StagedPipeline:
+    """
+    Runs SystemController's stages on their own threads instead of one step() loop:
+        camera thread -> inference -> [analysis queue] -> analysis -> [render queue] -> render
+    - Inference: detectors + calibration (SystemController.infer_frame).
+    - Analysis: behavior / risk (analyze_frame); `on_result(packet)` is called for every frame.
+    - Render: overlays (render_frame); `on_frame(packet, image)` is called for rendered frames.
+    Each stage is a single thread fed by a FIFO, so frames leave every stage in frame_id order;
+    the render stage additionally skips anything older than what it already showed.
+    The camera lease taken by inference is held until the frame is rendered or dropped.
+    Throughput is bounded by the slowest stage instead of the sum of all of them.
+    """
+    def __init__(self, controller, on_result: Optional[Callable[[StagePacket], None]] = None,
+                 on_frame: Optional[Callable[[StagePacket, Any], None]] = None):
+        cfg = settings.execution
+        self.controller = controller
+        self.on_result = on_result
+        self.on_frame = on_frame
+        self.analysis_queue = StageQueue(cfg.analysis_queue_size, cfg.analysis_queue_policy, on_drop=self._release)
+        self.render_queue = StageQueue(cfg.render_queue_size, cfg.render_queue_policy, on_drop=self._release)
+        self.running = False
+        self.threads: List[threading.Thread] = []
+
+        # Telemetry
+        self.last_rendered_id = 0
+        self.latency_ms = 0.0 # Capture -> rendered, last frame
+
+    @staticmethod
+    def leases_needed() -> int:
+        """Frame buffers the pipeline can hold at once (queues + one per stage + the camera's)"""
+        cfg = settings.execution
+        return cfg.analysis_queue_size + cfg.render_queue_size + 4
+
+    def _release(self, packet: StagePacket):
+        self.controller.camera.release(packet.frame_data)
+
+    def start(self):
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._inference_loop, name="pipeline-inference", daemon=True),
+            threading.Thread(target=self._analysis_loop, name="pipeline-analysis", daemon=True),
+            threading.Thread(target=self._render_loop, name="pipeline-render", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+        logger.info("Staged pipeline started.")
+
+    def stop(self):
+        self.running = False
+        for queue in (self.analysis_queue, self.render_queue):
+            for packet in queue.close():
+                self._release(packet)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        logger.info("Staged pipeline stopped.")
+
+    def _inference_loop(self):
+        controller = self.controller
+        while self.running:
+            frame_data = controller.camera.wait_for_frame(controller.last_frame_id, settings.camera.frame_wait_timeout)
+            if frame_data is None:
+                continue
+            controller.last_frame_id = frame_data.frame_id
+            controller.telemetry.update(controller.camera.get_stats())
+
+            try:
+                packet = StagePacket(controller.infer_frame(frame_data))
+            except Exception as e:
+                logger.error(f"Inference stage failed on frame {frame_data.frame_id}: {e}")
+                controller.camera.release(frame_data)
+                continue
+            if not self.analysis_queue.put(packet):
+                self._release(packet)
+
+    def _analysis_loop(self):
+        controller = self.controller
+        while self.running or len(self.analysis_queue):
+            packet = self.analysis_queue.get(timeout=0.1)
+            if packet is None:
+                continue
+            try:
+                packet.results, packet.risk_event = controller.analyze_frame(packet.ctx)
+                if packet.ctx.get("state") in ("calibrating", "monitoring"):
+                    controller.update_telemetry(packet.ctx)
+                    controller.telemetry["pipeline_queue_drops"] = self.analysis_queue.dropped + self.render_queue.dropped
+                if self.on_result is not None:
+                    self.on_result(packet)
+            except Exception as e:
+                logger.error(f"Analysis stage failed on frame {packet.frame_id}: {e}")
+                self._release(packet)
+                continue
+            if not self.render_queue.put(packet):
+                self._release(packet)
+
+    def _render_loop(self):
+        controller = self.controller
+        while self.running or len(self.render_queue):
+            packet = self.render_queue.get(timeout=0.1)
+            if packet is None:
+                continue
+            try:
+                if packet.frame_id <= self.last_rendered_id:
+                    continue
+                image = controller.render_frame(packet.ctx, packet.results, packet.risk_event)
+                if image is None:
+                    continue
+                self.last_rendered_id = packet.frame_id
+                if self.on_frame is not None:
+                    # The canvas is reused by the next render: on_frame must copy what it keeps
+                    self.on_frame(packet, image)
+                self.latency_ms = (time.time() - packet.timestamp) * 1000
+                controller.telemetry["pipeline_latency_ms"] = self.latency_ms
+            except Exception as e:
+                logger.error(f"Render stage failed on frame {packet.frame_id}: {e}")
+            finally:
+                self._release(packet)
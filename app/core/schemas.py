@@ -1,6 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 from enum import Enum
 from typing import List, Optional, Tuple, Any
+from app.core.frame_views import FrameViews
 
 class RiskLevel(str, Enum):
     LOW = "LOW"
@@ -21,12 +22,33 @@ class FrameData(BaseModel):
     frame_id: int
     timestamp: float
     frame: Any  # numpy array
+    mirrored: bool = False # Raw sensor orientation; mirror at display time
+    slot: Optional[int] = None # FrameRing slot backing `frame` (None = unpooled)
     model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    # Memoized derived images (RGB, gray, downscales), shared by every consumer
+    _views: FrameViews = PrivateAttr(default_factory=FrameViews)
+    
+    def view(self, kind: str = "bgr", width: Optional[int] = None) -> Any:
+        """Read-only derived image: kind in (bgr, rgb, gray), downscaled to `width` (None = native)"""
+        return self._views.get(self.frame, kind, width)
+    
+    def rgb(self, width: Optional[int] = None) -> Any:
+        return self.view("rgb", width)
+    
+    def gray(self, width: Optional[int] = None) -> Any:
+        return self.view("gray", width)
+    
+    def invalidate_views(self):
+        """Must be called when `frame` pixels are rewritten in place"""
+        self._views.invalidate()
 
 class DetectionResult(BaseModel):
     label: str
     confidence: float
     box: Tuple[int, int, int, int] # x1, y1, x2, y2
+    track_id: Optional[int] = None # Stable ID from the box tracker
+    age: int = 1 # Frames this object has been tracked (incl. frames bridged between detector runs)
 
 class FaceResult(BaseModel):
     face_present: bool
@@ -34,6 +56,7 @@ class FaceResult(BaseModel):
     pitch: Optional[float] = None # Normalized -1.0 to 1.0 (0=Center)
     roll: Optional[float] = None  # Normalized (0=Center)
     landmarks: Optional[Any] = None # MediaPipe landmarks
+    interpolated: bool = False # Pose tracked by optical flow between landmarker runs (landmarks are from the last run)
     
     # Calibration Info
     is_calibrating: bool = False
@@ -0,0 +1,258 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from app.config import settings
+from app.infrastructure.logger import logger
+from app.core.batch_scheduler import MicroBatcher
+from app.core.model_registry import model_registry
+from app.core.system_controller import SystemController
+from app.detectors.registry import detector_class
+
+# Processed-frame timestamps kept per session for its FPS
+FPS_WINDOW = 60
+
+class SharedModels:
+    """
+    Models loaded once and shared by every session of a SessionManager.
+    - Object: one YOLO backend (from the model registry). Each session gets its own
+      ObjectDetector (tracker, cadence) whose YOLO runs are micro-batched with the other
+      sessions' frames into one forward pass.
+    - Face: the landmarker bundle is read once. MediaPipe landmarkers carry per-stream
+      tracking state (VIDEO timestamps, ROI), so each session runs its own landmarker graph
+      built from the shared bundle.
+    """
+    def __init__(self, modules: Iterable[str], object_backend=None):
+        modules = set(modules)
+        self.object_owner = None
+        self.batcher: Optional[MicroBatcher] = None
+        self.face_model: Optional[bytes] = None
+
+        if "object" in modules:
+            if object_backend is not None:
+                self.object_owner = detector_class("object")(backend=object_backend)
+            else:
+                self.object_owner = model_registry.get(
+                    "object", lambda: detector_class("object")(),
+                    key=(False, settings.objects.model_dump_json())
+                )
+            cfg = settings.execution
+            self.batcher = MicroBatcher(
+                self.object_owner.detect_batch, cfg.batch_max_size, cfg.batch_window_ms, name="object-batcher"
+            )
+
+        if "face" in modules:
+            from app.detectors.face_detector import MODEL_PATH
+            with open(MODEL_PATH, "rb") as f:
+                self.face_model = f.read()
+
+    def session_detectors(self) -> Dict[str, Any]:
+        """Per-session detector instances over the shared models"""
+        detectors = {}
+        if self.face_model is not None:
+            face = detector_class("face")(model_buffer=self.face_model)
+            face.warmup()
+            detectors["face"] = face
+        if self.object_owner is not None:
+            detectors["object"] = detector_class("object")(backend=self.object_owner.backend, batcher=self.batcher)
+        return detectors
+
+    def close(self):
+        if self.batcher is not None:
+            self.batcher.close()
+
+class Session:
+    """One candidate: a SystemController (calibrator, behavior, risk, camera) over shared models"""
+    def __init__(self, session_id: str, camera, detectors: Dict[str, Any]):
+        self.id = session_id
+        self.controller = SystemController(camera=camera, detectors=detectors)
+        self.busy = False # Claimed by a worker (a session is processed by one worker at a time; guarded by the manager's lock)
+        self.frames = 0
+        self.frame_times = deque(maxlen=FPS_WINDOW)
+        self.last_risk_event = None
+
+    @property
+    def fps(self) -> float:
+        if len(self.frame_times) < 2:
+            return 0.0
+        span = self.frame_times[-1] - self.frame_times[0]
+        return (len(self.frame_times) - 1) / span if span > 0 else 0.0
+
+    @property
+    def finished(self) -> bool:
+        """File-backed source at its end, with every frame processed"""
+        camera = self.controller.camera
+        return getattr(camera, "finished", False) and not self.has_new_frame()
+
+    def has_new_frame(self) -> bool:
+        last_frame = self.controller.camera.last_frame
+        return last_frame is not None and last_frame.frame_id > self.controller.last_frame_id
+
+class SessionManager:
+    """
+    Many proctoring sessions in one process.
+    - Models are shared (SharedModels); per-session state stays in each session's controller.
+    - A fixed pool of workers serves the sessions round-robin: a worker takes the next
+      session (in rotation) that has an unprocessed frame and is not being processed, so
+      every session gets a turn before any gets a second one, however fast its source is.
+    - `on_result(session, frame_data, results, risk_event)` is called for every processed frame.
+    """
+    def __init__(self, modules: Optional[Iterable[str]] = None, workers: Optional[int] = None,
+                 object_backend=None, on_result: Optional[Callable] = None, auto_calibrate: bool = True):
+        self.modules = [m for m in (modules or settings.active_modules) if m in ("face", "object")]
+        self.workers = workers or settings.execution.session_workers
+        self.on_result = on_result
+        self.auto_calibrate = auto_calibrate
+        self.shared = SharedModels(self.modules, object_backend=object_backend)
+
+        self.lock = threading.Lock()
+        self.released = threading.Condition(self.lock) # A worker let go of a session
+        self.sessions: Dict[str, Session] = {}
+        self.order = deque() # Round-robin rotation of session ids
+        self.threads: List[threading.Thread] = []
+        self.running = False
+
+    def add_session(self, session_id: str, camera) -> Session:
+        session = Session(session_id, camera, self.shared.session_detectors())
+        with self.lock:
+            if session_id in self.sessions:
+                raise ValueError(f"Session {session_id} already exists")
+            self.sessions[session_id] = session
+        if self.running:
+            self._begin(session)
+        with self.lock:
+            self.order.append(session_id)
+        if self.running and not self.workers and len(self.threads) < len(self.sessions):
+            self._spawn_worker() # One worker per session
+        return session
+
+    def remove_session(self, session_id: str):
+        with self.lock:
+            session = self.sessions.pop(session_id)
+            self.order.remove(session_id)
+            # Out of the rotation: at most the frame a worker holds is left to finish
+            self.released.wait_for(lambda: not session.busy)
+        self._end(session)
+
+    def _begin(self, session: Session):
+        controller = session.controller
+        controller.initialize()
+        controller.start()
+        if not self.auto_calibrate:
+            return
+        if "face" in controller.detectors:
+            controller.start_calibration()
+        else:
+            controller.is_monitoring = True # Nothing to calibrate
+
+    def _end(self, session: Session):
+        controller = session.controller
+        face = controller.detectors.get("face")
+        controller.stop()
+        controller.shutdown(unload_models=False)
+        if face is not None:
+            face.close() # The session's own landmarker graph (the bundle stays shared)
+
+    def _spawn_worker(self):
+        thread = threading.Thread(target=self._worker_loop, name=f"session-worker-{len(self.threads)}", daemon=True)
+        self.threads.append(thread)
+        thread.start()
+
+    def start(self):
+        with self.lock:
+            sessions = list(self.sessions.values())
+        for session in sessions:
+            self._begin(session)
+
+        # Workers mostly wait on the (batched, GIL-releasing) models, so by default one per
+        # session (sessions added later bring their own): fewer would cap how many frames can
+        # meet in a batch
+        workers = self.workers or max(1, len(sessions))
+        self.running = True
+        for _ in range(workers):
+            self._spawn_worker()
+        logger.info(f"Session manager started: {len(sessions)} sessions, {workers} workers")
+
+    def stop(self):
+        self.running = False
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        with self.lock:
+            sessions = list(self.sessions.values())
+        for session in sessions:
+            self._end(session)
+
+    def close(self):
+        """stop() and release the shared models' batcher (the registry keeps the models)"""
+        if self.running:
+            self.stop()
+        self.shared.close()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every session's (file-backed) source is finished; False on timeout"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not all(s.finished for s in list(self.sessions.values())):
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _claim_next(self) -> Optional[Session]:
+        with self.lock:
+            for _ in range(len(self.order)):
+                session = self.sessions[self.order[0]]
+                self.order.rotate(-1)
+                if not session.busy and session.has_new_frame():
+                    session.busy = True
+                    return session
+        return None
+
+    def _worker_loop(self):
+        while self.running:
+            session = self._claim_next()
+            if session is None:
+                time.sleep(0.002) # No session has a new frame
+                continue
+            try:
+                self._process(session)
+            except Exception as e:
+                logger.error(f"Session {session.id} failed on a frame: {e}")
+            finally:
+                with self.lock:
+                    session.busy = False
+                    self.released.notify_all()
+
+    def _process(self, session: Session):
+        controller = session.controller
+        frame_data = controller.camera.wait_for_frame(controller.last_frame_id, 0)
+        if frame_data is None:
+            return
+        controller.last_frame_id = frame_data.frame_id
+        try:
+            ctx = controller.infer_frame(frame_data)
+            results, risk_event = controller.analyze_frame(ctx)
+            if ctx.get("state") in ("calibrating", "monitoring"):
+                controller.update_telemetry(ctx)
+            if risk_event is not None:
+                session.last_risk_event = risk_event
+            if self.on_result is not None:
+                self.on_result(session, frame_data, results, risk_event)
+        finally:
+            controller.camera.release(frame_data)
+        session.frames += 1
+        session.frame_times.append(time.perf_counter())
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-session FPS, frame counts and risk level"""
+        stats = {}
+        for session_id, session in list(self.sessions.items()):
+            controller = session.controller
+            level = controller.risk_engine.current_risk_level if controller.risk_engine else None
+            stats[session_id] = {
+                "fps": session.fps,
+                "frames": session.frames,
+                "dropped_frames": controller.camera.get_stats()["dropped_frames"],
+                "risk_level": level.value if level is not None else None,
+            }
+        return stats
@@ -1,17 +1,24 @@
 import time
+import threading
 import cv2
-from typing import Dict, Any, Optional, Tuple
+from concurrent.futures import Future, wait
+from typing import Dict, Any, List, Optional, Tuple
 from app.config import settings
 from app.infrastructure.logger import logger
 from app.infrastructure.camera import Camera
 from app.infrastructure.visualizer import Visualizer
-from app.detectors.face_detector import FaceDetector
-from app.detectors.object_detector import ObjectDetector
-from app.detectors.audio_detector import AudioDetector
+from app.infrastructure.shared_frame_ring import SharedFrameRing
+from app.detectors.registry import detector_class
 from app.analysis.behavior import BehaviorAnalyzer
 from app.analysis.risk_engine import RiskEngine
 from app.analysis.gaze_calibrator import GazeCalibrator # NEW
+from app.analysis.frame_gate import FrameGate
 from app.core.schemas import FaceResult, DetectionResult, AudioResult, FrameData, RiskEvent
+from app.core.frame_context import FrameContext
+from app.core.detector_pool import DetectorPool
+from app.core.pipeline import StagedPipeline
+from app.core.model_registry import model_registry
+from app.core.clock import Clock, SystemClock
 
 class SystemController:
     """
@@ -19,74 +26,188 @@ class SystemController:
     - Manages lifecycle of all sub-modules.
     - Orchestrates data flow.
     - Applies configuration.
+    Detectors and camera can be injected (e.g. per-session instances over shared models,
+    see SessionManager); otherwise they come from the model registry and the webcam.
+    The clock is the risk engine's time base (FrameClock to follow a recording's timeline).
     """
-    def __init__(self):
-        self.detectors: Dict[str, Any] = {}
+    def __init__(self, camera=None, detectors: Optional[Dict[str, Any]] = None, clock: Optional[Clock] = None):
+        self.detectors: Dict[str, Any] = dict(detectors or {})
+        self.injected_detectors = detectors is not None
         self.behavior: BehaviorAnalyzer = None
         self.risk_engine: RiskEngine = None
         self.gaze_calibrator = GazeCalibrator() # NEW
+        self.frame_gate = FrameGate()
         
-        self.camera = None
+        self.camera = camera
+        self.clock = clock or SystemClock()
         self.visualizer = Visualizer()
         
         # State
         self.is_monitoring = False
         self.calibration_in_progress = False
+
+        # Per-frame result cache + performance counters
+        self.context: Optional[FrameContext] = None
+        self.telemetry: Dict[str, Any] = {}
+        self.last_frame_id = 0
+        # Last detector outputs, reused on frames the gate skips
+        self.last_results: Dict[str, Any] = {}
+        # Module readiness (name -> future) and startup metrics of the current session
+        self.ready: Dict[str, Future] = {}
+        self.startup: Dict[str, float] = {}
+        self._startup_t0 = time.perf_counter()
+        self._all_tracked = False
+        # Concurrent detector execution (settings.execution.parallel_detectors)
+        self.detector_pool: Optional[DetectorPool] = None
+        # Shared-memory frame transport for out-of-process detectors (settings.execution.remote_modules)
+        self.frame_transport: Optional[SharedFrameRing] = None
         
     def initialize(self):
+        """
+        Prepares a session without waiting for the models:
+        - Face / object detectors (and the shared frame transport) come from the process-wide
+          model registry; each loads and warms concurrently in the background (instant when
+          already cached) and joins self.detectors once ready. See self.ready / readiness().
+        - The camera is created once and reused.
+        """
         logger.info("Initializing System Controller...")
+        self.startup = {}
+        self._startup_t0 = time.perf_counter()
+        self.ready = {}
+        self._all_tracked = False
         
-        # 1. Core Hardware
-        self.camera = Camera()
+        # 1. Core Hardware (the staged pipeline holds more frames in flight)
+        if self.camera is None:
+            ring_size = settings.camera.ring_size
+            if settings.execution.pipeline:
+                ring_size = max(ring_size, StagedPipeline.leases_needed())
+            self.camera = Camera(ring_size=ring_size)
+        self.last_frame_id = 0
         # self.visualizer = Visualizer() # Moved to __init__
         
         # 2. Logic Engines
         # self.behavior = BehaviorAnalyzer() # Moved to __init__
         # self.risk_engine = RiskEngine() # Moved to __init__
         
-        # 3. Dynamic Detectors
+        # 3. Dynamic Detectors (registry key = the config each one was built from)
         active_modules = settings.active_modules
+        if self.injected_detectors:
+            active_modules = [] # Already built by the owner
+            for name, detector in self.detectors.items():
+                if name != "audio":
+                    self._track(name, _resolved(detector))
+        
+        remote_modules = settings.execution.remote_modules
+        if remote_modules and active_modules:
+            self.frame_transport = model_registry.get(
+                "frame_transport",
+                lambda: SharedFrameRing(settings.execution.remote_ring_slots),
+                key=settings.execution.remote_ring_slots
+            )
         
         if "face" in active_modules:
             logger.info("Loading Face Module...")
-            try:
-                self.detectors["face"] = FaceDetector()
-                # Warmup to prevent first-inference lag
-                logger.info("Warming up Face Module...")
-                self.detectors["face"].warmup()
-            except Exception as e:
-                logger.error(f"Failed to load Face Module: {e}")
+            factory = self._detector_factory("face")
+            # Warmed by the registry on first load (prevents first-inference lag)
+            self._track("face", model_registry.load_async(
+                "face", factory, key=("face" in remote_modules, settings.face.model_dump_json())
+            ))
             
         if "object" in active_modules:
             logger.info("Loading Object Module...")
-            self.detectors["object"] = ObjectDetector()
+            factory = self._detector_factory("object")
+            self._track("object", model_registry.load_async(
+                "object", factory, key=("object" in remote_modules, settings.objects.model_dump_json())
+            ))
             
-        if "audio" in active_modules:
+        if "audio" in active_modules and "audio" not in self.detectors:
             logger.info("Loading Audio Module...")
-            # For audio, we need to explicitly start it
-            self.detectors["audio"] = AudioDetector()
+            # For audio, we need to explicitly start it (see start())
+            self.detectors["audio"] = detector_class("audio")()
+
+        if settings.execution.parallel_detectors and self.detector_pool is None:
+            self.detector_pool = DetectorPool(settings.execution.max_workers)
 
         # Initialize Logic Engines
         self.behavior = BehaviorAnalyzer()
-        self.risk_engine = RiskEngine()
+        self.risk_engine = RiskEngine(clock=self.clock)
         
         # Register handlers
         self.behavior.register_handler("face", self.behavior._analyze_face)
         self.behavior.register_handler("object", self.behavior._analyze_objects)
         self.behavior.register_handler("audio", self.behavior._analyze_audio)
         
-        logger.info("System Initialized.")
+        logger.info("System Initialized (modules loading in the background).")
+
+    def _detector_factory(self, module: str):
+        """Builds the module's detector; its (heavy) import runs on the loader thread, not here"""
+        if module in settings.execution.remote_modules:
+            return lambda: detector_class(module, remote=True)(self.frame_transport)
+        return lambda: detector_class(module)()
+
+    def _track(self, name: str, future: Future):
+        """
+        Registers a module's readiness future. self.ready[name] resolves only after the module
+        has joined self.detectors, so whoever waits on it can use the detector straight away.
+        """
+        ready = Future()
+        self.ready[name] = ready
+        
+        def done(f: Future):
+            if f.exception() is not None:
+                logger.error(f"Failed to load {name.capitalize()} Module: {f.exception()}")
+                ready.set_exception(f.exception())
+            else:
+                if name != "audio":
+                    self.detectors[name] = f.result()
+                ready.set_result(f.result())
+            self._check_ready()
+        future.add_done_callback(done)
+
+    def _check_ready(self):
+        """Records time_to_ready_s once start() has registered every module and all have resolved"""
+        if not self._all_tracked or "time_to_ready_s" in self.startup:
+            return
+        if all(f.done() for f in list(self.ready.values())):
+            self.startup["time_to_ready_s"] = time.perf_counter() - self._startup_t0
+            logger.info(f"All modules ready in {self.startup['time_to_ready_s']:.2f} s")
+
+    def readiness(self) -> Dict[str, str]:
+        """
+        Per-module state: "loading", "ready" or "failed"; a loaded module whose detector reports
+        its health (out-of-process hosts) can also be "unavailable", or "failed" once it gave up.
+        """
+        states = {}
+        for name, f in list(self.ready.items()):
+            state = "loading" if not f.done() else "failed" if f.exception() is not None else "ready"
+            health = getattr(self.detectors.get(name), "health", "ok")
+            states[name] = health if state == "ready" and health != "ok" else state
+        return states
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every module has loaded (or failed); False on timeout"""
+        _, pending = wait(list(self.ready.values()), timeout=timeout)
+        return not pending
 
     def start(self):
+        # Already running if it was kept open after the previous session
         if self.camera:
-            self.camera.start()
+            if self.camera.running:
+                self.camera.reset_stats()
+            else:
+                self.camera.start()
         
+        # Opening the input stream can take a while: do it off the caller's thread
         if "audio" in self.detectors:
-            self.detectors["audio"].start()
+            audio = self.detectors["audio"]
+            self._track("audio", _in_background("audio-start", audio.start))
+        self._all_tracked = True
+        self._check_ready()
             
     def stop(self):
+        """Ends a session and releases the camera; models stay loaded (the camera too, with keep_open_between_sessions)"""
         # Stop Hardware
-        if self.camera:
+        if self.camera and not settings.camera.keep_open_between_sessions:
             self.camera.stop()
             
         # Reset Logic Engines
@@ -98,10 +219,22 @@ class SystemController:
             
         # Reset Calibrator
         self.gaze_calibrator.reset()
+
+        # Drop cached frame results
+        self.context = None
+        self.telemetry = {}
+        self.last_frame_id = 0
+        self.last_results = {}
+        self.frame_gate.reset()
+        if self.detector_pool:
+            # A job past its timeout may still be inside a detector: let it finish before the resets
+            self.detector_pool.join()
+            self.detector_pool.reset()
             
         # Reset all detectors to ensure fresh start next run
-        if "face" in self.detectors:
-             self.detectors["face"].reset()
+        for detector in list(self.detectors.values()):
+            if hasattr(detector, "reset"):
+                detector.reset()
              
         if "audio" in self.detectors:
             self.detectors["audio"].stop()
@@ -116,107 +249,280 @@ class SystemController:
         # if self.risk_engine:
         #     self.risk_engine.reset()
 
+    def shutdown(self, unload_models: bool = True):
+        """Application exit: releases the camera and worker threads, and (by default) the models"""
+        if self.camera and self.camera.running:
+            self.camera.stop()
+        if self.detector_pool:
+            self.detector_pool.shutdown()
+            self.detector_pool = None
+        self.detectors = {}
+        self.frame_transport = None
+        if unload_models:
+            model_registry.clear()
+
+    def _get_context(self, frame_data: FrameData) -> FrameContext:
+        """Returns the result context for this frame (reused if the frame_id repeats)"""
+        if self.context is None or self.context.frame_id != frame_data.frame_id:
+            self.context = FrameContext(frame_data)
+        return self.context
+
+    def _detect(self, ctx: FrameContext, name: str, run) -> Any:
+        """
+        Runs a detector once for this frame, or reuses its last result
+        when the motion/quality gate says the frame adds nothing new
+        (a detector with coast(), i.e. the object tracker, advances instead).
+        """
+        if ctx.has(name):
+            return ctx.get(name)
+        
+        if self.detector_pool is not None:
+            # A pool job past its timeout may still be running this detector: never call it concurrently
+            self.detector_pool.join([name])
+        
+        decision = ctx.derive("gate", lambda: self.frame_gate.evaluate(ctx.frame_data))
+        if not decision.run_detectors and name in self.last_results:
+            coast = getattr(self.detectors.get(name), "coast", None)
+            if coast is not None:
+                # Object tracks still advance (cadence, track ages feeding the persistence rules)
+                return ctx.derive(name, lambda: coast(ctx.frame_data))
+            return ctx.derive(name, lambda: self.last_results[name])
+        
+        result = ctx.detect(name, run)
+        self.last_results[name] = result
+        return result
+
+    def _detect_parallel(self, ctx: FrameContext):
+        """
+        Runs this frame's face, object and audio detectors concurrently on the pool and
+        caches their outputs in the context, so the sequential lookups below are cache hits.
+        Gate-skipped detectors are left to _detect(), which reuses their last result.
+        """
+        frame_data = ctx.frame_data
+        runners = {
+            "face_raw": ("face", lambda: self.detectors["face"].process(frame_data)),
+            "object": ("object", lambda: self.detectors["object"].detect(frame_data)),
+            "audio": ("audio", lambda: self.detectors["audio"].get_latest_sample()),
+        }
+        decision = ctx.derive("gate", lambda: self.frame_gate.evaluate(frame_data))
+        
+        jobs = {}
+        for name, (module, run) in runners.items():
+            if module not in self.detectors or ctx.has(name):
+                continue
+            gated = name != "audio" and not decision.run_detectors and name in self.last_results
+            if not gated:
+                jobs[name] = run
+        if not jobs:
+            return
+        
+        # A late job outlives this step, so every submitted job holds its own frame lease
+        results, stale = self.detector_pool.run(
+            jobs,
+            settings.execution.detector_timeouts_ms,
+            on_submit=lambda: self.camera.lease(frame_data),
+            on_done=lambda: self.camera.release(frame_data)
+        )
+        for name, result in results.items():
+            if name in stale:
+                ctx.derive(name, lambda r=result: r)
+            else:
+                ctx.detect(name, lambda r=result: r)
+                if name != "audio":
+                    self.last_results[name] = result
+
+    def _face_results(self, ctx: FrameContext) -> List[FaceResult]:
+        """
+        Face results for this frame, calibrated exactly once.
+        The raw detector output stays cached untouched under "face_raw".
+        """
+        def calibrate() -> List[FaceResult]:
+            raw_results = self._detect(ctx, "face_raw", lambda: self.detectors["face"].process(ctx.frame_data))
+
+            # PIPE THROUGH GAZE CALIBRATOR
+            face_results = []
+            for res in raw_results:
+                if res.face_present:
+                    # Provide Raw to Calibrator
+                    cal_yaw, cal_pitch = self.gaze_calibrator.update(res.yaw, res.pitch)
+
+                    # Copy with Calibrated Data + Status
+                    res = res.model_copy(update={
+                        "yaw": cal_yaw,
+                        "pitch": cal_pitch,
+                        "is_calibrating": self.gaze_calibrator.state == "CALIBRATING",
+                        "calibration_progress": self.gaze_calibrator.calibration_progress,
+                        "calibration_warning": self.gaze_calibrator.calibration_warning,
+                    })
+                face_results.append(res)
+            return face_results
+
+        return ctx.derive("face", calibrate)
+
+    def update_telemetry(self, ctx: FrameContext):
+        """Records a processed (calibrating / monitoring) frame's counters in self.telemetry"""
+        self.telemetry["frame_id"] = ctx.frame_id
+        self.telemetry["detector_calls"] = ctx.invocation_count
+        self.telemetry["detector_calls_by_module"] = dict(ctx.invocations)
+        
+        decision = ctx.get("gate")
+        if decision is not None:
+            self.telemetry["gate_decision"] = decision.reason
+            self.telemetry["gate_skip_ratio"] = self.frame_gate.skip_ratio
+            self.telemetry["gate_motion"] = decision.motion
+            self.telemetry["gate_sharpness"] = decision.sharpness
+            self.telemetry["gate_brightness"] = decision.brightness
+            
+        objects = self.detectors.get("object")
+        if objects is not None and hasattr(objects, "imgsz"):
+            self.telemetry["object_imgsz"] = objects.imgsz
+            self.telemetry["object_latency_ms"] = objects.last_latency_ms
+            
+        if self.detector_pool is not None:
+            self.telemetry["detector_timeouts"] = dict(self.detector_pool.timeouts)
+            
+        hosts = {name: d.host for name, d in list(self.detectors.items()) if hasattr(d, "host")}
+        if hosts:
+            self.telemetry["host_restarts"] = {name: host.restarts for name, host in hosts.items()}
+            self.telemetry["detector_health"] = {name: getattr(self.detectors.get(name), "health", "ok") for name in hosts}
+        
+        self.telemetry["startup"] = dict(self.startup)
+
     def step(self) -> Tuple[Any, dict, Optional[RiskEvent]]:
         """
         Main Loop Step.
-        1. Read Frame.
+        1. Read Frame (waits for a new frame_id, never reprocesses one).
         2. Detect (Face) always if calibrating or monitoring.
         3. Calibrate (GazeCalibrator).
         4. Logic (Behavior/Risk) ONLY if monitoring.
+        Every detector runs at most once per frame_id (see FrameContext).
         """
         if not self.camera:
             return None, {}, None
 
-        # 1. Read Inputs
-        frame_data = self.camera.read()
+        # 1. Read Inputs (blocks until the camera delivers a frame we have not seen yet)
+        frame_data = self.camera.wait_for_frame(self.last_frame_id, settings.camera.frame_wait_timeout)
         if frame_data is None:
             return None, {}, None
+        self.last_frame_id = frame_data.frame_id
+        self.telemetry.update(self.camera.get_stats())
+
+        # The frame buffer is leased from the camera ring; hand it back once rendered
+        try:
+            return self._process_frame(frame_data)
+        finally:
+            self.camera.release(frame_data)
 
-        results = {}
+    def _process_frame(self, frame_data: FrameData) -> Tuple[Any, dict, Optional[RiskEvent]]:
+        """Detect, calibrate, analyze and render one (leased) frame"""
+        ctx = self.infer_frame(frame_data)
+        results_map, risk_event = self.analyze_frame(ctx)
+        vis_frame = self.render_frame(ctx, results_map, risk_event)
+        
+        state = ctx.get("state")
+        if state in ("calibrating", "monitoring"):
+            self.update_telemetry(ctx)
+        if state is None:
+            return None, {}, None
+        return vis_frame, results_map, risk_event
+
+    # --- Stages (run in sequence by step(), or on separate threads by StagedPipeline) ---
+
+    def infer_frame(self, frame_data: FrameData) -> FrameContext:
+        """
+        Inference stage: detectors + gaze calibration.
+        Records the state the frame was processed in under "state"
+        ("idle", "calibrating", "monitoring"; absent = nothing to do), so the later
+        stages stay consistent even if the controller state changes meanwhile.
+        """
+        ctx = self._get_context(frame_data)
+        if "time_to_first_frame_s" not in self.startup:
+            self.startup["time_to_first_frame_s"] = time.perf_counter() - self._startup_t0
         
         # 0. Fast Fail: If not monitoring and not calibrating, do nothing (just frame)
         if not self.is_monitoring and not self.calibration_in_progress:
-            # We assume IDLE state, return frame with "Waiting" status effectively
-            return self.visualizer.render(frame_data, [], [], None, None), {}, None
-            
+            ctx.derive("state", lambda: "idle")
+            return ctx
+        
+        if self.is_monitoring and self.detector_pool is not None:
+            self._detect_parallel(ctx)
+
         # 1. Face Detection (Always needed for both Calib and Monitor)
-        face_results = []
         if "face" in self.detectors:
-            raw_results = self.detectors["face"].process(frame_data)
-            
-            # PIPE THROUGH GAZE CALIBRATOR
-            for res in raw_results:
-                if res.face_present:
-                    # Provide Raw to Calibrator
-                    cal_yaw, cal_pitch = self.gaze_calibrator.update(res.yaw, res.pitch)
-                    
-                    # Update Result with Calibrated Data + Status
-                    res.yaw = cal_yaw
-                    res.pitch = cal_pitch
-                    res.is_calibrating = (self.gaze_calibrator.state == "CALIBRATING")
-                    res.calibration_progress = self.gaze_calibrator.calibration_progress
-                    res.calibration_warning = self.gaze_calibrator.calibration_warning
-                
-            face_results = raw_results
-            results["face"] = face_results
-            
+            self._face_results(ctx)
+
             # CHECK CALIBRATION COMPLETION
             if self.calibration_in_progress and self.gaze_calibrator.state == "CALIBRATED":
                 logger.info("Calibration Successful. Starting Monitoring.")
                 self.calibration_in_progress = False
                 self.is_monitoring = True
 
-            # Render Logic for Calibration
-            # If we are strictly calibrating (and not yet switched to monitoring), return early
+            # If we are strictly calibrating (and not yet switched to monitoring), stop here
             if self.calibration_in_progress:
-                vis_frame = self.visualizer.render(frame_data, [], face_results, None, None)
-                # Pass results so UI can see "is_calibrating" flag
-                return vis_frame, {"face": face_results}, None
+                ctx.derive("state", lambda: "calibrating")
+                return ctx
+        elif self.calibration_in_progress:
+            # Face module not ready yet: show the live frame; calibration begins as soon as it is
+            ctx.derive("state", lambda: "idle")
+            return ctx
 
         # --- STATE 3: MONITORING (Calibrated) ---
         if self.is_monitoring:
-            # 2. Run Detectors
-            face_results = []
-            object_results = []
-            audio_result = None
+            ctx.derive("state", lambda: "monitoring")
             
-            if "face" in self.detectors:
-                face_results = self.detectors["face"].process(frame_data)
-                
+            # 2. Run Detectors (face results are reused from the calibration pass above)
             if "object" in self.detectors:
-                object_results = self.detectors["object"].detect(frame_data)
-                
+                self._detect(ctx, "object", lambda: self.detectors["object"].detect(frame_data))
+
             if "audio" in self.detectors:
-                audio_result = self.detectors["audio"].get_latest_sample()
-
-            # 3. Analyze Behavior
-            results_map = {
-                "face": face_results,
-                "object": object_results,
-                "audio": audio_result
-            }
-            
-            signals = self.behavior.analyze(frame_data.timestamp, results_map)
-            
-            # 4. Determine Risk
-            risk_event = self.risk_engine.process(signals)
-            
-            if risk_event:
-                logger.warning(f"RISK EVENT: {risk_event.risk_level.value} - {risk_event.reasons}")
-                
-            # 5. Visualize
-            vis_frame = self.visualizer.render(
-                frame_data,
-                object_results,
-                face_results,
-                risk_event,
-                audio_result
-            )
+                ctx.detect("audio", lambda: self.detectors["audio"].get_latest_sample())
+        return ctx
 
-            return vis_frame, results_map, risk_event
-            
+    def analyze_frame(self, ctx: FrameContext) -> Tuple[dict, Optional[RiskEvent]]:
+        """Analysis stage: behavior signals and risk for a monitored frame"""
+        state = ctx.get("state")
+        if state == "calibrating":
+            # Pass results so UI can see "is_calibrating" flag
+            return {"face": ctx.get("face", [])}, None
+        if state != "monitoring":
+            return {}, None
+        
+        # A repeated frame_id was already analyzed: serve cached results, no new event
+        already_analyzed = ctx.has("risk")
 
-        return None, {}, None
+        # 3. Analyze Behavior
+        results_map = {
+            "face": ctx.get("face", []),
+            "object": ctx.get("object", []),
+            "audio": ctx.get("audio")
+        }
+
+        signals = ctx.derive("signals", lambda: self.behavior.analyze(ctx.frame_data.timestamp, results_map))
+
+        # 4. Determine Risk
+        self.clock.observe(ctx.frame_data.timestamp)
+        risk_event = ctx.derive("risk", lambda: self.risk_engine.process(signals))
+        if already_analyzed:
+            risk_event = None
+
+        if risk_event:
+            logger.warning(f"RISK EVENT: {risk_event.risk_level.value} - {risk_event.reasons}")
+        return results_map, risk_event
+
+    def render_frame(self, ctx: FrameContext, results_map: dict, risk_event: Optional[RiskEvent]) -> Any:
+        """Render stage: overlays onto the visualizer canvas (reused; consume before the next render)"""
+        state = ctx.get("state")
+        if state is None:
+            return None
+        
+        # 5. Visualize
+        return self.visualizer.render(
+            ctx.frame_data,
+            results_map.get("object", []),
+            results_map.get("face", []),
+            risk_event,
+            results_map.get("audio")
+        )
 
     def start_calibration(self):
         """
@@ -244,4 +550,18 @@ class SystemController:
         # Reset Calibrator
         self.gaze_calibrator.stop()
 
+def _in_background(name: str, run) -> Future:
+    """Runs run() on its own thread; the future resolves when it returns"""
+    future = Future()
+    def target():
+        try:
+            future.set_result(run())
+        except Exception as e:
+            future.set_exception(e)
+    threading.Thread(target=target, name=name, daemon=True).start()
+    return future
 
+def _resolved(value: Any) -> Future:
+    future = Future()
+    future.set_result(value)
+    return future
@@ -0,0 +1,55 @@
+from typing import List, Optional
+
+class ResolutionController:
+    """
+    Picks the object detector's input size (imgsz) from a ladder to hold a latency target.
+    - Tracks an exponential moving average of measured inference time at the current size.
+    - Steps down when the average exceeds the target by more than `hysteresis`.
+    - Steps up only when the next larger size is predicted (cost ~ imgsz^2) to stay under
+      the target by more than `hysteresis`, so it does not oscillate between two sizes.
+    - Waits `min_dwell` inferences after a switch before deciding again.
+    """
+    def __init__(self, ladder: List[int], target_ms: float, alpha: float = 0.2,
+                 hysteresis: float = 0.15, min_dwell: int = 10):
+        self.ladder = sorted(set(ladder), reverse=True)
+        self.target_ms = target_ms
+        self.alpha = alpha
+        self.hysteresis = hysteresis
+        self.min_dwell = min_dwell
+        self.reset()
+
+    def reset(self):
+        self.level = 0 # Index into the ladder (0 = largest)
+        self.ema_ms: Optional[float] = None
+        self.dwell = 0
+        self.switches = 0
+
+    @property
+    def imgsz(self) -> int:
+        return self.ladder[self.level]
+
+    def _switch(self, level: int):
+        # Seed the average at the new size from the area ratio instead of starting over
+        scale = (self.ladder[level] / self.imgsz) ** 2
+        self.ema_ms *= scale
+        self.level = level
+        self.dwell = 0
+        self.switches += 1
+
+    def update(self, latency_ms: float) -> int:
+        """Feeds one measured inference time; returns the imgsz to use next"""
+        if self.ema_ms is None:
+            self.ema_ms = latency_ms
+        else:
+            self.ema_ms += self.alpha * (latency_ms - self.ema_ms)
+        self.dwell += 1
+        if self.dwell < self.min_dwell:
+            return self.imgsz
+
+        if self.ema_ms > self.target_ms * (1 + self.hysteresis) and self.level < len(self.ladder) - 1:
+            self._switch(self.level + 1)
+        elif self.level > 0:
+            predicted = self.ema_ms * (self.ladder[self.level - 1] / self.imgsz) ** 2
+            if predicted < self.target_ms * (1 - self.hysteresis):
+                self._switch(self.level - 1)
+        return self.imgsz
@@ -0,0 +1,142 @@
+import numpy as np
+from typing import List
+from app.core.schemas import DetectionResult
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between (N, 4) and (M, 4) x1, y1, x2, y2 boxes"""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)))
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+class BoxTrack:
+    """
+    Constant-velocity Kalman filter over a box (cx, cy, w, h + velocities).
+    One predict() per frame; update() on frames where the detector ran and matched.
+    """
+    # State transition (unit time step = one frame) and measurement model
+    F = np.eye(8)
+    F[:4, 4:] = np.eye(4)
+    H = np.eye(4, 8)
+    Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.5, 0.5, 0.1, 0.1])
+    R = np.diag([4.0, 4.0, 16.0, 16.0])
+
+    def __init__(self, track_id: int, det: DetectionResult):
+        self.track_id = track_id
+        self.label = det.label
+        self.confidence = det.confidence
+        self.x = np.zeros(8)
+        self.x[:4] = self._to_cxcywh(det.box)
+        self.P = np.diag([10.0, 10.0, 10.0, 10.0, 1000.0, 1000.0, 1000.0, 1000.0])
+
+        self.age = 1      # Frames since the track was created (incl. bridged frames)
+        self.hits = 1     # Detector runs that matched this track
+        self.misses = 0   # Consecutive detector runs without a match
+
+    @staticmethod
+    def _to_cxcywh(box) -> np.ndarray:
+        x1, y1, x2, y2 = box
+        return np.array([(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1], dtype=np.float64)
+
+    @property
+    def box(self) -> np.ndarray:
+        cx, cy, w, h = self.x[:4]
+        w, h = max(w, 1.0), max(h, 1.0)
+        return np.array([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2])
+
+    def predict(self):
+        self.x = self.F @ self.x
+        self.P = self.F @ self.P @ self.F.T + self.Q
+        self.age += 1
+
+    def update(self, det: DetectionResult):
+        y = self._to_cxcywh(det.box) - self.H @ self.x
+        S = self.H @ self.P @ self.H.T + self.R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ y
+        self.P = (np.eye(8) - K @ self.H) @ self.P
+        self.confidence = det.confidence
+        self.hits += 1
+        self.misses = 0
+
+    def to_result(self) -> DetectionResult:
+        x1, y1, x2, y2 = (int(v) for v in self.box)
+        return DetectionResult(
+            label=self.label,
+            confidence=self.confidence,
+            box=(x1, y1, x2, y2),
+            track_id=self.track_id,
+            age=self.age
+        )
+
+class BoxTracker:
+    """
+    IoU-associated Kalman box tracker that bridges frames between detector runs.
+    - update(): on detector frames, greedily matches detections to predicted tracks (same label).
+    - predict(): on bridged frames, advances every track.
+    Only tracks confirmed by the latest detector run are reported, so a box that the
+    detector stops seeing disappears at its next run.
+    """
+    def __init__(self, iou_threshold: float = 0.3, max_misses: int = 2):
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.tracks: List[BoxTrack] = []
+        self._next_id = 1
+
+    def reset(self):
+        self.tracks = []
+        self._next_id = 1
+
+    def _reported(self) -> List[DetectionResult]:
+        return [t.to_result() for t in self.tracks if t.misses == 0]
+
+    def predict(self) -> List[DetectionResult]:
+        for track in self.tracks:
+            track.predict()
+        return self._reported()
+
+    def update(self, detections: List[DetectionResult]) -> List[DetectionResult]:
+        for track in self.tracks:
+            track.predict()
+
+        track_boxes = np.array([t.box for t in self.tracks]).reshape(-1, 4)
+        det_boxes = np.array([d.box for d in detections], dtype=np.float64).reshape(-1, 4)
+        iou = iou_matrix(track_boxes, det_boxes)
+        # Only same-label pairs may match
+        for ti, track in enumerate(self.tracks):
+            for di, det in enumerate(detections):
+                if det.label != track.label:
+                    iou[ti, di] = 0.0
+
+        # Greedy assignment, best overlap first
+        matched_tracks, matched_dets = set(), set()
+        for flat in np.argsort(-iou, axis=None):
+            ti, di = np.unravel_index(flat, iou.shape)
+            if iou[ti, di] < self.iou_threshold:
+                break
+            if ti in matched_tracks or di in matched_dets:
+                continue
+            self.tracks[ti].update(detections[di])
+            matched_tracks.add(ti)
+            matched_dets.add(di)
+
+        survivors = []
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.misses += 1
+            if track.misses <= self.max_misses:
+                survivors.append(track)
+        self.tracks = survivors
+
+        for di, det in enumerate(detections):
+            if di not in matched_dets:
+                self.tracks.append(BoxTrack(self._next_id, det))
+                self._next_id += 1
+
+        return self._reported()
@@ -1,120 +1,315 @@
 import cv2
+import threading
 import mediapipe as mp
 import numpy as np
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from app.core.interfaces import IFaceDetector
 from app.core.schemas import FrameData, FaceResult
 from app.config import settings
+from app.detectors.head_pose import (
+    POSE_BACKENDS, PnPPoseSolver, landmarks_to_points, pnp_head_pose, pose_from_transformation_matrices
+)
 
 # Import Tasks API
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
+RUNNING_MODES = {
+    "IMAGE": vision.RunningMode.IMAGE,              # Full detection on every frame
+    "VIDEO": vision.RunningMode.VIDEO,              # Tracking carries over between frames
+    "LIVE_STREAM": vision.RunningMode.LIVE_STREAM,  # Async, results arrive via callback
+}
+
+# Landmarker bundle (MediaPipe Tasks)
+MODEL_PATH = 'app/models/face_landmarker.task'
+
 class FaceDetector(IFaceDetector):
-    def __init__(self):
-        # Create FaceLandmarker options
-        base_options = python.BaseOptions(model_asset_path='app/models/face_landmarker.task')
+    def __init__(self, model_buffer: Optional[bytes] = None):
+        self.running_mode = settings.face.running_mode.upper()
+        if self.running_mode not in RUNNING_MODES:
+            raise ValueError(f"Unknown face running_mode: {settings.face.running_mode}")
+        
+        self.pose_backend = settings.face.pose_backend.lower()
+        if self.pose_backend not in POSE_BACKENDS:
+            raise ValueError(f"Unknown face pose_backend: {settings.face.pose_backend}")
+        # Warm-started PnP state for the tracked (first) face
+        self.pose_solver = PnPPoseSolver()
+        
+        # LIVE_STREAM only: latest completed result + per-timestamp frame info awaiting a callback
+        self._result_lock = threading.Lock()
+        self._latest_results: List[FaceResult] = [FaceResult(face_present=False)]
+        self._pending: Dict[int, Tuple[Tuple[int, ...], bool, Optional[Tuple[int, int, int, int]]]] = {}
+        
+        # ROI tracking: padded face box (x0, y0, x1, y1) in input-image pixels from the last result
+        self._roi: Optional[Tuple[int, int, int, int]] = None
+        self._frames_since_full_search = 0
+        self.roi_frames = 0
+        self.full_frames = 0
+        
+        # Optical-flow interpolation between landmarker runs (keyframes)
+        self._flow_solver = PnPPoseSolver()
+        self._flow_prev_gray: Optional[np.ndarray] = None
+        self._flow_points: Optional[np.ndarray] = None      # (6, 1, 2) float32, input-image pixels
+        self._flow_keyframe: Optional[FaceResult] = None
+        self._flow_offset = (0.0, 0.0)                      # Keyframe pose minus keypoint PnP pose
+        self._last_keyframe_time = 0.0
+        self.interpolated_frames = 0
+        
+        # VIDEO / LIVE_STREAM require strictly increasing timestamps (kept across resets)
+        self._last_timestamp_ms = -1
+        
+        # Create FaceLandmarker options (model_buffer: bundle already in memory, e.g. shared by sessions)
+        if model_buffer is not None:
+            base_options = python.BaseOptions(model_asset_buffer=model_buffer)
+        else:
+            base_options = python.BaseOptions(model_asset_path=MODEL_PATH)
+        mode_options = {}
+        if self.running_mode == "LIVE_STREAM":
+            mode_options["result_callback"] = self._on_async_result
+            
         options = vision.FaceLandmarkerOptions(
             base_options=base_options,
+            running_mode=RUNNING_MODES[self.running_mode],
             output_face_blendshapes=False,
-            output_facial_transformation_matrixes=False, # Can be true for easier pose!
+            # Pose straight from the landmarker (matrix backend) instead of solvePnP
+            output_facial_transformation_matrixes=(self.pose_backend == "matrix"),
             num_faces=1,
             min_face_detection_confidence=settings.face.min_detection_confidence,
             min_face_presence_confidence=settings.face.min_tracking_confidence,
+            min_tracking_confidence=settings.face.min_tracking_confidence,
+            **mode_options
         )
         self.detector = vision.FaceLandmarker.create_from_options(options)
 
+    def _next_timestamp_ms(self, timestamp: float) -> int:
+        """Frame timestamp in ms, nudged forward if it does not increase"""
+        timestamp_ms = max(int(timestamp * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+
+    def _run(self, mp_image, timestamp_ms: int):
+        """Dispatches to the landmarker call matching the running mode"""
+        if self.running_mode == "VIDEO":
+            return self.detector.detect_for_video(mp_image, timestamp_ms)
+        if self.running_mode == "LIVE_STREAM":
+            return self.detector.detect_async(mp_image, timestamp_ms)
+        return self.detector.detect(mp_image)
+
     def warmup(self):
         """Runs a dummy inference to load model weights (Fixes startup lag)"""
         dummy_frame = np.zeros((480, 640, 3), dtype=np.uint8)
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=dummy_frame)
-        self.detector.detect(mp_image)
+        self._run(mp_image, self._next_timestamp_ms(0.0))
+
+    def close(self):
+        """Releases the landmarker (the detector is unusable afterwards)"""
+        self.detector.close()
 
     def reset(self):
-        """No-op for stateless detector"""
-        pass
+        """Clears per-session results and pose tracking (landmarker timestamps must keep increasing)"""
+        self.pose_solver.reset()
+        self._roi = None
+        self._frames_since_full_search = 0
+        self._flow_keyframe = None
+        with self._result_lock:
+            self._latest_results = [FaceResult(face_present=False)]
+            self._pending.clear()
+
+    def _next_roi(self) -> Optional[Tuple[int, int, int, int]]:
+        """Region to search this frame (None = full frame)"""
+        if not settings.face.roi_tracking or self._roi is None:
+            return None
+        # Periodic full-frame search catches faces entering outside the ROI
+        if self._frames_since_full_search >= settings.face.roi_full_search_interval:
+            return None
+        return self._roi
 
-    def _calculate_head_pose(self, landmarks, image_shape) -> Tuple[float, float]:
+    def _to_mp_image(self, image_rgb: np.ndarray, roi) -> mp.Image:
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            # Crop is a strided view; MediaPipe needs contiguous pixels
+            image_rgb = np.ascontiguousarray(image_rgb[y0:y1, x0:x1])
+        # MediaPipe Tasks requires mp.Image
+        return mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
+
+    def _track_roi(self, detection_result, image_shape, roi):
         """
-        Estimate head pose (yaw, pitch) from landmarks.
-        Returns angles in radians (approximate).
+        Maps crop landmarks back to full-image normalized coordinates (in place)
+        and derives next frame's ROI from them.
         """
-        img_h, img_w, _ = image_shape
-        face_3d = []
-        face_2d = []
-
-        # Specific landmarks for head pose estimation
-        # Nose tip: 1, Chin: 152, Left eye left corner: 33, Right eye right corner: 263, Left Mouth: 61, Right Mouth: 291
-        landmark_indices = [33, 263, 1, 61, 291, 199]
-        
-        # Generic 3D Face Model (X, Y, Z)
-        # Corresponding to indices: [33, 263, 1, 61, 291, 199]
-        # (Left Eye, Right Eye, Nose, Left Mouth, Right Mouth, Chin)
-        # Coordinates in arbitrary units, centered at Nose tip (0,0,0)
-        # Y-axis points DOWN (matching image coords)
-        # Generic 3D Face Model (X, Y, Z)
-        # Corresponding to indices: [33, 263, 1, 61, 291, 199]
-        # (Left Eye, Right Eye, Nose, Left Mouth, Right Mouth, Chin)
-        # Coordinates in arbitrary units, centered at Nose tip (0,0,0)
-        # Y-axis points DOWN (matching image coords)
-        # Z-axis points INTO screen (Standard OpenCV): Nose=0, Eyes=Positive (Further)
-        face_3d = np.array(settings.face.generic_3d_face_model, dtype=np.float64)
-
-        for idx in landmark_indices:
-            lm = landmarks[idx]
-            x, y = int(lm.x * img_w), int(lm.y * img_h)
-            face_2d.append([x, y])
-            # face_3d is now static, no appending needed
+        img_h, img_w = image_shape[:2]
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            sx, sy = (x1 - x0) / img_w, (y1 - y0) / img_h
+            for face_landmarks in detection_result.face_landmarks:
+                for lm in face_landmarks:
+                    lm.x = x0 / img_w + lm.x * sx
+                    lm.y = y0 / img_h + lm.y * sy
+                    lm.z = lm.z * sx # z shares the x scale
+            self.roi_frames += 1
+            self._frames_since_full_search += 1
+        else:
+            self.full_frames += 1
+            self._frames_since_full_search = 0
             
-        face_2d = np.array(face_2d, dtype=np.float64)
+        if not settings.face.roi_tracking or not detection_result.face_landmarks:
+            # Face lost: search the full frame next time
+            self._roi = None
+            return
+        
+        points = np.array([(lm.x, lm.y) for lm in detection_result.face_landmarks[0]])
+        (nx0, ny0), (nx1, ny1) = points.min(axis=0), points.max(axis=0)
+        box_w, box_h = (nx1 - nx0) * img_w, (ny1 - ny0) * img_h
+        pad = settings.face.roi_padding * max(box_w, box_h)
+        half = max(max(box_w, box_h) / 2 + pad, settings.face.roi_min_size / 2)
+        cx, cy = (nx0 + nx1) / 2 * img_w, (ny0 + ny1) / 2 * img_h
+        self._roi = (
+            max(0, int(cx - half)), max(0, int(cy - half)),
+            min(img_w, int(cx + half)), min(img_h, int(cy + half))
+        )
 
-        # Camera matrix
-        focal_length = 1 * img_w
-        cam_matrix = np.array([
-            [focal_length, 0, img_w / 2],
-            [0, focal_length, img_h / 2],
-            [0, 0, 1]
-        ])
-        dist_matrix = np.zeros((4, 1), dtype=np.float64)
+    def _on_async_result(self, detection_result, output_image, timestamp_ms: int):
+        """LIVE_STREAM callback (runs on MediaPipe's thread)"""
+        with self._result_lock:
+            frame_info = self._pending.pop(timestamp_ms, None)
+            # Frames older than this one were skipped by the landmarker
+            for ts in [ts for ts in self._pending if ts < timestamp_ms]:
+                del self._pending[ts]
+        if frame_info is None:
+            return # Warmup or result from before a reset
+        
+        image_shape, mirrored, roi = frame_info
+        self._track_roi(detection_result, image_shape, roi)
+        face_results = self._to_face_results(detection_result, image_shape, mirrored)
+        with self._result_lock:
+            self._latest_results = face_results
+
+    def _detect(self, image_rgb: np.ndarray, roi, timestamp: float):
+        """Synchronous (IMAGE / VIDEO) landmarking of the full image or an ROI crop"""
+        detection_result = self._run(self._to_mp_image(image_rgb, roi), self._next_timestamp_ms(timestamp))
+        self._track_roi(detection_result, image_rgb.shape, roi)
+        return detection_result
 
-        # Solve PnP
-        success, rot_vec, trans_vec = cv2.solvePnP(face_3d, face_2d, cam_matrix, dist_matrix)
+    def process(self, frame_data: FrameData) -> List[FaceResult]:
+        """
+        IMAGE / VIDEO: results for this frame.
+        LIVE_STREAM: submits this frame and returns the latest completed results (non-blocking).
+        With roi_tracking, only a padded crop around the last face is searched;
+        landmarks are always reported in full-frame normalized coordinates.
+        """
+        # Shared, memoized RGB view at the landmarker's input resolution
+        image_rgb = frame_data.rgb(settings.face.input_width)
+        roi = self._next_roi()
         
-        if not success:
-            return 0.0, 0.0
+        if self.running_mode == "LIVE_STREAM":
+            timestamp_ms = self._next_timestamp_ms(frame_data.timestamp)
+            with self._result_lock:
+                self._pending[timestamp_ms] = (image_rgb.shape, frame_data.mirrored, roi)
+            self._run(self._to_mp_image(image_rgb, roi), timestamp_ms)
+            with self._result_lock:
+                return self._latest_results
+        
+        # Between landmarker runs, track the pose keypoints with optical flow
+        if self._should_interpolate(frame_data):
+            interpolated = self._interpolate(frame_data)
+            if interpolated is not None:
+                return interpolated
+        
+        detection_result = self._detect(image_rgb, roi, frame_data.timestamp)
+        if roi is not None and not detection_result.face_landmarks:
+            # Lost inside the ROI: search the full frame before reporting no face
+            detection_result = self._detect(image_rgb, None, frame_data.timestamp)
+        face_results = self._to_face_results(detection_result, image_rgb.shape, frame_data.mirrored)
+        
+        if settings.face.landmark_rate_hz:
+            self._start_flow(frame_data, face_results)
+        return face_results
 
-        # Get rotational matrix
-        rmat, jac = cv2.Rodrigues(rot_vec)
+    def _should_interpolate(self, frame_data: FrameData) -> bool:
+        """True between landmarker runs (keyframes) when optical-flow interpolation is on"""
+        if not settings.face.landmark_rate_hz or self._flow_keyframe is None:
+            return False
+        return frame_data.timestamp - self._last_keyframe_time < 1.0 / settings.face.landmark_rate_hz
 
-        # Get angles
-        pose_data = cv2.RQDecomp3x3(rmat)
-        angles = pose_data[0]
+    def _reported(self, yaw: float, pitch: float, mirrored: bool) -> Tuple[float, float]:
+        """Sensor-frame pose -> reported (display-frame) pose, as in _to_face_results"""
+        return (-yaw if mirrored else yaw), pitch
+
+    def _start_flow(self, frame_data: FrameData, face_results: List[FaceResult]):
+        """Makes this landmarker run the keyframe that optical flow tracks from"""
+        face = face_results[0]
+        if not face.face_present:
+            self._flow_keyframe = None
+            return
         
-        # Angles in degrees (RQDecomp3x3 returns degrees)
-        pitch = angles[0]
-        yaw = angles[1]
-        # roll = angles[2] # Unused
+        gray = frame_data.gray(settings.face.input_width)
+        if self._flow_prev_gray is None or self._flow_prev_gray.shape != gray.shape:
+            self._flow_prev_gray = np.empty_like(gray)
+        # Own copy: the frame (and its views) go back to the camera ring
+        np.copyto(self._flow_prev_gray, gray)
         
-        # DEBUG: Print raw angles to terminal to diagnose offset
-        # print(f"DEBUG RAW -> Pitch: {pitch:.2f}, Yaw: {yaw:.2f}, Roll: {roll:.2f}")
+        points = landmarks_to_points(face.landmarks, gray.shape)
+        self._flow_points = points.astype(np.float32).reshape(-1, 1, 2)
         
-        return yaw / 90.0, pitch / 90.0
+        # Keypoint PnP differs from the landmarker pose by a (near) constant offset; keep the keyframe's
+        self._flow_solver.reset()
+        key_yaw, key_pitch = self._reported(*self._flow_solver.solve_points(points, gray.shape), frame_data.mirrored)
+        self._flow_offset = (face.yaw - key_yaw, face.pitch - key_pitch)
+        self._flow_keyframe = face
+        self._last_keyframe_time = frame_data.timestamp
 
-    def process(self, frame_data: FrameData) -> List[FaceResult]:
-        image = frame_data.frame
-        # MediaPipe Tasks requires mp.Image
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
+    def _interpolate(self, frame_data: FrameData) -> Optional[List[FaceResult]]:
+        """Pose from LK-tracked keypoints, or None if tracking was lost (run the landmarker instead)"""
+        gray = frame_data.gray(settings.face.input_width)
+        if gray.shape != self._flow_prev_gray.shape:
+            return None
+        
+        window = settings.face.flow_window_size
+        next_points, status, error = cv2.calcOpticalFlowPyrLK(
+            self._flow_prev_gray, gray, self._flow_points, None,
+            winSize=(window, window), maxLevel=settings.face.flow_pyramid_levels
+        )
+        if next_points is None or not status.all() or error.max() > settings.face.flow_max_error:
+            return None
         
-        detection_result = self.detector.detect(mp_image)
+        np.copyto(self._flow_prev_gray, gray)
+        self._flow_points = next_points
         
+        yaw, pitch = self._flow_solver.solve_points(next_points.reshape(-1, 2).astype(np.float64), gray.shape)
+        yaw, pitch = self._reported(yaw, pitch, frame_data.mirrored)
+        self.interpolated_frames += 1
+        return [self._flow_keyframe.model_copy(update={
+            "yaw": yaw + self._flow_offset[0],
+            "pitch": pitch + self._flow_offset[1],
+            "interpolated": True,
+        })]
+
+    def _to_face_results(self, detection_result, image_shape, mirrored: bool) -> List[FaceResult]:
         if not detection_result.face_landmarks:
+            # Tracking lost: next PnP solve starts cold
+            self.pose_solver.reset()
             return [FaceResult(face_present=False)]
         
+        # Matrix backend: yaw/pitch/roll for every face in one vectorized pass
+        poses = None
+        if self.pose_backend == "matrix" and detection_result.facial_transformation_matrixes:
+            poses = pose_from_transformation_matrices(detection_result.facial_transformation_matrixes)
+        
         face_results = []
-        for face_landmarks in detection_result.face_landmarks:
+        for i, face_landmarks in enumerate(detection_result.face_landmarks):
             # Raw values (Normalized -1.0 to 1.0)
-            raw_yaw, raw_pitch = self._calculate_head_pose(face_landmarks, image.shape)
+            if poses is not None:
+                raw_yaw, raw_pitch, raw_roll = (float(v) for v in poses[i])
+            else:
+                # Warm-start only for the tracked face; extra faces are solved cold
+                solver_pose = self.pose_solver.solve if i == 0 else pnp_head_pose
+                raw_yaw, raw_pitch = solver_pose(face_landmarks, image_shape)
+                raw_roll = 0.0 # Not estimated by the PnP backend
+            
+            # Pose is solved in sensor coordinates; report it in the mirrored (display) frame
+            if mirrored:
+                raw_yaw = -raw_yaw
+                raw_roll = -raw_roll
             
             # NOTE: Calibration logic has been moved to GazeCalibrator (SystemController)
             # FaceResult now returns RAW values. Controller will overwrite with calibrated ones.
@@ -123,7 +318,7 @@ class FaceDetector(IFaceDetector):
                 face_present=True,
                 yaw=raw_yaw,
                 pitch=raw_pitch,
-                roll=0.0, # Unused
+                roll=raw_roll,
                 landmarks=face_landmarks,
                 # These default to False/None, will be filled by Controller/GazeCalibrator
                 is_calibrating=False,
@@ -0,0 +1,137 @@
+import cv2
+import numpy as np
+from typing import Dict, Optional, Tuple
+from app.config import settings
+
+# Landmarks matching settings.face.generic_3d_face_model
+# (Left Eye, Right Eye, Nose, Left Mouth, Right Mouth, Chin)
+POSE_LANDMARK_INDICES = [33, 263, 1, 61, 291, 199]
+
+POSE_BACKENDS = ("matrix", "pnp")
+
+def pose_from_transformation_matrices(matrices) -> np.ndarray:
+    """
+    Head pose for a stack of MediaPipe facial transformation matrices (vectorized).
+    Returns an (N, 3) array of (yaw, pitch, roll), normalized like the PnP backend (degrees / 90).
+
+    The matrices map the canonical face (y up, z towards the camera) into camera space.
+    Euler angles are taken as R = Rz(roll) . Ry(yaw) . Rx(pitch), then signed to match PnP
+    in image coordinates: +yaw = nose towards image left, +pitch = looking down.
+    """
+    m = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    r = m[:, :3, :3]
+    # The geometry pipeline may fold a scale into the matrix
+    r = r / np.linalg.norm(r, axis=1, keepdims=True)
+
+    pitch = np.arctan2(r[:, 2, 1], r[:, 2, 2])
+    yaw = np.arctan2(-r[:, 2, 0], np.hypot(r[:, 2, 1], r[:, 2, 2]))
+    roll = np.arctan2(r[:, 1, 0], r[:, 0, 0])
+
+    # y-up -> y-down flips the handedness of yaw and roll
+    return np.degrees(np.stack([-yaw, pitch, -roll], axis=1)) / 90.0
+
+def landmarks_to_points(landmarks, image_shape) -> np.ndarray:
+    """Pixel coordinates (6, 2) of the pose landmarks"""
+    img_h, img_w = image_shape[:2]
+    points = np.array([(landmarks[idx].x, landmarks[idx].y) for idx in POSE_LANDMARK_INDICES], dtype=np.float64)
+    points *= (img_w, img_h)
+    return points
+
+class PnPPoseSolver:
+    """
+    Stateful cv2.solvePnP head pose against a generic 3D face.
+    - Model points are built once; camera intrinsics are cached per image resolution.
+    - Warm-starts from the previous frame's rvec/tvec (useExtrinsicGuess) for cheaper, steadier solves.
+    - Falls back to a cold solve on the first frame, a resolution change, tracking loss (reset())
+      or an implausible warm solution.
+    Angles are normalized to -1.0..1.0 (degrees / 90).
+    """
+    # Largest frame-to-frame rotation (radians) accepted from a warm start
+    MAX_WARM_ROTATION_STEP = 0.5
+
+    def __init__(self):
+        # Generic 3D Face Model (X, Y, Z)
+        # Corresponding to indices: [33, 263, 1, 61, 291, 199]
+        # Coordinates in arbitrary units, centered at Nose tip (0,0,0)
+        # Y-axis points DOWN (matching image coords)
+        # Z-axis points INTO screen (Standard OpenCV): Nose=0, Eyes=Positive (Further)
+        self.model_points = np.array(settings.face.generic_3d_face_model, dtype=np.float64)
+        self.dist_coeffs = np.zeros((4, 1), dtype=np.float64)
+        self._intrinsics: Dict[Tuple[int, int], np.ndarray] = {}
+        
+        # Previous solution (None = cold solve next)
+        self._rvec: Optional[np.ndarray] = None
+        self._tvec: Optional[np.ndarray] = None
+        self._resolution: Optional[Tuple[int, int]] = None
+        
+        # Counters
+        self.warm_solves = 0
+        self.cold_solves = 0
+
+    def reset(self):
+        """Forget the previous solution (tracking lost / new session)"""
+        self._rvec = None
+        self._tvec = None
+
+    def _camera_matrix(self, img_w: int, img_h: int) -> np.ndarray:
+        cam_matrix = self._intrinsics.get((img_w, img_h))
+        if cam_matrix is None:
+            focal_length = 1 * img_w
+            cam_matrix = np.array([
+                [focal_length, 0, img_w / 2],
+                [0, focal_length, img_h / 2],
+                [0, 0, 1]
+            ], dtype=np.float64)
+            self._intrinsics[(img_w, img_h)] = cam_matrix
+        return cam_matrix
+
+    def _solve(self, image_points: np.ndarray, cam_matrix: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if self._rvec is not None:
+            success, rvec, tvec = cv2.solvePnP(
+                self.model_points, image_points, cam_matrix, self.dist_coeffs,
+                rvec=self._rvec.copy(), tvec=self._tvec.copy(),
+                useExtrinsicGuess=True, flags=cv2.SOLVEPNP_ITERATIVE
+            )
+            plausible = (
+                success
+                and tvec[2, 0] > 0 # Face in front of the camera
+                and np.linalg.norm(rvec - self._rvec) < self.MAX_WARM_ROTATION_STEP
+            )
+            if plausible:
+                self.warm_solves += 1
+                return rvec, tvec
+
+        success, rvec, tvec = cv2.solvePnP(self.model_points, image_points, cam_matrix, self.dist_coeffs)
+        self.cold_solves += 1
+        return (rvec, tvec) if success else None
+
+    def solve_points(self, image_points: np.ndarray, image_shape) -> Tuple[float, float]:
+        """Head pose (yaw, pitch) from the (6, 2) pixel coordinates of the pose landmarks"""
+        img_h, img_w = image_shape[:2]
+        if self._resolution != (img_w, img_h):
+            self._resolution = (img_w, img_h)
+            self.reset()
+
+        solution = self._solve(image_points, self._camera_matrix(img_w, img_h))
+        if solution is None:
+            self.reset()
+            return 0.0, 0.0
+        self._rvec, self._tvec = solution
+
+        # Get rotational matrix
+        rmat, jac = cv2.Rodrigues(self._rvec)
+
+        # Get angles (RQDecomp3x3 returns degrees; only the Euler angles are used,
+        # the tuple length differs between OpenCV versions)
+        angles = cv2.RQDecomp3x3(rmat)[0]
+        pitch = angles[0]
+        yaw = angles[1]
+
+        return yaw / 90.0, pitch / 90.0
+
+    def solve(self, landmarks, image_shape) -> Tuple[float, float]:
+        return self.solve_points(landmarks_to_points(landmarks, image_shape), image_shape)
+
+def pnp_head_pose(landmarks, image_shape) -> Tuple[float, float]:
+    """Stateless (cold) PnP head pose, for one-off estimates and comparisons"""
+    return PnPPoseSolver().solve(landmarks, image_shape)
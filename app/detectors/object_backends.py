@@ -0,0 +1,322 @@
+import ast
+import importlib
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+from app.infrastructure.logger import logger
+
+OBJECT_BACKENDS = ("ultralytics", "onnxruntime", "openvino", "torchscript")
+
+# Ultralytics letterbox padding colour
+PAD_VALUE = (114, 114, 114)
+
+def default_model_path(backend: str, model_path: str, quantized: bool = False) -> str:
+    """Where `yolo export` puts the model for a backend (e.g. yolov8n.pt -> yolov8n.onnx)"""
+    stem = os.path.splitext(model_path)[0]
+    name = os.path.basename(stem)
+    if backend == "onnxruntime":
+        return f"{stem}.int8.onnx" if quantized else f"{stem}.onnx"
+    if backend == "openvino":
+        return os.path.join(f"{stem}_openvino_model", f"{name}.xml")
+    if backend == "torchscript":
+        return f"{stem}.torchscript"
+    return model_path
+
+def parse_names(raw) -> Dict[int, str]:
+    """Class names from export metadata (dict, or its str()/JSON form)"""
+    if isinstance(raw, dict):
+        return {int(k): str(v) for k, v in raw.items()}
+    if isinstance(raw, str) and raw:
+        try:
+            return parse_names(ast.literal_eval(raw))
+        except (ValueError, SyntaxError):
+            pass
+    return {}
+
+def letterbox(image: np.ndarray, imgsz: int) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """BGR image -> (blob, scale, (pad_x, pad_y))"""
+    h, w = image.shape[:2]
+    r = min(imgsz / h, imgsz / w)
+    new_w, new_h = round(w * r), round(h * r)
+    if (new_w, new_h) != (w, h):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    pad_x, pad_y = (imgsz - new_w) // 2, (imgsz - new_h) // 2
+    padded = cv2.copyMakeBorder(
+        image, pad_y, imgsz - new_h - pad_y, pad_x, imgsz - new_w - pad_x,
+        cv2.BORDER_CONSTANT, value=PAD_VALUE
+    )
+    blob = cv2.dnn.blobFromImage(padded, scalefactor=1 / 255.0, swapRB=True)
+    return blob, r, (pad_x, pad_y)
+
+def merge_detections(boxes: np.ndarray, iou: float) -> np.ndarray:
+    """Class-aware NMS over (N, 6) x1, y1, x2, y2, confidence, class detections (e.g. from several passes)"""
+    if len(boxes) < 2:
+        return boxes
+    xywh = boxes[:, :4].copy()
+    xywh[:, 2:] -= xywh[:, :2]
+    idx = cv2.dnn.NMSBoxesBatched(xywh.tolist(), boxes[:, 4].tolist(), boxes[:, 5].astype(int).tolist(), 0.0, iou)
+    idx = np.asarray(idx, dtype=np.int64).reshape(-1)
+    return boxes[idx[np.argsort(-boxes[idx, 4], kind="stable")]]
+
+def _require(module: str, backend: str):
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(f"Object backend '{backend}' needs the '{module}' package (pip install {module})") from e
+
+class ObjectBackend(ABC):
+    """
+    One YOLO inference runtime. Pre/post-processing is shared by every backend:
+    - letterbox() to a square `imgsz` input (RGB, NCHW, float32 0..1)
+    - _forward() is the only backend-specific step; it returns the raw (batch, 4 + classes, anchors) head
+    - postprocess(): class filter, confidence threshold, class-aware NMS, undo the letterbox
+    so the same frame gives the same boxes on every backend (up to numerical noise).
+    """
+    name = "base"
+
+    def __init__(self, imgsz: int = 640):
+        self.imgsz = imgsz
+        self.names: Dict[int, str] = {}
+
+    @abstractmethod
+    def _forward(self, blob: np.ndarray) -> np.ndarray:
+        pass
+
+    @property
+    def dynamic_input(self) -> bool:
+        """Whether the model accepts input sizes other than `imgsz` (needed for adaptive resolution)"""
+        return False
+
+    @property
+    def dynamic_batch(self) -> bool:
+        """Whether _forward() accepts a batch of several images (else infer_batch() loops)"""
+        return False
+
+    def letterbox(self, image: np.ndarray, imgsz: Optional[int] = None) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+        return letterbox(image, imgsz or self.imgsz)
+
+    def postprocess(self, raw: np.ndarray, scale: float, pad: Tuple[int, int], image_shape,
+                    conf: float, iou: float, classes=None) -> np.ndarray:
+        """Raw head -> (N, 6) array of x1, y1, x2, y2, confidence, class in image pixels"""
+        pred = np.asarray(raw, dtype=np.float32).reshape(raw.shape[-2], raw.shape[-1]).T # (anchors, 4 + classes)
+        scores = pred[:, 4:]
+        cls = scores.argmax(axis=1)
+        confidence = scores[np.arange(len(cls)), cls]
+        keep = confidence >= conf
+        if classes is not None:
+            keep &= np.isin(cls, list(classes))
+        pred, cls, confidence = pred[keep], cls[keep], confidence[keep]
+        if len(pred) == 0:
+            return np.zeros((0, 6), dtype=np.float32)
+
+        # cx, cy, w, h -> x, y, w, h (NMS) and x1, y1, x2, y2 (output)
+        xywh = pred[:, :4].copy()
+        xywh[:, :2] -= xywh[:, 2:] / 2
+        idx = cv2.dnn.NMSBoxesBatched(xywh.tolist(), confidence.tolist(), cls.tolist(), conf, iou)
+        idx = np.asarray(idx, dtype=np.int64).reshape(-1)
+        idx = idx[np.argsort(-confidence[idx], kind="stable")]
+
+        img_h, img_w = image_shape[:2]
+        boxes = xywh[idx]
+        boxes[:, 2:] += boxes[:, :2]
+        boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - pad[0]) / scale).clip(0, img_w)
+        boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - pad[1]) / scale).clip(0, img_h)
+        return np.column_stack([boxes, confidence[idx], cls[idx]]).astype(np.float32)
+
+    def infer(self, image: np.ndarray, conf: float, iou: float, classes=None, imgsz: Optional[int] = None) -> np.ndarray:
+        """BGR image -> (N, 6) detections in image pixels (letterboxed to `imgsz`, default self.imgsz)"""
+        blob, scale, pad = self.letterbox(image, imgsz)
+        return self.postprocess(self._forward(blob), scale, pad, image.shape, conf, iou, classes)
+
+    def infer_batch(self, images: Sequence[np.ndarray], conf: float, iou: float, classes=None,
+                    imgsz: Optional[int] = None) -> List[np.ndarray]:
+        """
+        Several BGR images -> one (N, 6) detection array per image.
+        All images are letterboxed to the same `imgsz` and, if the model allows it, run as one
+        forward pass, so the per-call overhead is paid once per batch instead of once per image.
+        """
+        prepared = [self.letterbox(image, imgsz) for image in images]
+        if not prepared:
+            return []
+        if self.dynamic_batch and len(prepared) > 1:
+            raw = self._forward(np.concatenate([blob for blob, _, _ in prepared]))
+        else:
+            raw = np.concatenate([self._forward(blob) for blob, _, _ in prepared])
+        return [
+            self.postprocess(raw[i:i + 1], scale, pad, image.shape, conf, iou, classes)
+            for i, (image, (_, scale, pad)) in enumerate(zip(images, prepared))
+        ]
+
+    def warmup(self, imgsz: Optional[int] = None):
+        size = imgsz or self.imgsz
+        self.infer(np.zeros((size, size, 3), dtype=np.uint8), conf=1.0, iou=0.5, imgsz=size)
+
+class UltralyticsBackend(ObjectBackend):
+    """PyTorch eager, through the ultralytics model (fused Conv+BN)"""
+    name = "ultralytics"
+
+    def __init__(self, model_path: str, imgsz: int = 640, num_threads: Optional[int] = None):
+        super().__init__(imgsz)
+        torch = _require("torch", self.name)
+        from ultralytics import YOLO
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.torch = torch
+        yolo = YOLO(model_path)
+        self.names = parse_names(yolo.names)
+        self.model = yolo.model.fuse().eval() if hasattr(yolo.model, "fuse") else yolo.model.eval()
+
+    @property
+    def dynamic_input(self) -> bool:
+        return True # Any multiple of the model stride (32)
+
+    @property
+    def dynamic_batch(self) -> bool:
+        return True
+
+    def _forward(self, blob):
+        with self.torch.inference_mode():
+            out = self.model(self.torch.from_numpy(blob))
+        if isinstance(out, (list, tuple)):
+            out = out[0]
+        return out.numpy()
+
+class TorchScriptBackend(ObjectBackend):
+    """`yolo export format=torchscript` (traced, so fixed at the export imgsz)"""
+    name = "torchscript"
+
+    def __init__(self, model_path: str, imgsz: int = 640, num_threads: Optional[int] = None):
+        super().__init__(imgsz)
+        torch = _require("torch", self.name)
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.torch = torch
+        extra = {"config.txt": ""}
+        self.model = torch.jit.load(model_path, map_location="cpu", _extra_files=extra).eval()
+        if extra["config.txt"]:
+            self.names = parse_names(json.loads(extra["config.txt"]).get("names", {}))
+
+    def _forward(self, blob):
+        with self.torch.inference_mode():
+            out = self.model(self.torch.from_numpy(blob))
+        if isinstance(out, (list, tuple)):
+            out = out[0]
+        return out.numpy()
+
+class OnnxRuntimeBackend(ObjectBackend):
+    """`yolo export format=onnx` (FP32), or its INT8-quantized copy"""
+    name = "onnxruntime"
+
+    def __init__(self, model_path: str, imgsz: int = 640, num_threads: Optional[int] = None):
+        super().__init__(imgsz)
+        ort = _require("onnxruntime", self.name)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # `yolo export dynamic=True` leaves symbolic batch / height / width
+        self._dynamic = any(not isinstance(d, int) for d in model_input.shape[2:])
+        self._dynamic_batch = not isinstance(model_input.shape[0], int)
+        self.names = parse_names(self.session.get_modelmeta().custom_metadata_map.get("names"))
+
+    @property
+    def dynamic_input(self) -> bool:
+        return self._dynamic
+
+    @property
+    def dynamic_batch(self) -> bool:
+        return self._dynamic_batch
+
+    def _forward(self, blob):
+        return self.session.run(None, {self.input_name: blob})[0]
+
+class OpenVinoBackend(ObjectBackend):
+    """`yolo export format=openvino` (IR .xml/.bin), compiled for CPU"""
+    name = "openvino"
+
+    def __init__(self, model_path: str, imgsz: int = 640, num_threads: Optional[int] = None):
+        super().__init__(imgsz)
+        ov = _require("openvino", self.name)
+        core = ov.Core()
+        config = {"PERFORMANCE_HINT": "LATENCY"}
+        if num_threads:
+            config["INFERENCE_NUM_THREADS"] = num_threads
+        self.model = core.compile_model(core.read_model(model_path), "CPU", config)
+        self.request = self.model.create_infer_request()
+        input_shape = self.model.input(0).get_partial_shape()
+        self._dynamic = input_shape.is_dynamic
+        self._dynamic_batch = input_shape[0].is_dynamic
+
+        metadata = os.path.join(os.path.dirname(model_path), "metadata.yaml")
+        if os.path.exists(metadata):
+            yaml = _require("yaml", self.name)
+            with open(metadata) as f:
+                self.names = parse_names((yaml.safe_load(f) or {}).get("names", {}))
+
+    @property
+    def dynamic_input(self) -> bool:
+        return self._dynamic
+
+    @property
+    def dynamic_batch(self) -> bool:
+        return self._dynamic_batch
+
+    def _forward(self, blob):
+        return self.request.infer({0: blob})[self.model.output(0)]
+
+_BACKEND_CLASSES = {
+    "ultralytics": UltralyticsBackend,
+    "onnxruntime": OnnxRuntimeBackend,
+    "openvino": OpenVinoBackend,
+    "torchscript": TorchScriptBackend,
+}
+
+def create_backend(backend: str, model_path: str, imgsz: int = 640, num_threads: Optional[int] = None,
+                   quantized: bool = False, backend_model_path: Optional[str] = None) -> ObjectBackend:
+    if backend not in _BACKEND_CLASSES:
+        raise ValueError(f"Unknown object backend: {backend} (expected one of {OBJECT_BACKENDS})")
+    if quantized and backend != "onnxruntime":
+        raise ValueError("INT8 quantization is only supported with the 'onnxruntime' backend")
+
+    path = backend_model_path or default_model_path(backend, model_path, quantized)
+    if backend != "ultralytics" and not os.path.exists(path):
+        hint = (
+            "build it with `python -m benchmarks.object_backends --video <recording> --quantize`" if quantized
+            else f"export it with `yolo export model={model_path} format={backend.replace('runtime', '')} imgsz={imgsz}`"
+        )
+        raise FileNotFoundError(f"Exported model not found: {path} ({hint})")
+
+    logger.info(f"Object backend: {backend} ({path}, imgsz {imgsz})")
+    instance = _BACKEND_CLASSES[backend](path, imgsz=imgsz, num_threads=num_threads)
+    if not instance.names:
+        logger.warning(f"No class names in {path}; labels will be class ids")
+    return instance
+
+def quantize_onnx(src_path: str, dst_path: str, calibration_images, imgsz: int = 640):
+    """
+    Static INT8 (QDQ, per-channel) quantization of an exported ONNX model.
+    Calibration uses the shared letterbox, so it sees exactly what inference will.
+    """
+    ort = _require("onnxruntime", "onnxruntime")
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self, input_name):
+            self.blobs = iter([{input_name: letterbox(image, imgsz)[0]} for image in calibration_images])
+
+        def get_next(self):
+            return next(self.blobs, None)
+
+    input_name = ort.InferenceSession(src_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+    quantize_static(
+        src_path, dst_path, _Reader(input_name),
+        quant_format=QuantFormat.QDQ, per_channel=True,
+        activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8
+    )
+    logger.info(f"INT8 model written to {dst_path}")
@@ -1,42 +1,253 @@
-from ultralytics import YOLO
-from typing import List
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import List, Optional, Sequence
+import numpy as np
+from app.infrastructure.logger import logger
 from app.core.interfaces import IObjectDetector
 from app.core.schemas import FrameData, DetectionResult
 from app.config import settings
+from app.detectors.adaptive_resolution import ResolutionController
+from app.detectors.box_tracker import BoxTracker
+from app.detectors.object_backends import ObjectBackend, create_backend, merge_detections
 
 class ObjectDetector(IObjectDetector):
-    def __init__(self):
-        # Load model (will auto-download if not present)
-        self.model = YOLO(settings.objects.model_path)
-        self.target_classes = set(settings.objects.target_classes)
-        self.names = self.model.names if hasattr(self.model, 'names') else {}
+    """
+    YOLO detections, tracked between cadence frames.
+    Several streams can share one model: give each stream its own ObjectDetector (own tracker
+    and cadence) built with the shared `backend` and a MicroBatcher over the model owner's
+    detect_batch(), so their YOLO runs are gathered into batched forward passes.
+    """
+    def __init__(self, backend: Optional[ObjectBackend] = None, batcher=None):
+        # Inference runtime selected in settings.objects.backend (or injected, e.g. shared)
+        cfg = settings.objects
+        self.backend = backend or create_backend(
+            cfg.backend, cfg.model_path,
+            imgsz=cfg.imgsz,
+            num_threads=cfg.num_threads,
+            quantized=cfg.quantized,
+            backend_model_path=cfg.backend_model_path
+        )
+        self.target_classes = set(cfg.target_classes)
+        self.names = self.backend.names
+        # MicroBatcher over a shared detector's detect_batch (None = run the backend directly)
+        self.batcher = batcher
+        
+        # Latency-driven imgsz (None = always backend.imgsz)
+        self.resolution: Optional[ResolutionController] = None
+        if cfg.latency_target_ms is not None and cfg.cascade:
+            logger.warning("Object cascade enabled; adaptive resolution disabled")
+        elif cfg.latency_target_ms is not None and batcher is not None:
+            # A batched stream's wait includes queueing behind other streams, not just its own pass
+            logger.warning("Micro-batched object detector; adaptive resolution disabled")
+        elif cfg.latency_target_ms is not None:
+            if self.backend.dynamic_input:
+                self.resolution = ResolutionController(
+                    cfg.imgsz_ladder, cfg.latency_target_ms,
+                    alpha=cfg.latency_ema_alpha,
+                    hysteresis=cfg.imgsz_hysteresis,
+                    min_dwell=cfg.imgsz_min_dwell
+                )
+            else:
+                logger.warning(f"Object backend '{self.backend.name}' has a fixed input size; adaptive resolution disabled")
+        self.last_latency_ms = 0.0
+        self.cascade_crops = 0 # Stage-two crops run (cascade)
+        self.cascade_confirmed = 0 # Stage-two boxes kept by the merge
         
+        # Bridges frames between YOLO runs
+        self.tracker = BoxTracker(
+            iou_threshold=settings.objects.tracker_iou_threshold,
+            max_misses=settings.objects.tracker_max_misses
+        )
+        self.frames_since_run = None # None = YOLO has not run yet
+        self.last_run_time = 0.0
+        self.yolo_runs = 0
+
+    def warmup(self):
+        """Runs a dummy inference at the current input size (first-inference lag)"""
+        self.backend.warmup(self.imgsz)
+
+    def reset(self):
+        """Clears tracks and cadence state"""
+        self.tracker.reset()
+        self.frames_since_run = None
+        self.last_run_time = 0.0
+        if self.resolution is not None:
+            self.resolution.reset()
+
+    @property
+    def imgsz(self) -> int:
+        """Input size the next inference will use"""
+        return self.resolution.imgsz if self.resolution is not None else self.backend.imgsz
+
+    def _yolo_due(self, frame_data: FrameData) -> bool:
+        if self.frames_since_run is None:
+            return True
+        if settings.objects.detect_interval_s is not None:
+            return frame_data.timestamp - self.last_run_time >= settings.objects.detect_interval_s
+        return self.frames_since_run >= settings.objects.detect_every_n_frames
+
     def detect(self, frame_data: FrameData) -> List[DetectionResult]:
-        # Run inference
-        results = self.model.predict(
-            frame_data.frame, 
-            verbose=False, 
+        """Tracked detections: YOLO on cadence frames, tracker prediction in between"""
+        if not self._yolo_due(frame_data):
+            return self.coast(frame_data)
+        
+        detections = self._infer(frame_data)
+        if detections is None:
+            # No batched result in time: coast on the tracker, YOLO is due again next frame
+            return self.tracker.predict()
+        self.frames_since_run = 1
+        self.last_run_time = frame_data.timestamp
+        self.yolo_runs += 1
+        return self.tracker.update(detections)
+        
+    def coast(self, frame_data: FrameData) -> List[DetectionResult]:
+        """
+        A frame without YOLO: tracker prediction, cadence advanced.
+        Also for frames the caller skips (motion gate), so track ages keep counting frames.
+        """
+        if self.frames_since_run is not None:
+            self.frames_since_run += 1
+        return self.tracker.predict()
+        
+    def detect_batch(self, frames: Sequence[FrameData]) -> List[List[DetectionResult]]:
+        """
+        Untracked detections for independent frames (e.g. one per stream), in order.
+        Runs as one batched forward pass at the backend's configured imgsz; tracker and
+        cadence are not involved (they belong to the per-stream detectors feeding the batch).
+        """
+        if settings.objects.cascade:
+            return [self._infer_cascade(frame_data) for frame_data in frames]
+        
+        images = [frame_data.view("bgr", settings.objects.input_width) for frame_data in frames]
+        t0 = time.perf_counter()
+        batch = self.backend.infer_batch(
+            images,
+            conf=settings.objects.confidence_threshold,
+            iou=settings.objects.nms_iou_threshold,
+            classes=self.target_classes,
+            imgsz=self.backend.imgsz
+        )
+        self.last_latency_ms = (time.perf_counter() - t0) * 1000
+        return [
+            self._to_results(boxes, *self._scale(frame_data, image))
+            for frame_data, image, boxes in zip(frames, images, batch)
+        ]
+
+    @staticmethod
+    def _scale(frame_data: FrameData, image: np.ndarray):
+        """Boxes are reported in full-frame coordinates"""
+        return frame_data.frame.shape[1] / image.shape[1], frame_data.frame.shape[0] / image.shape[0]
+        
+    def _infer(self, frame_data: FrameData) -> Optional[List[DetectionResult]]:
+        """Untracked detections for one frame (None: the batched result did not arrive in time)"""
+        if self.batcher is not None:
+            # Gathered with the other streams' frames into one batched pass
+            timeout = settings.execution.batch_timeout_s
+            t0 = time.perf_counter()
+            try:
+                results = self.batcher(frame_data, timeout=timeout)
+            except FutureTimeoutError: # Not the builtin TimeoutError before Python 3.11
+                logger.error(f"Batched object detection gave no result within {timeout:.1f} s")
+                return None
+            self.last_latency_ms = (time.perf_counter() - t0) * 1000
+            return results
+        if settings.objects.cascade:
+            return self._infer_cascade(frame_data)
+        
+        # Shared, memoized downscale at the model's input resolution
+        image = frame_data.view("bgr", settings.objects.input_width)
+        sx, sy = self._scale(frame_data, image)
+        
+        # Shared letterbox / NMS, backend-specific forward pass
+        t0 = time.perf_counter()
+        boxes = self.backend.infer(
+            image,
             conf=settings.objects.confidence_threshold,
-            classes=list(self.target_classes) # Filter at inference level if possible
+            iou=settings.objects.nms_iou_threshold,
+            classes=self.target_classes,
+            imgsz=self.imgsz
         )
+        self.last_latency_ms = (time.perf_counter() - t0) * 1000
+        if self.resolution is not None:
+            self.resolution.update(self.last_latency_ms)
+        return self._to_results(boxes, sx, sy)
+
+    def _input_size(self, imgsz: int) -> Optional[int]:
+        """`imgsz` if the backend accepts it, else its fixed size"""
+        return imgsz if self.backend.dynamic_input else None
+
+    def _crop_window(self, box: np.ndarray, frame_w: int, frame_h: int):
+        """Square, padded window around a candidate box, shifted to lie inside the frame"""
+        cfg = settings.objects
+        x1, y1, x2, y2 = box[:4]
+        side = max(cfg.cascade_crop_size, (1 + 2 * cfg.cascade_crop_padding) * max(x2 - x1, y2 - y1))
+        side = int(min(side, frame_w, frame_h))
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        left = int(np.clip(cx - side / 2, 0, frame_w - side))
+        top = int(np.clip(cy - side / 2, 0, frame_h - side))
+        return left, top, left + side, top + side
+
+    def _infer_cascade(self, frame_data: FrameData) -> List[DetectionResult]:
+        """
+        Two-stage detection:
+        1. Full frame at `cascade_scan_imgsz`, down to `cascade_pre_threshold`.
+        2. Weak candidates of `cascade_classes` are re-run on native-resolution crops.
+        3. Confident scan boxes and confirmed crop boxes are merged (class-aware NMS).
+        """
+        cfg = settings.objects
+        frame = frame_data.frame
+        frame_h, frame_w = frame.shape[:2]
+        t0 = time.perf_counter()
+        
+        # 1. Cheap scan (boxes scaled back to frame coordinates)
+        scan = frame_data.view("bgr", cfg.cascade_scan_imgsz)
+        boxes = self.backend.infer(
+            scan,
+            conf=min(cfg.cascade_pre_threshold, cfg.confidence_threshold),
+            iou=cfg.nms_iou_threshold,
+            classes=self.target_classes,
+            imgsz=self._input_size(cfg.cascade_scan_imgsz)
+        )
+        boxes[:, [0, 2]] *= frame_w / scan.shape[1]
+        boxes[:, [1, 3]] *= frame_h / scan.shape[0]
         
+        confident = boxes[boxes[:, 4] >= cfg.confidence_threshold]
+        candidates = boxes[(boxes[:, 4] < cfg.confidence_threshold) & np.isin(boxes[:, 5], cfg.cascade_classes)]
+        
+        # 2. Confirm the strongest candidates at native resolution
+        passes = [confident]
+        for box in candidates[:cfg.cascade_max_crops]:
+            x1, y1, x2, y2 = self._crop_window(box, frame_w, frame_h)
+            found = self.backend.infer(
+                frame[y1:y2, x1:x2],
+                conf=cfg.confidence_threshold,
+                iou=cfg.nms_iou_threshold,
+                classes=set(cfg.cascade_classes),
+                imgsz=self._input_size(cfg.cascade_crop_size)
+            )
+            found[:, [0, 2]] += x1
+            found[:, [1, 3]] += y1
+            passes.append(found)
+            self.cascade_crops += 1
+        
+        # 3. Merge (a phone seen by both stages, or by two overlapping crops, is kept once).
+        #    A 7th column tags each box with its pass, so the stage-two survivors can be counted
+        tagged = np.concatenate([
+            np.column_stack([found, np.full(len(found), i, dtype=found.dtype)]) for i, found in enumerate(passes)
+        ])
+        merged = merge_detections(tagged, cfg.nms_iou_threshold)
+        self.cascade_confirmed += int(np.count_nonzero(merged[:, 6] > 0))
+        self.last_latency_ms = (time.perf_counter() - t0) * 1000
+        return self._to_results(merged[:, :6])
+
+    def _to_results(self, boxes: np.ndarray, sx: float = 1.0, sy: float = 1.0) -> List[DetectionResult]:
+        """(N, 6) backend output -> DetectionResults in full-frame coordinates"""
         detections = []
-        for r in results:
-            boxes = r.boxes
-            for box in boxes:
-                cls_id = int(box.cls[0])
-                if cls_id not in self.target_classes:
-                    continue
-                    
-                label = self.names.get(cls_id, str(cls_id))
-                conf = float(box.conf[0])
-                xyxy = box.xyxy[0].tolist()
-                x1, y1, x2, y2 = map(int, xyxy)
-                
-                detections.append(DetectionResult(
-                    label=label,
-                    confidence=conf,
-                    box=(x1, y1, x2, y2)
-                ))
-                
+        for x1, y1, x2, y2, conf, cls_id in boxes.tolist():
+            cls_id = int(cls_id)
+            detections.append(DetectionResult(
+                label=self.names.get(cls_id, str(cls_id)),
+                confidence=conf,
+                box=(int(x1 * sx), int(y1 * sy), int(x2 * sx), int(y2 * sy))
+            ))
         return detections
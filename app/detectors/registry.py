@@ -0,0 +1,44 @@
+import importlib
+import threading
+from typing import Iterable
+from app.infrastructure.logger import logger
+
+# Detector classes by module name ("package.module:Class"), imported on first use so a
+# profile only pays for what it runs (e.g. face-only never imports torch / ultralytics)
+DETECTORS = {
+    "face": "app.detectors.face_detector:FaceDetector",
+    "object": "app.detectors.object_detector:ObjectDetector",
+    "audio": "app.detectors.audio_detector:AudioDetector",
+}
+
+# Out-of-process proxies (settings.execution.remote_modules); the heavy import happens in the host
+REMOTE_DETECTORS = {
+    "face": "app.detectors.remote_detectors:RemoteFaceDetector",
+    "object": "app.detectors.remote_detectors:RemoteObjectDetector",
+}
+
+def detector_class(module: str, remote: bool = False) -> type:
+    """Imports and returns the detector class registered for `module`"""
+    registry = REMOTE_DETECTORS if remote else DETECTORS
+    if module not in registry:
+        raise ValueError(f"Unknown {'remote ' if remote else ''}detector module: {module} "
+                         f"(expected one of {sorted(registry)})")
+    path, name = registry[module].split(":")
+    return getattr(importlib.import_module(path), name)
+
+def preload(modules: Iterable[str], remote_modules: Iterable[str] = ()) -> threading.Thread:
+    """
+    Imports the given modules' detector classes on a background thread (e.g. while the
+    home page is idle), so the first session does not wait for the imports.
+    Failures are left for the real load to report.
+    """
+    remote_modules = set(remote_modules)
+    def run():
+        for module in modules:
+            try:
+                detector_class(module, remote=module in remote_modules)
+            except Exception as e:
+                logger.debug(f"Preloading {module} detector failed: {e}")
+    thread = threading.Thread(target=run, name="detector-preload", daemon=True)
+    thread.start()
+    return thread
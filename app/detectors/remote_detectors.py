@@ -0,0 +1,278 @@
+import multiprocessing as mp
+import threading
+from collections import namedtuple
+from typing import Any, List, Optional
+import numpy as np
+from app.config import settings, AppConfig
+from app.infrastructure.logger import logger
+from app.infrastructure.shared_frame_ring import SharedFrameRing, SharedFrameReader
+from app.core.interfaces import IFaceDetector, IObjectDetector
+from app.core.schemas import FrameData, FaceResult, DetectionResult
+
+# Landmarks come back as an array and are wrapped into this (same .x / .y / .z access as MediaPipe's)
+Landmark = namedtuple("Landmark", ["x", "y", "z"])
+
+# --- Compact result encoding (host -> parent) ---
+
+def encode_faces(results: List[FaceResult]) -> list:
+    encoded = []
+    for r in results:
+        landmarks = None
+        if r.landmarks is not None:
+            landmarks = np.array([(lm.x, lm.y, lm.z) for lm in r.landmarks], dtype=np.float32)
+        encoded.append((r.face_present, r.yaw, r.pitch, r.roll, r.interpolated, landmarks))
+    return encoded
+
+def decode_faces(encoded: list) -> List[FaceResult]:
+    results = []
+    for face_present, yaw, pitch, roll, interpolated, landmarks in encoded:
+        if landmarks is not None:
+            landmarks = [Landmark(*row) for row in landmarks.tolist()]
+        results.append(FaceResult(
+            face_present=face_present, yaw=yaw, pitch=pitch, roll=roll,
+            interpolated=interpolated, landmarks=landmarks
+        ))
+    return results
+
+def encode_objects(results: List[DetectionResult]) -> list:
+    return [(d.label, d.confidence, d.box, d.track_id, d.age) for d in results]
+
+def decode_objects(encoded: list) -> List[DetectionResult]:
+    return [
+        DetectionResult(label=label, confidence=conf, box=box, track_id=track_id, age=age)
+        for label, conf, box, track_id, age in encoded
+    ]
+
+# --- Host process ---
+
+def _build_detector(kind: str):
+    from app.detectors.registry import detector_class
+    detector = detector_class(kind)()
+    detector.warmup()
+    if kind == "face":
+        return detector, lambda fd: encode_faces(detector.process(fd))
+    return detector, lambda fd: encode_objects(detector.detect(fd))
+
+def host_main(kind: str, conn, settings_json: str):
+    """
+    Entry point of a detector host process (spawned, so it has its own interpreter and GIL).
+    Protocol over `conn`: ("detect", ring name, slots, shape, slot, frame_id, timestamp, mirrored),
+    ("reset",) and ("stop",); replies are ("ready",), ("ok", payload) or ("error", message).
+    """
+    # Same configuration as the parent (it may have been changed at runtime)
+    parent = AppConfig.model_validate_json(settings_json)
+    for field in AppConfig.model_fields:
+        setattr(settings, field, getattr(parent, field))
+
+    detector, run = _build_detector(kind)
+    reader = SharedFrameReader()
+    conn.send(("ready",))
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break # Parent went away
+        if msg[0] == "stop":
+            break
+        try:
+            if msg[0] == "reset":
+                detector.reset()
+                conn.send(("ok", None))
+                continue
+            _, name, slots, shape, slot, frame_id, timestamp, mirrored = msg
+            frame = reader.view(name, slots, shape, slot)
+            frame_data = FrameData(frame_id=frame_id, timestamp=timestamp, frame=frame, mirrored=mirrored)
+            conn.send(("ok", run(frame_data)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+    reader.close()
+
+# --- Parent side ---
+
+class DetectorHost:
+    """
+    One detector running in a dedicated process.
+    - Frames go through the shared SharedFrameRing; only slot indices and compact results are pickled.
+    - A host that crashes, hangs past `call_timeout_s` or fails to start is restarted in the
+      background (at most `max_restarts` times); meanwhile calls return None and the proxy
+      reports the detector unavailable (see _RemoteProxy), so a detector failure never takes
+      the UI down.
+    """
+    def __init__(self, kind: str, ring: SharedFrameRing):
+        cfg = settings.execution
+        self.kind = kind
+        self.ring = ring
+        self.call_timeout_s = cfg.remote_call_timeout_s
+        self.startup_timeout_s = cfg.remote_startup_timeout_s
+        self.max_restarts = cfg.remote_max_restarts
+        self.lock = threading.Lock()
+        self.process: Optional[mp.Process] = None
+        self.conn = None
+        self.ready = False
+        self.failed = False
+        self._starting = False
+
+        # Telemetry
+        self.restarts = 0
+        self.errors = 0
+
+    def start(self, wait: bool = True):
+        """Spawns the host; with wait=False the model loads in the background"""
+        self._starting = True
+        if wait:
+            self._spawn()
+        else:
+            threading.Thread(target=self._spawn, name=f"{self.kind}-host-start", daemon=True).start()
+
+    def _spawn(self):
+        ctx = mp.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(
+            target=host_main, args=(self.kind, child_conn, settings.model_dump_json()),
+            name=f"{self.kind}-detector-host", daemon=True
+        )
+        process.start()
+        child_conn.close()
+        ok = parent_conn.poll(self.startup_timeout_s)
+        try:
+            ok = ok and parent_conn.recv()[0] == "ready"
+        except (EOFError, OSError):
+            ok = False
+
+        with self.lock:
+            self._starting = False
+            if not ok:
+                process.kill()
+                logger.error(f"{self.kind} detector host failed to start")
+                self._schedule_restart()
+                return
+            self.process, self.conn, self.ready = process, parent_conn, True
+        logger.info(f"{self.kind} detector host ready (pid {process.pid})")
+
+    def _schedule_restart(self):
+        """Caller holds the lock"""
+        self.ready = False
+        if self.process is not None:
+            self.process.kill()
+            self.process = None
+        if self.restarts >= self.max_restarts:
+            if not self.failed:
+                logger.error(f"{self.kind} detector host gave up after {self.restarts} restarts")
+            self.failed = True
+            return
+        if not self._starting:
+            self.restarts += 1
+            logger.warning(f"Restarting {self.kind} detector host ({self.restarts}/{self.max_restarts})")
+            self.start(wait=False)
+
+    def call(self, *msg) -> Optional[Any]:
+        """Sends one request and waits for its reply; None if the host is unavailable"""
+        with self.lock:
+            if not self.ready:
+                return None
+            try:
+                self.conn.send(msg)
+                if not self.conn.poll(self.call_timeout_s):
+                    raise TimeoutError(f"no reply within {self.call_timeout_s:.1f} s")
+                status, payload = self.conn.recv()
+            except (EOFError, OSError, TimeoutError) as e:
+                logger.error(f"{self.kind} detector host unhealthy: {e}")
+                self._schedule_restart()
+                return None
+        if status == "error":
+            self.errors += 1
+            logger.error(f"{self.kind} detector host error: {payload}")
+            return None
+        return payload
+
+    def detect(self, frame_data: FrameData) -> Optional[Any]:
+        # The slot stays leased until the reply (or the timeout, which kills the host)
+        name, shape, slot = self.ring.put(frame_data)
+        try:
+            return self.call(
+                "detect", name, self.ring.slots, shape, slot,
+                frame_data.frame_id, frame_data.timestamp, frame_data.mirrored
+            )
+        finally:
+            self.ring.release(name, slot)
+
+    def stop(self):
+        with self.lock:
+            if self.process is not None:
+                try:
+                    self.conn.send(("stop",))
+                except (EOFError, OSError):
+                    pass
+                self.process.join(timeout=2.0)
+                if self.process.is_alive():
+                    self.process.kill()
+            self.process = None
+            self.ready = False
+
+class _RemoteProxy:
+    """
+    Health of a proxy's host, surfaced by SystemController.readiness() and telemetry:
+    "ok", "unavailable" (the last call got no answer: host down or restarting) or
+    "failed" (the host gave up after remote_max_restarts).
+    While not "ok" the proxy reports no results (no face result, no objects), never a
+    stale one, so an outage can neither hide a violation nor raise one against the
+    candidate (an empty face list leaves the missing-face counters alone).
+    """
+    host: DetectorHost
+    available = True
+
+    @property
+    def health(self) -> str:
+        if self.host.failed:
+            return "failed"
+        return "ok" if self.available else "unavailable"
+
+    def _call(self, frame_data: FrameData) -> Optional[Any]:
+        encoded = self.host.detect(frame_data)
+        if self.available != (encoded is not None):
+            self.available = encoded is not None
+            if self.available:
+                logger.info(f"{self.host.kind} detector host available again")
+            else:
+                logger.error(f"{self.host.kind} detector unavailable ({self.health}): reporting no results")
+        return encoded
+
+class RemoteFaceDetector(_RemoteProxy, IFaceDetector):
+    """FaceDetector running in a DetectorHost process"""
+    def __init__(self, ring: SharedFrameRing):
+        self.host = DetectorHost("face", ring)
+        self.host.start(wait=True)
+
+    def warmup(self):
+        pass # The host warms its landmarker before reporting ready
+
+    def process(self, frame_data: FrameData) -> List[FaceResult]:
+        encoded = self._call(frame_data)
+        if encoded is None:
+            return [] # Unknown, not "no face": the outage is reported through health
+        return decode_faces(encoded)
+
+    def reset(self):
+        self.host.call("reset")
+
+    def close(self):
+        self.host.stop()
+
+class RemoteObjectDetector(_RemoteProxy, IObjectDetector):
+    """ObjectDetector (backend, tracker and cadence included) running in a DetectorHost process"""
+    def __init__(self, ring: SharedFrameRing):
+        self.host = DetectorHost("object", ring)
+        self.host.start(wait=True)
+
+    def detect(self, frame_data: FrameData) -> List[DetectionResult]:
+        encoded = self._call(frame_data)
+        if encoded is None:
+            return []
+        return decode_objects(encoded)
+
+    def reset(self):
+        self.host.call("reset")
+
+    def close(self):
+        self.host.stop()
@@ -0,0 +1,203 @@
+"""
+Headless review of recorded exams: no window, no real-time pacing.
+
+Each video is played through a SystemController from a lock-step FileCamera
+(no frame dropped, as fast as the detectors go). Risk cooldowns follow the
+recording's timeline (FrameClock), so the output does not depend on the
+machine's speed. Results are JSON lines:
+
+    {"type": "frame", ...}       every analyzed frame: face pose, objects, signals
+    {"type": "risk_event", ...}  every RiskEvent
+    {"type": "summary", ...}     one per video: frames, speed, event and signal counts
+
+Times ("time") are seconds from the start of the recording. Calibration runs on
+the first frames of each video (the candidate is assumed to face the screen),
+unless --no-calibration is given.
+
+Usage:
+    python -m app.headless VIDEO_OR_FOLDER [...] [-o results.jsonl] [--modules face object]
+                           [--no-calibration] [--signals-only]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+from app.config import settings
+from app.infrastructure.logger import logger
+from app.core.clock import FrameClock
+from app.core.schemas import AnalysisSignal, RiskEvent
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v")
+
+def find_videos(inputs: Iterable[str]) -> List[str]:
+    """Files as given, folders expanded to the videos they contain (sorted)"""
+    videos = []
+    for path in inputs:
+        if os.path.isdir(path):
+            videos.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(VIDEO_EXTENSIONS)
+            ))
+        elif os.path.isfile(path):
+            videos.append(path)
+        else:
+            raise FileNotFoundError(path)
+    return videos
+
+def _signal_record(signal: AnalysisSignal) -> dict:
+    return {"type": signal.behavior_type.value, "severity": signal.severity.value, "details": signal.details}
+
+def frame_record(video: str, frame_id: int, media_time: float, state: str,
+                 results_map: Dict[str, Any], signals: List[AnalysisSignal]) -> dict:
+    faces = results_map.get("face") or []
+    face = faces[0] if faces else None
+    audio = results_map.get("audio")
+    return {
+        "type": "frame",
+        "video": video,
+        "frame_id": frame_id,
+        "time": round(media_time, 3),
+        "state": state,
+        "face": None if face is None else {
+            "present": face.face_present,
+            "yaw": None if face.yaw is None else round(face.yaw, 4),
+            "pitch": None if face.pitch is None else round(face.pitch, 4),
+        },
+        "objects": [
+            {"label": det.label, "confidence": round(det.confidence, 3), "track_id": det.track_id, "age": det.age}
+            for det in results_map.get("object") or []
+        ],
+        "audio": None if audio is None else {"speech": audio.speech_detected, "db": round(audio.decibels, 1)},
+        "signals": [_signal_record(s) for s in signals],
+    }
+
+def event_record(video: str, frame_id: int, media_time: float, event: RiskEvent) -> dict:
+    return {
+        "type": "risk_event",
+        "video": video,
+        "frame_id": frame_id,
+        "time": round(media_time, 3),
+        "risk_level": event.risk_level.value,
+        "reasons": sorted(event.reasons),
+    }
+
+def review_video(path: str, out: TextIO, calibrate: bool = True, frames_output: str = "all",
+                 realtime: bool = False) -> dict:
+    """
+    Plays one recording through a SystemController and writes its records; returns its summary.
+    frames_output: "all" frame records, "signals" (frames that raised signals) or "none".
+    """
+    # Heavy imports (detectors) stay behind argument parsing
+    from app.core.system_controller import SystemController
+    from app.infrastructure.file_camera import FileCamera
+
+    camera = FileCamera(path, realtime=realtime)
+    controller = SystemController(camera=camera, clock=FrameClock())
+    frames = 0
+    signal_counts, level_counts = Counter(), Counter()
+    t0 = time.perf_counter()
+    try:
+        # 1. Models come from the registry: loaded by the first video, reused by the next ones.
+        #    The recording starts only once they are ready, so no frame plays unanalyzed
+        controller.initialize()
+        controller.wait_until_ready(settings.execution.remote_startup_timeout_s)
+        failed = [name for name, state in controller.readiness().items() if state != "ready"]
+        if failed:
+            raise RuntimeError(f"Modules not ready: {', '.join(failed)}")
+        controller.start()
+        if calibrate and "face" in controller.detectors:
+            controller.start_calibration()
+        else:
+            controller.is_monitoring = True
+
+        # 2. Every frame, in order, until the file ends
+        while True:
+            frame_data = camera.wait_for_frame(controller.last_frame_id, timeout=1.0)
+            if frame_data is None:
+                if camera.finished or not camera.running:
+                    break
+                continue
+            controller.last_frame_id = frame_data.frame_id
+            try:
+                ctx = controller.infer_frame(frame_data)
+                results_map, risk_event = controller.analyze_frame(ctx)
+            finally:
+                camera.release(frame_data)
+            frames += 1
+
+            state = ctx.get("state")
+            signals = ctx.get("signals") or []
+            signal_counts.update(s.behavior_type.value for s in signals)
+            media_time = frame_data.timestamp - camera.start_time
+            if frames_output == "all" or (frames_output == "signals" and signals):
+                record = frame_record(path, frame_data.frame_id, media_time, state, results_map, signals)
+                out.write(json.dumps(record) + "\n")
+            if risk_event is not None:
+                level_counts[risk_event.risk_level.value] += 1
+                out.write(json.dumps(event_record(path, frame_data.frame_id, media_time, risk_event)) + "\n")
+    finally:
+        controller.stop()
+        controller.shutdown(unload_models=False)
+
+    elapsed = time.perf_counter() - t0
+    events = sum(level_counts.values())
+    summary = {
+        "type": "summary",
+        "video": path,
+        "frames": frames,
+        "elapsed_s": round(elapsed, 3),
+        "fps": round(frames / elapsed, 1) if elapsed > 0 else 0.0,
+        "risk_events": events,
+        "risk_levels": dict(level_counts),
+        "max_risk_level": next((level for level in ("HIGH", "MEDIUM", "LOW") if level_counts[level]), None),
+        "signals": dict(signal_counts),
+    }
+    out.write(json.dumps(summary) + "\n")
+    out.flush()
+    logger.info(f"{path}: {frames} frames in {elapsed:.1f} s ({summary['fps']} fps), {events} risk events")
+    return summary
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Video files or folders of videos")
+    parser.add_argument("-o", "--output", default="-", help="JSONL results file (default: stdout)")
+    parser.add_argument("--modules", nargs="+", choices=["face", "object"],
+                        help="Detectors to run (default: the configured ones, without audio)")
+    parser.add_argument("--no-calibration", action="store_true", help="Monitor from the first frame")
+    parser.add_argument("--signals-only", action="store_true", help="Write only frames that raised signals")
+    parser.add_argument("--realtime", action="store_true", help="Play at the recordings' frame rate")
+    args = parser.parse_args(argv)
+
+    videos = find_videos(args.inputs)
+    if not videos:
+        parser.error("no videos found")
+    # Recordings carry no live microphone: audio is never run here
+    settings.active_modules = set(args.modules or settings.active_modules) - {"audio"}
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    if out is sys.stdout:
+        # Keep stdout for the results
+        for handler in logger.handlers:
+            handler.setStream(sys.stderr)
+    failures = 0
+    try:
+        for i, video in enumerate(videos, 1):
+            logger.info(f"[{i}/{len(videos)}] {video}")
+            try:
+                review_video(video, out, calibrate=not args.no_calibration,
+                             frames_output="signals" if args.signals_only else "all", realtime=args.realtime)
+            except Exception as e:
+                failures += 1
+                logger.error(f"{video} failed: {e}")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        from app.core.model_registry import model_registry
+        model_registry.clear()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
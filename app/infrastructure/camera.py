@@ -4,31 +4,73 @@ import threading
 from typing import Optional
 from app.config import settings
 from app.infrastructure.logger import logger
+from app.infrastructure.frame_ring import FrameRing
 from app.core.schemas import FrameData
 
 class Camera:
-    def __init__(self):
+    """
+    Capture thread writing into a preallocated FrameRing; consumers lease frames.
+    Subclasses (file / synthetic sources) override the _open / _wait_turn / _timestamp /
+    _on_read_failure hooks and keep the ring, leasing and counters.
+    """
+    # Every slot leased: drop the frame (live capture) or wait for a free slot (False, lock-step sources)
+    drop_when_busy = True
+
+    def __init__(self, ring_size: Optional[int] = None):
         self.camera_id = settings.camera.id
+        self.ring_size = ring_size or settings.camera.ring_size
+        # Mirroring is applied at display time (Visualizer), not here
+        self.mirror = settings.camera.mirror
         self.cap = None
         self.running = False
         self.thread = None
         self.lock = threading.Lock()
+        # Signalled by the capture thread whenever a new frame is published
+        self.frame_ready = threading.Condition(self.lock)
         
-        # Buffer
+        # Buffer (preallocated ring, created once the capture resolution is known)
+        self.ring: Optional[FrameRing] = None
         self.last_frame: Optional[FrameData] = None
         self.frame_count = 0
         
-    def start(self):
+        # Counters
+        self.last_consumed_id = 0
+        self.dropped_frames = 0    # Captured but overwritten before any consumer saw them
+        self.duplicate_frames = 0  # Handed out again by read() with an already-consumed frame_id
+        
+    def _open(self):
+        """The capture device (anything with cv2.VideoCapture's read / grab / get / release)"""
         logger.info(f"Opening camera {self.camera_id}...")
-        self.cap = cv2.VideoCapture(self.camera_id)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, settings.camera.width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, settings.camera.height)
-        self.cap.set(cv2.CAP_PROP_FPS, settings.camera.fps)
+        cap = cv2.VideoCapture(self.camera_id)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, settings.camera.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, settings.camera.height)
+        cap.set(cv2.CAP_PROP_FPS, settings.camera.fps)
+        return cap
+
+    def _wait_turn(self):
+        """Called before each capture (live cameras are paced by the driver)"""
+        pass
+
+    def _timestamp(self) -> float:
+        return time.time()
+
+    def _on_read_failure(self):
+        logger.warning("Failed to read frame")
+        time.sleep(0.1)
+
+    def start(self):
+        self.cap = self._open()
         
         if not self.cap.isOpened():
             logger.error("Could not open camera!")
             raise RuntimeError("Camera open failed")
             
+        # The driver may not honour the requested resolution, so size the ring from what it reports
+        width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or settings.camera.width
+        height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or settings.camera.height
+        if self.ring is None or self.ring.shape != (height, width, 3):
+            self.ring = FrameRing(self.ring_size, (height, width, 3))
+            
         self.running = True
         self.thread = threading.Thread(target=self._update, daemon=True)
         self.thread.start()
@@ -36,35 +78,122 @@ class Camera:
 
     def _update(self):
         while self.running:
-            ret, frame = self.cap.read()
+            self._wait_turn()
+            if not self.running:
+                break
+            slot = self.ring.acquire_write()
+            if slot is None and not self.drop_when_busy:
+                time.sleep(0.002)
+                continue
+            if slot is None:
+                # Every slot is leased by a consumer: discard this frame without decoding it
+                ret = self.cap.grab()
+                if ret:
+                    with self.frame_ready:
+                        self.dropped_frames += 1
+                continue
+
+            # Decode straight into the preallocated buffer
+            ret, frame = self.cap.read(slot.buffer)
             if ret:
-                # Flip horizontally for natural mirror view
-                frame = cv2.flip(frame, 1)
+                if frame is not slot.buffer:
+                    # Resolution changed under us: adopt the new buffer (one-off allocation)
+                    logger.warning(f"Camera delivered {frame.shape}, expected {slot.buffer.shape}")
+                    slot.buffer = frame
                 
-                with self.lock:
+                with self.frame_ready:
+                    if not self.drop_when_busy:
+                        # Lock-step source: never publish over a frame no consumer has taken
+                        while self.running and not self._consumed():
+                            self.frame_ready.wait(0.1)
+                        if not self.running:
+                            break
+                    if self.last_frame is not None and self.last_frame.frame_id > self.last_consumed_id:
+                        self.dropped_frames += 1
+                        
                     self.frame_count += 1
-                    self.last_frame = FrameData(
+                    self.last_frame = self.ring.publish(
+                        slot,
                         frame_id=self.frame_count,
-                        timestamp=time.time(),
-                        frame=frame
+                        timestamp=self._timestamp(),
+                        mirrored=self.mirror
                     )
+                    self.frame_ready.notify_all()
             else:
-                logger.warning("Failed to read frame")
-                time.sleep(0.1)
+                self._on_read_failure()
                 
+    def _consumed(self) -> bool:
+        """The last published frame was handed to a consumer (call with frame_ready held)"""
+        return self.last_frame is None or self.last_consumed_id >= self.last_frame.frame_id
+
     def read(self) -> Optional[FrameData]:
+        """
+        Leases the latest frame, new or not (counted as duplicate if already consumed).
+        The caller must hand it back with release().
+        """
         with self.lock:
             if self.last_frame is None:
                 return None
-            # Return a copy or the same reference? 
-            # For strictness, maybe copy, but for speed, reference.
-            # Since we replace last_frame entirely in update, returning ref is safe enough 
-            # IF the consumer processes it before it's overwritten or doesn't care.
-            # Actually, the consumer needs the specific frame data. 
-            return self.last_frame
+            if self.last_frame.frame_id <= self.last_consumed_id:
+                self.duplicate_frames += 1
+            self.last_consumed_id = self.last_frame.frame_id
+            self.frame_ready.notify_all() # Wakes a lock-stepped writer
+            return self.ring.lease_latest()
+
+    def wait_for_frame(self, after_id: int, timeout: Optional[float] = None) -> Optional[FrameData]:
+        """
+        Blocks until a frame newer than `after_id` is captured and leases it.
+        Returns None on timeout or when the camera stops, so callers never reprocess a frame.
+        The caller must hand the frame back with release().
+        """
+        with self.frame_ready:
+            has_new_frame = lambda: (
+                not self.running
+                or (self.last_frame is not None and self.last_frame.frame_id > after_id)
+            )
+            self.frame_ready.wait_for(has_new_frame, timeout=timeout)
+            
+            if self.last_frame is None or self.last_frame.frame_id <= after_id:
+                return None
+            
+            self.last_consumed_id = max(self.last_consumed_id, self.last_frame.frame_id)
+            self.frame_ready.notify_all() # Wakes a lock-stepped writer
+            return self.ring.lease_latest()
+
+    def lease(self, frame_data: FrameData):
+        """Adds a lease on an already-leased frame (e.g. for work that may outlive the step)"""
+        if self.ring:
+            self.ring.lease(frame_data)
+
+    def release(self, frame_data: FrameData):
+        """Returns a leased frame buffer to the ring"""
+        if self.ring:
+            self.ring.release(frame_data)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "frames_captured": self.frame_count,
+                "dropped_frames": self.dropped_frames,
+                "duplicate_frames": self.duplicate_frames,
+            }
+
+    def reset_stats(self):
+        """
+        Starts the drop / duplicate counters over (frames captured while nobody consumed them are not drops).
+        frame_count keeps going: it is the frame_id sequence.
+        """
+        with self.lock:
+            self.dropped_frames = 0
+            self.duplicate_frames = 0
+            if self.last_frame is not None:
+                self.last_consumed_id = self.last_frame.frame_id
 
     def stop(self):
-        self.running = False
+        with self.frame_ready:
+            self.running = False
+            # Wake any consumer blocked in wait_for_frame
+            self.frame_ready.notify_all()
         if self.thread:
             self.thread.join()
         if self.cap:
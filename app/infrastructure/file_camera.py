@@ -0,0 +1,132 @@
+import time
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+from app.infrastructure.logger import logger
+from app.infrastructure.camera import Camera
+
+class FileCamera(Camera):
+    """
+    Camera stand-in that plays a recorded video through the same ring / leasing API.
+    - realtime=True: frames are released at the file's frame rate (like a live camera;
+      a slow consumer drops frames).
+    - realtime=False: lock-step, as fast as the consumer goes; the next frame is decoded
+      only once the previous one was consumed, so no frame is ever dropped.
+    - Timestamps are media time (start + frame index / fps), so time-based logic sees the
+      recording's timeline whatever the playback speed.
+    - At the end of the file the camera stops (`finished` is set) unless `loop` is set.
+    """
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False,
+                 ring_size: Optional[int] = None, mirrored: bool = False, fps: Optional[float] = None):
+        super().__init__(ring_size=ring_size)
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.mirror = mirrored # Recordings are usually stored unmirrored
+        self.fps = fps # None = read from the file
+        self.drop_when_busy = realtime
+        self.finished = False
+        self.start_time = 0.0
+        self._next_due = 0.0
+
+    def _open(self):
+        logger.info(f"Opening video {self.path}...")
+        return cv2.VideoCapture(self.path)
+
+    def start(self):
+        self.finished = False
+        super().start()
+
+    def _update(self):
+        # Capture properties are known once the file is open (start() runs this thread last)
+        if self.fps is None:
+            self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.start_time = time.time()
+        self._next_due = time.perf_counter()
+        super()._update()
+
+    def _wait_turn(self):
+        if self.realtime:
+            delay = self._next_due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_due = max(self._next_due + 1.0 / self.fps, time.perf_counter())
+            return
+        # Lock-step: wait (however long the consumer takes) until it has taken the last frame
+        with self.frame_ready:
+            while self.running and not self._consumed():
+                self.frame_ready.wait(0.1)
+
+    def _timestamp(self) -> float:
+        return self.start_time + (self.frame_count - 1) / self.fps
+
+    def _on_read_failure(self):
+        if self.loop and self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+            return
+        logger.info(f"End of {self.path} after {self.frame_count} frames")
+        with self.frame_ready:
+            self.finished = True
+            self.running = False
+            self.frame_ready.notify_all()
+
+class SyntheticCapture:
+    """
+    cv2.VideoCapture look-alike producing a moving test pattern (no camera or file needed).
+    `frames=None` runs forever.
+    """
+    def __init__(self, width: int = 640, height: int = 480, fps: float = 30.0,
+                 frames: Optional[int] = None, seed: int = 0):
+        self.shape: Tuple[int, int, int] = (height, width, 3)
+        self.fps = fps
+        self.frames = frames
+        self.position = 0
+        rng = np.random.default_rng(seed)
+        self.background = rng.integers(0, 255, self.shape, dtype=np.uint8)
+
+    def isOpened(self) -> bool:
+        return True
+
+    def get(self, prop: int) -> float:
+        return {
+            cv2.CAP_PROP_FRAME_WIDTH: self.shape[1],
+            cv2.CAP_PROP_FRAME_HEIGHT: self.shape[0],
+            cv2.CAP_PROP_FPS: self.fps,
+            cv2.CAP_PROP_FRAME_COUNT: self.frames or 0,
+        }.get(prop, 0.0)
+
+    def set(self, prop: int, value: float) -> bool:
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.position = int(value)
+            return True
+        return False
+
+    def grab(self) -> bool:
+        if self.frames is not None and self.position >= self.frames:
+            return False
+        self.position += 1
+        return True
+
+    def read(self, image: Optional[np.ndarray] = None):
+        if not self.grab():
+            return False, None
+        if image is None or image.shape != self.shape:
+            image = np.empty(self.shape, dtype=np.uint8)
+        # Background scrolled by one pixel per frame plus a moving square (motion for the gate)
+        np.copyto(image, np.roll(self.background, self.position, axis=1))
+        h, w = self.shape[:2]
+        x = (self.position * 4) % max(1, w - 80)
+        image[h // 3:h // 3 + 80, x:x + 80] = 255
+        return True, image
+
+    def release(self):
+        pass
+
+class SyntheticCamera(FileCamera):
+    """FileCamera over a SyntheticCapture (load tests, benchmarks, CI)"""
+    def __init__(self, width: int = 640, height: int = 480, fps: float = 30.0, frames: Optional[int] = None,
+                 realtime: bool = True, loop: bool = False, ring_size: Optional[int] = None, seed: int = 0):
+        super().__init__(f"synthetic-{seed}", realtime=realtime, loop=loop, ring_size=ring_size, fps=fps)
+        self.capture_args = dict(width=width, height=height, fps=fps, frames=frames, seed=seed)
+
+    def _open(self):
+        return SyntheticCapture(**self.capture_args)
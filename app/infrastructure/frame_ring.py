@@ -0,0 +1,77 @@
+import threading
+import numpy as np
+from typing import List, Optional, Tuple
+from app.core.schemas import FrameData
+
+class FrameSlot:
+    """One preallocated frame buffer plus the FrameData that describes it"""
+    def __init__(self, index: int, shape: Tuple[int, int, int]):
+        self.index = index
+        self.buffer = np.empty(shape, dtype=np.uint8)
+        self.frame_data = FrameData(frame_id=0, timestamp=0.0, frame=self.buffer, slot=index)
+        self.refcount = 0
+
+class FrameRing:
+    """
+    Fixed-size ring of preallocated frame buffers.
+    - The capture thread writes into a free slot in place (no per-frame allocation).
+    - Consumers lease the published slot; it is not reused until every lease is released.
+    - When every slot is leased the writer gets None and the caller drops the frame.
+    """
+    def __init__(self, size: int, shape: Tuple[int, int, int]):
+        self.lock = threading.Lock()
+        self.shape = shape
+        self.slots: List[FrameSlot] = [FrameSlot(i, shape) for i in range(max(2, size))]
+        self.latest: Optional[FrameSlot] = None
+        self._next = 0
+
+    def acquire_write(self) -> Optional[FrameSlot]:
+        """Returns the next free slot for the writer (round-robin), or None if all are busy"""
+        with self.lock:
+            for offset in range(len(self.slots)):
+                slot = self.slots[(self._next + offset) % len(self.slots)]
+                if slot.refcount == 0 and slot is not self.latest:
+                    self._next = (slot.index + 1) % len(self.slots)
+                    return slot
+            return None
+
+    def publish(self, slot: FrameSlot, frame_id: int, timestamp: float, mirrored: bool = False) -> FrameData:
+        """Marks a written slot as the latest frame"""
+        with self.lock:
+            fd = slot.frame_data
+            fd.frame_id = frame_id
+            fd.timestamp = timestamp
+            fd.mirrored = mirrored
+            # The writer may have had to reallocate (resolution mismatch)
+            fd.frame = slot.buffer
+            fd.invalidate_views()
+            self.latest = slot
+            return fd
+
+    def lease_latest(self) -> Optional[FrameData]:
+        """Leases the most recently published frame (caller must release it)"""
+        with self.lock:
+            if self.latest is None:
+                return None
+            self.latest.refcount += 1
+            return self.latest.frame_data
+
+    def lease(self, frame_data: FrameData):
+        """Adds a lease on an already-leased frame (e.g. handing it to another stage)"""
+        if frame_data.slot is None:
+            return
+        with self.lock:
+            self.slots[frame_data.slot].refcount += 1
+
+    def release(self, frame_data: FrameData):
+        if frame_data.slot is None:
+            return
+        with self.lock:
+            slot = self.slots[frame_data.slot]
+            if slot.refcount > 0:
+                slot.refcount -= 1
+
+    @property
+    def leased_slots(self) -> int:
+        with self.lock:
+            return sum(1 for s in self.slots if s.refcount > 0)
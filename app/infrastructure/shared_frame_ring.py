@@ -0,0 +1,119 @@
+import atexit
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+import numpy as np
+from app.core.schemas import FrameData
+
+class SharedFrameRing:
+    """
+    Frame buffers in one multiprocessing.shared_memory block, so detector host processes
+    read frames without pickling them.
+    - The parent writes each frame once (put()), however many hosts read it; only the
+      slot index and frame metadata cross the process boundary.
+    - Each put() leases its slot until release(): a slot is only rewritten once no host
+      call reads it, even with hosts called in parallel (parallel_detectors) or a call
+      left running past its timeout. With every slot leased, put() waits for one.
+    - The block is (re)created at the first frame's resolution.
+    """
+    def __init__(self, slots: int = 4):
+        self.slots = max(2, slots)
+        self.lock = threading.Lock()
+        self.released = threading.Condition(self.lock)
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.shape: Optional[Tuple[int, int, int]] = None
+        self.buffers: Optional[np.ndarray] = None
+        self._next = 0
+        self._written: Dict[int, int] = {} # frame_id -> slot
+        self.refcount = [0] * self.slots
+        atexit.register(self.unlink)
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.shm.name if self.shm is not None else None
+
+    def _allocate(self, shape: Tuple[int, int, int]):
+        self.unlink()
+        size = int(np.prod(shape)) * self.slots
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.shape = shape
+        self.buffers = np.ndarray((self.slots, *shape), dtype=np.uint8, buffer=self.shm.buf)
+        self._next = 0
+        self._written = {}
+        self.refcount = [0] * self.slots # Leases on the old block no longer count
+        self.released.notify_all()
+
+    def _free_slot(self) -> Optional[int]:
+        """Next unleased slot, round-robin (caller holds the lock)"""
+        for i in range(self.slots):
+            slot = (self._next + i) % self.slots
+            if self.refcount[slot] == 0:
+                self._next = (slot + 1) % self.slots
+                return slot
+        return None
+
+    def put(self, frame_data: FrameData) -> Tuple[str, Tuple[int, int, int], int]:
+        """
+        Copies the frame into a slot (once per frame_id) and leases it.
+        Returns (block name, shape, slot): pass them to release() once the host has replied.
+        """
+        with self.lock:
+            while True:
+                shape = frame_data.frame.shape
+                if self.shape != shape:
+                    self._allocate(shape)
+                slot = self._written.get(frame_data.frame_id)
+                if slot is not None:
+                    break
+                slot = self._free_slot()
+                if slot is not None:
+                    self._written = {fid: s for fid, s in self._written.items() if s != slot}
+                    self._written[frame_data.frame_id] = slot
+                    np.copyto(self.buffers[slot], frame_data.frame)
+                    break
+                self.released.wait()
+            self.refcount[slot] += 1
+            return self.shm.name, self.shape, slot
+
+    def release(self, name: str, slot: int):
+        """Ends a put()'s lease (ignored if the block was reallocated since)"""
+        with self.lock:
+            if name == self.name and self.refcount[slot] > 0:
+                self.refcount[slot] -= 1
+                self.released.notify_all()
+
+    def close(self):
+        self.unlink()
+
+    def unlink(self):
+        """Releases the block (parent only; hosts just close their mapping)"""
+        if self.shm is not None:
+            self.buffers = None
+            self.shm.close()
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+            self.shm = None
+            self.shape = None
+
+class SharedFrameReader:
+    """Host-side mapping of a SharedFrameRing (re-attaches when the parent reallocates)"""
+    def __init__(self):
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.buffers: Optional[np.ndarray] = None
+
+    def view(self, name: str, slots: int, shape: Tuple[int, int, int], slot: int) -> np.ndarray:
+        if self.shm is None or self.shm.name != name:
+            self.close()
+            # Spawned hosts share the parent's resource tracker, so attaching does not
+            # hand ownership over: the block is still unlinked by the parent only
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.buffers = np.ndarray((slots, *shape), dtype=np.uint8, buffer=self.shm.buf)
+        return self.buffers[slot]
+
+    def close(self):
+        if self.shm is not None:
+            self.buffers = None
+            self.shm.close()
+            self.shm = None
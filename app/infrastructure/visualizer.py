@@ -12,10 +12,21 @@ class Visualizer:
             RiskLevel.MEDIUM: (0, 255, 255), # Yellow
             RiskLevel.HIGH: (0, 0, 255)    # Red
         }
+        
+        # Preallocated output canvas (reused every frame; consume before the next render)
+        self.canvas: Optional[np.ndarray] = None
+        # Display-time mirroring: overlays are drawn with x -> (w - 1 - x)
+        self.mirrored = False
+        
+    def _x(self, x: int, w: int) -> int:
+        """Maps a sensor x-coordinate onto the (possibly mirrored) canvas"""
+        return w - 1 - x if self.mirrored else x
     
     def draw_detections(self, frame: np.ndarray, detections: List[DetectionResult]):
+        w = frame.shape[1]
         for det in detections:
             x1, y1, x2, y2 = det.box
+            x1, x2 = sorted((self._x(x1, w), self._x(x2, w)))
             color = (0, 0, 255) if det.label == "cell phone" else (255, 0, 0)
             cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
             # No Text
@@ -36,14 +47,12 @@ class Visualizer:
                     # Key points to highlight (Nose, Chin, Left Eye, Right Eye, Mouth L, Mouth R)
                     key_indices = [1, 152, 33, 263, 61, 291]
                     
-                    for idx, lm in enumerate(face.landmarks):
-                        x, y = int(lm.x * w), int(lm.y * h)
+                    for idx in key_indices:
+                        lm = face.landmarks[idx]
+                        x, y = self._x(int(lm.x * w), w), int(lm.y * h)
                         
-                        if idx in key_indices:
-                            # Highlight key points (Larger Yellow Dot)
-                            cv2.circle(frame, (x, y), 4, (0, 255, 255), -1)
-                        else:
-                            pass
+                        # Highlight key points (Larger Yellow Dot)
+                        cv2.circle(frame, (x, y), 4, (0, 255, 255), -1)
 
     def draw_risk(self, frame: np.ndarray, risk_event: RiskEvent):
         # User requested NO text on camera feed for risk.
@@ -56,7 +65,17 @@ class Visualizer:
               risk_event: Optional[RiskEvent],
               audio_result: Optional[AudioResult] = None) -> np.ndarray:
               
-        image = frame_data.frame.copy()
+        src = frame_data.frame
+        if self.canvas is None or self.canvas.shape != src.shape:
+            self.canvas = np.empty_like(src)
+        image = self.canvas
+        
+        # 0. Copy into the canvas, mirroring for display if the frame is raw sensor orientation
+        self.mirrored = frame_data.mirrored
+        if self.mirrored:
+            cv2.flip(src, 1, dst=image)
+        else:
+            np.copyto(image, src)
         
         # 1. Draw Object Detections
         self.draw_detections(image, object_results)
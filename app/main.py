@@ -19,27 +19,25 @@ def main():
     # Start Modules
     controller.start()
     
-    # Setup Window and Callback
+    # Setup Window
     window_name = "Proctoring System - Monitor"
     cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-    cv2.setMouseCallback(window_name, controller.on_mouse_click)
     
-    logger.info("System Running. Press 'q' to exit.")
+    logger.info("System Running. Press 'c' to calibrate, 'q' to exit.")
 
     try:
         while True:
-            # Step returns (visualized frame, results_map)
-            step_result = controller.step()
-            if step_result is None:
-                continue
-            
-            vis_frame, _ = step_result
+            # Step returns (visualized frame, results_map, risk_event)
+            vis_frame, _, _ = controller.step()
             
             if vis_frame is not None:
-                cv2.imshow("Proctoring System - Monitor", vis_frame)
+                cv2.imshow(window_name, vis_frame)
             
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord('q'):
                 break
+            if key == ord('c'):
+                controller.start_calibration()
                 
     except KeyboardInterrupt:
         logger.info("Keyboard Interrupt.")
@@ -48,6 +46,7 @@ def main():
     finally:
         logger.info("Shutting down...")
         controller.stop()
+        controller.shutdown()
         cv2.destroyAllWindows()
 
 if __name__ == "__main__":
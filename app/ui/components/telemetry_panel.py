@@ -20,6 +20,11 @@ class TelemetryPanel(QFrame):
         self.audio_label.setStyleSheet("border: none; font-size: 12px; color: #ecf0f1;")
         self.layout.addWidget(self.audio_label)
         
+        self.perf_label = QLabel("")
+        self.perf_label.setStyleSheet("border: none; font-size: 11px; color: #95a5a6;")
+        self.perf_label.setWordWrap(True)
+        self.layout.addWidget(self.perf_label)
+        
         self.warning_label = QLabel("")
         self.warning_label.setStyleSheet("color: #e74c3c; border: none; font-weight: bold; font-size: 12px;")
         self.warning_label.setWordWrap(True)
@@ -32,6 +37,9 @@ class TelemetryPanel(QFrame):
         if "audio_db" in stats:
             self.audio_label.setText(f"Audio: {stats['audio_db']}")
             
+        if "perf" in stats:
+            self.perf_label.setText("\n".join(f"{k}: {v}" for k, v in stats["perf"].items()))
+            
         if "warning" in stats:
             self.warning_label.setText(f"⚠ {stats['warning']}")
         else:
@@ -40,4 +48,5 @@ class TelemetryPanel(QFrame):
     def reset(self):
         self.pose_label.setText("Pose: -")
         self.audio_label.setText("Audio: -")
+        self.perf_label.setText("")
         self.warning_label.setText("")
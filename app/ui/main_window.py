@@ -1,8 +1,8 @@
 from PyQt6.QtWidgets import QMainWindow, QStackedWidget
-from PyQt6.QtCore import pyqtSlot
+from PyQt6.QtCore import pyqtSlot, QTimer
+from app.config import settings
 from app.ui.home_page import HomePage
 from app.ui.proctor_page import ProctorPage
-from app.ui.worker import ProctorWorker
 from app.infrastructure.logger import logger
 
 from app.ui.styles import GLOBAL_STYLES
@@ -25,8 +25,11 @@ class MainWindow(QMainWindow):
         self.stack.addWidget(self.home_page)
         self.stack.addWidget(self.proctor_page)
         
-        # Worker (Created on demand)
+        # Worker (Created on demand); the controller outlives it, keeping models loaded between exams.
+        # Both are imported on first use, so the home page paints before OpenCV / detector imports
         self.worker = None
+        self.controller = None
+        self._preload_scheduled = False
         
         # Signals
         self.home_page.start_exam_signal.connect(self.start_exam)
@@ -42,7 +45,11 @@ class MainWindow(QMainWindow):
         
         # Initialize Worker
         if self.worker is None:
-            self.worker = ProctorWorker()
+            from app.ui.worker import ProctorWorker
+            from app.core.system_controller import SystemController
+            if self.controller is None:
+                self.controller = SystemController()
+            self.worker = ProctorWorker(self.controller)
             
             # Connect Worker -> UI
             self.worker.image_signal.connect(self.proctor_page.update_frame)
@@ -63,6 +70,24 @@ class MainWindow(QMainWindow):
         self.proctor_page.reset_ui()
         self.stack.setCurrentWidget(self.home_page)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Once the first paint is queued, import the active profile's detectors in the background
+        if not self._preload_scheduled:
+            self._preload_scheduled = True
+            QTimer.singleShot(0, self._preload_detectors)
+
+    def _preload_detectors(self):
+        from app.detectors.registry import preload
+        preload(settings.active_modules, settings.execution.remote_modules)
+
+    def closeEvent(self, event):
+        """Application exit: stop the exam, then release the camera and models"""
+        self.stop_exam()
+        if self.controller is not None:
+            self.controller.shutdown()
+        super().closeEvent(event)
+
     @pyqtSlot()
     def start_calibration(self):
         """User requested to START or REDO calibration"""
@@ -2,7 +2,9 @@ import cv2
 import numpy as np
 from PyQt6.QtCore import QThread, pyqtSignal, Qt
 from PyQt6.QtGui import QImage
+from app.config import settings
 from app.core.system_controller import SystemController
+from app.core.pipeline import StagedPipeline
 from app.core.schemas import RiskLevel
 
 class ProctorWorker(QThread):
@@ -13,10 +15,11 @@ class ProctorWorker(QThread):
     stats_signal = pyqtSignal(dict) # new generic stats channel
     log_signal = pyqtSignal(str, str) # (Message, Color) - New Log Channel
     
-    def __init__(self):
+    def __init__(self, controller: SystemController = None):
         super().__init__()
         self.running = True
-        self.controller = SystemController()
+        # Shared across sessions by MainWindow, so models (and the camera) stay warm
+        self.controller = controller or SystemController()
         # Track previous state to log transitions
         self.prev_face_state = "IDLE" 
         
@@ -26,8 +29,31 @@ class ProctorWorker(QThread):
         self.log_signal.emit("Initializing System...", "#3498db")
         self.controller.initialize()
         self.controller.start()
-        self.log_signal.emit("System Ready. Waiting for Calibration.", "#00FF00")
+        # Models load in the background; report each one as it becomes ready
+        for name, future in list(self.controller.ready.items()):
+            future.add_done_callback(lambda f, name=name: self._on_module_ready(name, f))
         
+        if settings.execution.pipeline:
+            self._run_pipeline()
+        else:
+            self._run_sequential()
+                
+        # Cleanup
+        self.controller.stop()
+        self.log_signal.emit("System Stopped.", "orange")
+
+    def _on_module_ready(self, name: str, future):
+        """Called on the loading thread (Qt queues the signals to the UI thread)"""
+        if future.exception() is not None:
+            self.log_signal.emit(f"{name.capitalize()} module failed to load.", "red")
+            return
+        self.log_signal.emit(f"{name.capitalize()} module ready.", "#3498db")
+        if name == "face":
+            # Calibration only needs the face module
+            self.log_signal.emit("System Ready. Waiting for Calibration.", "#00FF00")
+
+    def _run_sequential(self):
+        """One controller.step() per iteration: inference, analysis and render in turn"""
         while self.running:
             # 1. Logic Step
             step_result = self.controller.step()
@@ -39,86 +65,123 @@ class ProctorWorker(QThread):
             frame, results, risk_event = step_result
             
             if frame is not None:
-                # 2. Convert to Qt Image
-                # OpenCV is BGR, Qt needs RGB
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = rgb_frame.shape
-                bytes_per_line = ch * w
-                
-                # Create QImage from data (Zero Copy if possible, but keeping it safe)
-                qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-                
-                # emit emits a COPY of the image usually, safe for UI thread
-                self.image_signal.emit(qt_image.copy())
-                
-                # 3. Emit Status Updates
-                if self.controller.risk_engine and self.controller.risk_engine.current_risk_level:
-                    level = self.controller.risk_engine.current_risk_level
-                    color = "#00FF00" # Green
-                    if level == RiskLevel.HIGH: color = "#FF0000"
-                    elif level == RiskLevel.MEDIUM: color = "#FFFF00"
-                    
-                    self.status_signal.emit(f"RISK: {level.value}", color)
-                    
-                # 3b. Emit Risk Event (Log)
-                if risk_event:
-                    self.risk_signal.emit(risk_event)
+                self._emit_frame(frame)
+                self._emit_results(results, risk_event)
+            else:
+                self.msleep(10) # Avoid busy loop if no camera
 
-                # 4. Emit Rich Telemetry
-                stats = {}
-                # Extract Head Pose
-                if "face" in results:
-                    # Assuming list, take first face
-                    faces = results["face"]
-                    if faces and faces[0].face_present:
-                        face = faces[0]
-                        if face.yaw is not None:
-                            stats["yaw"] = f"{face.yaw:.2f}"
-                            stats["pitch"] = f"{face.pitch:.2f}"
-                            stats["roll"] = f"{face.roll:.2f}"
-                        
-                        # LOG STATE TRANSITIONS
-                        # We don't have direct access to 'state' string in result, but we can infer
-                        # Actually we can't easily infer "CALIBRATED" transition from just boolean is_calibrating
-                        # We need the FaceDetector state.
-                        # BUT, we can detect end of calibration:
-                        if self.prev_face_state == "CALIBRATING" and not face.is_calibrating:
-                             # Either Success or Failure?
-                             # If we have yaw/pitch, it's likely success monitoring.
-                             self.log_signal.emit("Calibration Successful!", "#00FF00")
-                             self.prev_face_state = "MONITORING"
-                        
-                        elif not face.is_calibrating and self.prev_face_state == "IDLE":
-                            # Maybe monitoring?
-                            pass
-                            
-                        # Update tracker
-                        if face.is_calibrating: 
-                            self.prev_face_state = "CALIBRATING"
-                        
-                        # Pass calibration state to UI
-                        stats["is_calibrating"] = face.is_calibrating
-                        if face.is_calibrating:
-                             stats["calibration_progress"] = int(face.calibration_progress * 100)
-                        
-                        if face.calibration_warning:
-                            stats["warning"] = face.calibration_warning
+    def _run_pipeline(self):
+        """Stages on their own threads (StagedPipeline); this thread only waits for stop()"""
+        pipeline = StagedPipeline(
+            self.controller,
+            on_result=lambda packet: self._emit_results(packet.results, packet.risk_event),
+            on_frame=lambda packet, frame: self._emit_frame(frame)
+        )
+        pipeline.start()
+        while self.running:
+            self.msleep(50)
+        pipeline.stop()
 
-                # Extract Audio (if available)
-                if "audio" in results and results["audio"]:
-                     stats["audio_db"] = f"{results['audio'].decibels:.1f} dB"
+    def _emit_frame(self, frame):
+        # 2. Convert to Qt Image
+        # Qt reads BGR directly, so no colour conversion is needed
+        h, w, ch = frame.shape
+        bytes_per_line = ch * w
+        
+        # Wrap the visualizer canvas (Zero Copy)
+        qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format.Format_BGR888)
+        
+        # The canvas is reused next frame, so the UI thread gets its own copy (the only per-frame copy)
+        self.image_signal.emit(qt_image.copy())
 
-                self.stats_signal.emit(stats)
+    def _emit_results(self, results: dict, risk_event):
+        # 3. Emit Status Updates
+        if self.controller.risk_engine and self.controller.risk_engine.current_risk_level:
+            level = self.controller.risk_engine.current_risk_level
+            color = "#00FF00" # Green
+            if level == RiskLevel.HIGH: color = "#FF0000"
+            elif level == RiskLevel.MEDIUM: color = "#FFFF00"
+            
+            self.status_signal.emit(f"RISK: {level.value}", color)
+            
+        # 3b. Emit Risk Event (Log)
+        if risk_event:
+            self.risk_signal.emit(risk_event)
 
+        # 4. Emit Rich Telemetry
+        stats = {}
+        # Extract Head Pose
+        if "face" in results:
+            # Assuming list, take first face
+            faces = results["face"]
+            if faces and faces[0].face_present:
+                face = faces[0]
+                if face.yaw is not None:
+                    stats["yaw"] = f"{face.yaw:.2f}"
+                    stats["pitch"] = f"{face.pitch:.2f}"
+                    stats["roll"] = f"{face.roll:.2f}"
+                
+                # LOG STATE TRANSITIONS
+                # We don't have direct access to 'state' string in result, but we can infer
+                # Actually we can't easily infer "CALIBRATED" transition from just boolean is_calibrating
+                # We need the FaceDetector state.
+                # BUT, we can detect end of calibration:
+                if self.prev_face_state == "CALIBRATING" and not face.is_calibrating:
+                     # Either Success or Failure?
+                     # If we have yaw/pitch, it's likely success monitoring.
+                     self.log_signal.emit("Calibration Successful!", "#00FF00")
+                     self.prev_face_state = "MONITORING"
+                
+                elif not face.is_calibrating and self.prev_face_state == "IDLE":
+                    # Maybe monitoring?
+                    pass
+                    
+                # Update tracker
+                if face.is_calibrating: 
+                    self.prev_face_state = "CALIBRATING"
+                
+                # Pass calibration state to UI
+                stats["is_calibrating"] = face.is_calibrating
+                if face.is_calibrating:
+                     stats["calibration_progress"] = int(face.calibration_progress * 100)
+                
+                if face.calibration_warning:
+                    stats["warning"] = face.calibration_warning
 
+        # Extract Audio (if available)
+        if "audio" in results and results["audio"]:
+             stats["audio_db"] = f"{results['audio'].decibels:.1f} dB"
 
+        # Performance Counters (detector invocations, camera drops/duplicates, gate)
+        telemetry = self.controller.telemetry
+        perf = {}
+        if "detector_calls" in telemetry:
+            perf["Detector calls/frame"] = telemetry["detector_calls"]
+        if "dropped_frames" in telemetry:
+            perf["Dropped frames"] = telemetry["dropped_frames"]
+            perf["Duplicate frames"] = telemetry["duplicate_frames"]
+        if "gate_decision" in telemetry:
+            perf["Gate"] = f"{telemetry['gate_decision']} (skipped {telemetry['gate_skip_ratio']:.0%})"
+        if "object_imgsz" in telemetry:
+            perf["YOLO imgsz"] = f"{telemetry['object_imgsz']} ({telemetry['object_latency_ms']:.0f} ms)"
+        if telemetry.get("detector_timeouts"):
+            perf["Detector timeouts"] = ", ".join(f"{k} {v}" for k, v in telemetry["detector_timeouts"].items())
+        if any(telemetry.get("host_restarts", {}).values()):
+            perf["Host restarts"] = ", ".join(f"{k} {v}" for k, v in telemetry["host_restarts"].items())
+        if "pipeline_latency_ms" in telemetry:
+            perf["Pipeline latency"] = f"{telemetry['pipeline_latency_ms']:.0f} ms (queue drops {telemetry.get('pipeline_queue_drops', 0)})"
+        readiness = self.controller.readiness()
+        if readiness:
+            perf["Modules"] = ", ".join(f"{k} {v}" for k, v in readiness.items())
+        startup = self.controller.startup
+        if "time_to_first_frame_s" in startup:
+            ready = startup.get("time_to_ready_s")
+            perf["Startup"] = (f"first frame {startup['time_to_first_frame_s']:.2f} s, "
+                               f"ready {f'{ready:.2f} s' if ready is not None else '...'}")
+        if perf:
+            stats["perf"] = perf
 
-            else:
-                self.msleep(10) # Avoid busy loop if no camera
-                
-        # Cleanup
-        self.controller.stop()
-        self.log_signal.emit("System Stopped.", "orange")
+        self.stats_signal.emit(stats)
 
     def stop(self):
         self.running = False
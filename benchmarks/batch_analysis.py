@@ -0,0 +1,125 @@
+"""
+Behavior / risk analysis across sessions: scalar objects vs struct of arrays.
+
+Drives N sessions through F frames of synthetic detector results (most
+candidates compliant; a --suspicious share with head pose drifting across the
+thresholds, faces lost, phones and extra people appearing, speech) and
+analyzes every frame twice:
+
+    scalar    one BehaviorAnalyzer + RiskEngine per session, called per session
+    batched   BatchBehaviorAnalyzer + BatchRiskEngine, all sessions per call
+
+Every frame's signals and risk events must be identical (the run fails
+otherwise); reported is the analysis time per frame of all sessions. The
+batched pass has a fixed NumPy cost (tens of microseconds) and still reads
+each session's result objects in Python, so it pays off from roughly a
+hundred sessions per call.
+
+Usage:
+    python -m benchmarks.batch_analysis [--sessions 1 8 32 128] [--frames 300] [--suspicious 0.1]
+"""
+import argparse
+import gc
+import time
+import numpy as np
+from app.analysis.batch_analysis import BatchBehaviorAnalyzer, BatchRiskEngine
+from app.analysis.behavior import BehaviorAnalyzer
+from app.analysis.risk_engine import RiskEngine
+from app.core.clock import FrameClock
+from app.core.schemas import AudioResult, DetectionResult, FaceResult
+
+OBJECTS = ["cell phone", "book", "headphone", "Cell Phone", "cup", "person"]
+
+def make_frames(sessions: int, frames: int, suspicious: float = 0.1, seed: int = 0) -> list:
+    """
+    frames x sessions results maps, shaped like SystemController.analyze_frame's.
+    Most candidates face the screen alone; a `suspicious` share look around (yaw / pitch
+    drifting across the thresholds), lose the face, show objects and extra people, talk.
+    """
+    rng = np.random.default_rng(seed)
+    flagged = rng.random(sessions) < suspicious
+    drift = np.where(flagged, 0.08, 0.01)
+    yaw = np.zeros(sessions)
+    pitch = np.zeros(sessions)
+    out = []
+    for _ in range(frames):
+        yaw = np.clip(yaw + rng.normal(0, drift), -1, 1) * 0.95
+        pitch = np.clip(pitch + rng.normal(0, drift), -1, 1) * 0.95
+        present = rng.random(sessions) > np.where(flagged, 0.2, 0.01)
+        row = []
+        for s in range(sessions):
+            face = FaceResult(face_present=True, yaw=float(yaw[s]), pitch=float(pitch[s])) if present[s] \
+                else FaceResult(face_present=False)
+            objects = [DetectionResult(label="person", confidence=0.9, box=(0, 0, 10, 10), age=30)]
+            if flagged[s]:
+                objects += [
+                    DetectionResult(label=OBJECTS[k], confidence=0.9, box=(0, 0, 10, 10), age=int(rng.integers(1, 8)))
+                    for k in rng.integers(0, len(OBJECTS), rng.integers(0, 3))
+                ]
+            speech = bool(flagged[s] and rng.random() < 0.05)
+            audio = AudioResult(speech_detected=speech, rms_level=0.01, decibels=float(rng.uniform(-60, -10)))
+            row.append({"face": [face], "object": objects, "audio": audio})
+        out.append(row)
+    return out
+
+def run_scalar(frames: list, sessions: int) -> tuple:
+    clock = FrameClock()
+    analyzers = [BehaviorAnalyzer() for _ in range(sessions)]
+    engines = [RiskEngine(clock=clock) for _ in range(sessions)]
+    outputs, elapsed = [], 0.0
+    for f, row in enumerate(frames):
+        clock.observe(f / 30.0)
+        t0 = time.perf_counter()
+        signals = [analyzers[s].analyze(f / 30.0, row[s]) for s in range(sessions)]
+        events = [engines[s].process(signals[s]) for s in range(sessions)]
+        elapsed += time.perf_counter() - t0
+        outputs.append((signals, events))
+    return outputs, elapsed
+
+def run_batched(frames: list, sessions: int) -> tuple:
+    analyzer = BatchBehaviorAnalyzer(sessions)
+    engine = BatchRiskEngine(sessions)
+    outputs, elapsed = [], 0.0
+    for f, row in enumerate(frames):
+        t0 = time.perf_counter()
+        signals = analyzer.analyze([f / 30.0] * sessions, row)
+        events = engine.process(signals, now=f / 30.0)
+        elapsed += time.perf_counter() - t0
+        outputs.append((signals, events))
+    return outputs, elapsed
+
+def dump(outputs: list) -> list:
+    return [
+        ([[s.model_dump() for s in signals] for signals in frame_signals],
+         [e.model_dump() if e is not None else None for e in events])
+        for frame_signals, events in outputs
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--suspicious", type=float, default=0.1, help="Share of sessions raising signals")
+    args = parser.parse_args()
+
+    print(f"{'sessions':>8}  {'signals':>7}  {'events':>6}  {'scalar us':>9}  {'batched us':>10}  {'speedup':>7}")
+    for sessions in args.sessions:
+        frames = make_frames(sessions, args.frames, args.suspicious)
+        # Both runs keep every output for the comparison: collections over that growing heap
+        # would dominate the timings, so the collector is off while they run
+        gc.disable()
+        scalar, scalar_s = run_scalar(frames, sessions)
+        batched, batched_s = run_batched(frames, sessions)
+        gc.enable()
+        if dump(scalar) != dump(batched):
+            raise SystemExit(f"{sessions} sessions: batched output differs from the scalar analyzer")
+
+        signals = sum(len(s) for frame_signals, _ in scalar for s in frame_signals)
+        events = sum(e is not None for _, frame_events in scalar for e in frame_events)
+        scalar_us = scalar_s / args.frames * 1e6
+        batched_us = batched_s / args.frames * 1e6
+        print(f"{sessions:>8}  {signals:>7}  {events:>6}  {scalar_us:>9.1f}  {batched_us:>10.1f}  {scalar_us / batched_us:>6.2f}x")
+    print("outputs identical")
+
+if __name__ == "__main__":
+    main()
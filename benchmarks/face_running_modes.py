@@ -0,0 +1,81 @@
+"""
+Per-frame FaceDetector latency across MediaPipe running modes on recorded footage.
+
+IMAGE runs full face detection every frame, VIDEO reuses the landmarker's
+tracking between frames, LIVE_STREAM submits asynchronously (process() returns
+the latest completed result, so its latency is the submit cost; "results" counts
+how many frames actually produced a new result).
+
+Usage:
+    python -m benchmarks.face_running_modes path/to/recording.mp4 [--frames 300] [--realtime]
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+from app.config import settings
+from app.core.schemas import FrameData
+from app.detectors.face_detector import FaceDetector, RUNNING_MODES
+
+def load_frames(path, limit):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise SystemExit(f"Could not open {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames, fps
+
+def run_mode(mode, frames, fps, realtime):
+    settings.face.running_mode = mode
+    detector = FaceDetector()
+    detector.warmup()
+
+    latencies = []
+    results_seen = set()
+    faces = 0
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        if realtime:
+            # Pace submissions like a live camera
+            delay = start + i / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        frame_data = FrameData(frame_id=i + 1, timestamp=i / fps, frame=frame)
+        t0 = time.perf_counter()
+        results = detector.process(frame_data)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if id(results) not in results_seen:
+            results_seen.add(id(results))
+            faces += int(results[0].face_present)
+
+    # Let a pending LIVE_STREAM callback finish before the landmarker is torn down
+    time.sleep(0.2)
+    detector.detector.close()
+
+    lat = np.array(latencies)
+    print(f"{mode:<12} mean {lat.mean():6.2f} ms  p50 {np.percentile(lat, 50):6.2f} ms  "
+          f"p95 {np.percentile(lat, 95):6.2f} ms  results {len(results_seen):4d}/{len(frames)}  "
+          f"with face {faces}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", help="Recorded footage (any format OpenCV can decode)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--modes", nargs="+", default=list(RUNNING_MODES), choices=list(RUNNING_MODES))
+    parser.add_argument("--realtime", action="store_true", help="Submit frames at the recording's FPS")
+    args = parser.parse_args()
+
+    frames, fps = load_frames(args.video, args.frames)
+    print(f"{len(frames)} frames from {args.video} @ {fps:.1f} fps, "
+          f"landmarker input width {settings.face.input_width}")
+    for mode in args.modes:
+        run_mode(mode, frames, fps, args.realtime)
+
+if __name__ == "__main__":
+    main()
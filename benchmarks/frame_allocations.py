@@ -0,0 +1,96 @@
+"""
+Allocation benchmark for the capture-to-render path.
+
+Compares the legacy path (fresh capture array, cv2.flip copy, new FrameData,
+RGB copy for the face model, Visualizer .copy(), RGB copy + QImage.copy() in the
+worker) against the FrameRing path, using a synthetic source so no camera is needed.
+
+Usage:
+    python -m benchmarks.frame_allocations [--frames 300] [--width 1280] [--height 720]
+"""
+import argparse
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from app.core.schemas import FrameData
+from app.infrastructure.frame_ring import FrameRing
+from app.infrastructure.visualizer import Visualizer
+
+class SyntheticCapture:
+    """Mimics cv2.VideoCapture.read(): allocates unless an output buffer is given"""
+    def __init__(self, shape):
+        self.shape = shape
+        self.pattern = np.random.randint(0, 255, shape, dtype=np.uint8)
+
+    def read(self, image=None):
+        if image is None:
+            image = np.empty(self.shape, dtype=np.uint8)
+        np.copyto(image, self.pattern)
+        return True, image
+
+def legacy_frame(cap, frame_id):
+    ret, frame = cap.read()
+    frame = cv2.flip(frame, 1)
+    frame_data = FrameData(frame_id=frame_id, timestamp=time.time(), frame=frame)
+    face_rgb = cv2.cvtColor(frame_data.frame, cv2.COLOR_BGR2RGB)   # FaceDetector.process
+    vis = frame_data.frame.copy()                                  # Visualizer.render
+    ui_rgb = cv2.cvtColor(vis, cv2.COLOR_BGR2RGB)                  # ProctorWorker.run
+    return face_rgb, ui_rgb.tobytes()                              # stands in for QImage.copy()
+
+class RingPath:
+    def __init__(self, shape):
+        self.ring = FrameRing(4, shape)
+        self.visualizer = Visualizer()
+
+    def frame(self, cap, frame_id):
+        slot = self.ring.acquire_write()
+        cap.read(slot.buffer)
+        self.ring.publish(slot, frame_id, time.time(), mirrored=True)
+        frame_data = self.ring.lease_latest()
+        try:
+            frame_data.rgb(640)                                    # FaceDetector (memoized view)
+            vis = self.visualizer.render(frame_data, [], [], None, None)
+            return vis.tobytes()                                   # stands in for QImage.copy()
+        finally:
+            self.ring.release(frame_data)
+
+def measure(label, run_frame, frames, frame_bytes):
+    for i in range(10):  # warm up (first-frame allocations are not steady state)
+        run_frame(i)
+
+    tracemalloc.start()
+    total_peak = 0
+    t0 = time.perf_counter()
+    for i in range(frames):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        run_frame(i)
+        _, peak = tracemalloc.get_traced_memory()
+        total_peak += peak - current
+    elapsed = time.perf_counter() - t0
+    tracemalloc.stop()
+
+    per_frame = total_peak / frames
+    print(f"{label:<8} {per_frame / 1e6:8.2f} MB/frame  "
+          f"({per_frame / frame_bytes:4.1f} frame buffers)  {1000 * elapsed / frames:6.2f} ms/frame")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    args = parser.parse_args()
+
+    shape = (args.height, args.width, 3)
+    frame_bytes = args.width * args.height * 3
+    cap = SyntheticCapture(shape)
+    ring_path = RingPath(shape)
+
+    print(f"Transient allocations per frame at {args.width}x{args.height} ({args.frames} frames):")
+    measure("legacy", lambda i: legacy_frame(cap, i), args.frames, frame_bytes)
+    measure("ring", lambda i: ring_path.frame(cap, i), args.frames, frame_bytes)
+    print("(the ring path keeps exactly one copy: the Qt-owned image handed to the UI thread)")
+
+if __name__ == "__main__":
+    main()
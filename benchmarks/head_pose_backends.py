@@ -0,0 +1,156 @@
+"""
+Head pose backends: cost per face and agreement between "matrix" and "pnp",
+plus cold vs warm-started (PnPPoseSolver) PnP over a smooth, noisy trajectory.
+
+Synthetic mode (default, no MediaPipe needed) projects the generic 3D face model
+at known yaw/pitch, feeds the 2D points to the PnP backend and the equivalent
+MediaPipe-convention transformation matrix to the matrix backend, and checks
+both recover the same angles.
+
+Video mode runs the landmarker (with transformation matrices) on a recording
+and compares both backends on the same detections. The two backends use
+different face models, so agreement is also reported after removing the
+mean offset, which is what GazeCalibrator's baseline does.
+
+Usage:
+    python -m benchmarks.head_pose_backends [--video path/to/recording.mp4] [--frames 300]
+"""
+import argparse
+import time
+from types import SimpleNamespace
+import numpy as np
+from app.config import settings
+from app.detectors.head_pose import (
+    POSE_LANDMARK_INDICES, PnPPoseSolver, landmarks_to_points, pnp_head_pose, pose_from_transformation_matrices
+)
+
+# Agreement tolerance, normalized units (0.02 = 1.8 degrees)
+TOLERANCE = 0.02
+
+def rot_x(a):
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+
+def rot_y(a):
+    c, s = np.cos(a), np.sin(a)
+    return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
+
+def synthetic_case(yaw_deg, pitch_deg, width=1280, height=720):
+    """Returns (landmarks, image_shape, matrix) for a face at a known pose"""
+    cam = np.array([[width, 0, width / 2], [0, width, height / 2], [0, 0, 1.0]])
+    model = np.array(settings.face.generic_3d_face_model)
+    r_cv = rot_y(np.radians(yaw_deg)) @ rot_x(np.radians(pitch_deg))
+
+    pts = (cam @ (r_cv @ model.T + np.array([[0.0], [0.0], [2500.0]]))).T
+    pts = pts[:, :2] / pts[:, 2:]
+    landmarks = [SimpleNamespace(x=0.0, y=0.0)] * (max(POSE_LANDMARK_INDICES) + 1)
+    for i, idx in enumerate(POSE_LANDMARK_INDICES):
+        landmarks[idx] = SimpleNamespace(x=pts[i, 0] / width, y=pts[i, 1] / height)
+
+    # Same rotation expressed in MediaPipe's y-up / z-towards-camera convention (with a scale)
+    flip = np.diag([1.0, -1.0, -1.0])
+    matrix = np.eye(4)
+    matrix[:3, :3] = 1.2 * flip @ r_cv @ flip
+    return landmarks, (height, width, 3), matrix
+
+def time_per_call(fn, repeats):
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - t0) / repeats * 1e6
+
+def run_synthetic(repeats):
+    grid = [(y, p) for y in (-25, -12, 0, 12, 25) for p in (-15, -7, 0, 7, 15)]
+    worst = 0.0
+    for yaw_deg, pitch_deg in grid:
+        landmarks, shape, matrix = synthetic_case(yaw_deg, pitch_deg)
+        pnp = np.array(pnp_head_pose(landmarks, shape))
+        mat = pose_from_transformation_matrices(matrix)[0, :2]
+        worst = max(worst, float(np.abs(pnp - mat).max()))
+
+    landmarks, shape, matrix = synthetic_case(12, 7)
+    print(f"pnp    {time_per_call(lambda: pnp_head_pose(landmarks, shape), repeats):8.1f} us/face")
+    print(f"matrix {time_per_call(lambda: pose_from_transformation_matrices(matrix), repeats):8.1f} us/face")
+    run_temporal()
+    print(f"agreement over {len(grid)} poses: max |pnp - matrix| = {worst:.4f} "
+          f"({'OK' if worst <= TOLERANCE else 'FAIL'}, tolerance {TOLERANCE})")
+    return worst <= TOLERANCE
+
+def run_temporal(frames=300, noise_px=0.5, seed=0):
+    """Cold vs warm PnP on a slow head sweep with landmark jitter"""
+    rng = np.random.default_rng(seed)
+    track = []
+    for i in range(frames):
+        landmarks, shape, _ = synthetic_case(20 * np.sin(i / 40), 10 * np.sin(i / 65))
+        points = landmarks_to_points(landmarks, shape) + rng.normal(0, noise_px, (len(POSE_LANDMARK_INDICES), 2))
+        track.append(points)
+
+    for label, make_solver in (("pnp cold", None), ("pnp warm", PnPPoseSolver)):
+        solver = make_solver() if make_solver else None
+        poses = []
+        t0 = time.perf_counter()
+        for points in track:
+            active = solver or PnPPoseSolver()
+            poses.append(active.solve_points(points, shape))
+        elapsed = (time.perf_counter() - t0) / frames * 1e6
+        # Steadiness: frame-to-frame jitter after removing the smooth motion
+        jitter = np.abs(np.diff(np.array(poses), n=2, axis=0)).mean()
+        print(f"{label:<8} {elapsed:8.1f} us/frame  jitter {jitter:.5f}")
+
+def run_video(path, frames):
+    import cv2
+    import mediapipe as mp
+    from app.detectors.face_detector import FaceDetector
+
+    settings.face.pose_backend = "matrix"
+    detector = FaceDetector()
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    pnp_poses, mat_poses, pnp_us, mat_us = [], [], [], []
+    for i in range(frames):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        result = detector._run(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb),
+                               detector._next_timestamp_ms(i / fps))
+        if not result.face_landmarks or not result.facial_transformation_matrixes:
+            continue
+
+        t0 = time.perf_counter()
+        pnp_poses.append(pnp_head_pose(result.face_landmarks[0], rgb.shape))
+        t1 = time.perf_counter()
+        mat_poses.append(pose_from_transformation_matrices(result.facial_transformation_matrixes)[0, :2])
+        t2 = time.perf_counter()
+        pnp_us.append((t1 - t0) * 1e6)
+        mat_us.append((t2 - t1) * 1e6)
+    cap.release()
+
+    if not pnp_poses:
+        print("No faces found.")
+        return False
+    pnp_poses, mat_poses = np.array(pnp_poses), np.array(mat_poses)
+    diff = pnp_poses - mat_poses
+    centered = diff - diff.mean(axis=0)
+    print(f"{len(pnp_poses)} frames with a face")
+    print(f"pnp    {np.mean(pnp_us):8.1f} us/face")
+    print(f"matrix {np.mean(mat_us):8.1f} us/face")
+    print(f"mean |pnp - matrix|  yaw {np.abs(diff[:, 0]).mean():.4f}  pitch {np.abs(diff[:, 1]).mean():.4f}")
+    print(f"after baseline       yaw {np.abs(centered[:, 0]).mean():.4f}  pitch {np.abs(centered[:, 1]).mean():.4f}")
+    print(f"correlation          yaw {np.corrcoef(pnp_poses[:, 0], mat_poses[:, 0])[0, 1]:.3f}  "
+          f"pitch {np.corrcoef(pnp_poses[:, 1], mat_poses[:, 1])[0, 1]:.3f}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", help="Compare on real landmarks from this recording")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    ok = run_video(args.video, args.frames) if args.video else run_synthetic(args.repeats)
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
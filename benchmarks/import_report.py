@@ -0,0 +1,114 @@
+"""
+Cold-start import report, from the interpreter's own `-X importtime` trace.
+
+Imports a target in a fresh interpreter and reports the total import time, the
+slowest top-level packages (cumulative) and the slowest single modules (self),
+and which heavy dependencies got pulled in. Profiles:
+
+    ui       what run.py imports before the home page is shown (must stay light)
+    face     + the controller and the face detector (must not import torch)
+    object   + the controller and the object detector
+    full     + every detector module
+
+Use --save / --compare to track regressions against a stored baseline; the
+script exits with status 1 when a forbidden module is imported or the total
+grows by more than --tolerance.
+
+Usage:
+    python -m benchmarks.import_report [--profile ui] [--top 15] [--save baseline.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import namedtuple
+
+HEAVY = ("torch", "ultralytics", "mediapipe", "sounddevice", "onnxruntime", "openvino", "PyQt6", "cv2")
+
+_CONTROLLER = "import app.core.system_controller; from app.detectors.registry import detector_class; "
+PROFILES = {
+    "ui": ("import app.ui.main_window", ("torch", "ultralytics", "mediapipe", "sounddevice")),
+    "face": (_CONTROLLER + "detector_class('face')", ("torch", "ultralytics")),
+    "object": (_CONTROLLER + "detector_class('object')", ("mediapipe",)),
+    "full": (_CONTROLLER + "[detector_class(m) for m in ('face', 'object', 'audio')]", ()),
+}
+
+ImportRecord = namedtuple("ImportRecord", ["module", "self_us", "cumulative_us", "depth"])
+
+def trace(code: str) -> list:
+    """Runs `code` under -X importtime and parses the trace (stderr)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.strip().splitlines()[-5:])
+        raise SystemExit(f"Import failed:\n{tail}")
+
+    records = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2 # One space, then two per nesting level
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+def summarize(records: list) -> dict:
+    top_level = [r for r in records if r.depth == 0]
+    return {
+        "total_ms": sum(r.cumulative_us for r in top_level) / 1000,
+        "modules": len(records),
+        "packages": {r.module: r.cumulative_us / 1000 for r in top_level},
+        "imported": sorted({r.module.split(".")[0] for r in records}),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="ui")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--save", help="Write this run's summary as a baseline (JSON)")
+    parser.add_argument("--compare", help="Baseline written by --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed total growth vs the baseline")
+    args = parser.parse_args()
+
+    code, forbidden = PROFILES[args.profile]
+    records = trace(code)
+    summary = summarize(records)
+
+    print(f"profile {args.profile}: {summary['total_ms']:.1f} ms, {summary['modules']} modules")
+    print("\nslowest top-level imports (cumulative):")
+    for name, ms in sorted(summary["packages"].items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {ms:9.1f} ms  {name}")
+    print("\nslowest modules (self):")
+    for r in sorted(records, key=lambda r: -r.self_us)[:args.top]:
+        print(f"  {r.self_us / 1000:9.1f} ms  {r.module}")
+    heavy = [name for name in HEAVY if name in summary["imported"]]
+    print(f"\nheavy dependencies imported: {', '.join(heavy) or 'none'}")
+
+    failed = False
+    violations = [name for name in forbidden if name in summary["imported"]]
+    if violations:
+        print(f"FAIL: profile '{args.profile}' must not import {', '.join(violations)}")
+        failed = True
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        growth = summary["total_ms"] / baseline["total_ms"] - 1
+        print(f"vs baseline: {baseline['total_ms']:.1f} ms -> {summary['total_ms']:.1f} ms ({growth:+.0%})")
+        added = sorted(set(summary["imported"]) - set(baseline["imported"]))
+        if added:
+            print(f"newly imported packages: {', '.join(added)}")
+        if growth > args.tolerance:
+            print(f"FAIL: import time grew more than {args.tolerance:.0%}")
+            failed = True
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"baseline written to {args.save}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Multi-session host: N proctoring sessions in one process over shared models.
+
+Each session has its own calibrator, behavior / risk state and frame source; the
+models are loaded once (SessionManager / SharedModels) and YOLO runs are
+micro-batched across sessions. Reports per-session FPS (fair scheduling keeps
+them level), aggregate throughput and the mean YOLO batch size.
+
+Sources are recordings (--video, cycled over the sessions) or synthetic test
+patterns. --as-fast-as-possible plays sources in lock-step (no frame dropped,
+no real-time pacing), which measures capacity; without it sources run at their
+frame rate, which shows whether the host keeps up. --synthetic-backend replaces
+YOLO with the stand-in from benchmarks.multi_stream (object module only), so the
+scheduler can be exercised without model files.
+
+Usage:
+    python -m benchmarks.multi_session [--sessions 4] [--video a.mp4 b.mp4] [--frames 300]
+                                       [--modules face object] [--as-fast-as-possible] [--synthetic-backend]
+"""
+import argparse
+import time
+import numpy as np
+from app.config import settings
+from app.core.session_manager import SessionManager
+from app.infrastructure.file_camera import FileCamera, SyntheticCamera
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--video", nargs="+", help="Recordings, assigned to sessions in turn")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per synthetic source")
+    parser.add_argument("--modules", nargs="+", default=["face", "object"])
+    parser.add_argument("--workers", type=int, help="Default: settings.execution.session_workers")
+    parser.add_argument("--as-fast-as-possible", action="store_true")
+    parser.add_argument("--synthetic-backend", action="store_true")
+    args = parser.parse_args()
+
+    realtime = not args.as_fast_as_possible
+    backend = None
+    if args.synthetic_backend:
+        from benchmarks.multi_stream import SyntheticBackend
+        backend = SyntheticBackend()
+        args.modules = [m for m in args.modules if m != "face"]
+
+    manager = SessionManager(modules=args.modules, workers=args.workers, object_backend=backend)
+    for i in range(args.sessions):
+        if args.video:
+            camera = FileCamera(args.video[i % len(args.video)], realtime=realtime)
+        else:
+            camera = SyntheticCamera(frames=args.frames, realtime=realtime, seed=i)
+        manager.add_session(f"session-{i + 1}", camera)
+
+    print(f"{args.sessions} sessions, modules {args.modules}, "
+          f"{'lock-step' if args.as_fast_as_possible else 'real-time'} sources")
+    t0 = time.perf_counter()
+    manager.start()
+    while not manager.wait(timeout=1.0):
+        stats = manager.stats()
+        print("  " + "  ".join(f"{sid} {s['fps']:5.1f}" for sid, s in stats.items()))
+    elapsed = time.perf_counter() - t0
+    stats = manager.stats()
+    batcher = manager.shared.batcher
+    manager.close()
+
+    frames = sum(s["frames"] for s in stats.values())
+    per_session = np.array([s["frames"] / elapsed for s in stats.values()])
+    print(f"\n{frames} frames in {elapsed:.2f} s: {frames / elapsed:.1f} frames/s total")
+    print(f"per session: mean {per_session.mean():.1f} fps, min {per_session.min():.1f}, max {per_session.max():.1f}")
+    print("dropped frames: " + ", ".join(f"{sid} {s['dropped_frames']}" for sid, s in stats.items()))
+    if batcher is not None:
+        print(f"mean YOLO batch {batcher.mean_batch_size:.2f} over {batcher.batches} batches "
+              f"(max {settings.execution.batch_max_size})")
+
+if __name__ == "__main__":
+    main()
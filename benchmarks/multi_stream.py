@@ -0,0 +1,99 @@
+"""
+Multi-stream object detection: one shared model, with and without micro-batching.
+
+Each stream is a thread with its own ObjectDetector (own tracker and cadence) sharing
+one backend, the way several webcams on a test-center PC would. Every stream runs
+YOLO on every frame. The model owner's detect_batch() sits behind a MicroBatcher:
+
+    serial    max_batch=1: the streams take turns on the model, one image per call
+    batched   max_batch=N: frames arriving within --window-ms run as one forward pass
+
+With --model the real backend from settings.objects is used (ultralytics batches
+natively; ONNX / OpenVINO only when exported with a dynamic batch dimension).
+Without it a synthetic backend stands in: a fixed per-call latency (--call-ms, the
+overhead batching amortizes: dispatch, thread fan-out, device sync) plus a
+per-image OpenCV cost.
+
+Usage:
+    python -m benchmarks.multi_stream [--model] [--streams 1 2 4 8] [--frames 60] [--window-ms 5] [--call-ms 8]
+"""
+import argparse
+import threading
+import time
+import cv2
+import numpy as np
+from app.config import settings
+from app.core.batch_scheduler import MicroBatcher
+from app.core.schemas import FrameData
+from app.detectors.object_backends import ObjectBackend
+from app.detectors.object_detector import ObjectDetector
+
+class SyntheticBackend(ObjectBackend):
+    """Per-call latency + per-image work, releasing the GIL like a real runtime"""
+    name = "synthetic"
+
+    def __init__(self, imgsz: int = 320, call_ms: float = 8.0, image_kernel: int = 9):
+        super().__init__(imgsz)
+        self.names = {0: "person", 67: "cell phone"}
+        self.call_s, self.image_kernel = call_ms / 1000, image_kernel
+
+    @property
+    def dynamic_batch(self) -> bool:
+        return True
+
+    def _forward(self, blob):
+        time.sleep(self.call_s)
+        for image in blob:
+            cv2.GaussianBlur(image[0], (self.image_kernel, self.image_kernel), 0)
+        return np.zeros((len(blob), 84, 100), dtype=np.float32)
+
+def run(streams: int, frames: list, backend, max_batch: int, window_ms: float) -> tuple:
+    owner = ObjectDetector(backend=backend)
+    batcher = MicroBatcher(owner.detect_batch, max_batch=max_batch, window_ms=window_ms)
+    detectors = [ObjectDetector(backend=backend, batcher=batcher) for _ in range(streams)]
+
+    def stream(detector: ObjectDetector):
+        for i, frame in enumerate(frames):
+            detector.detect(FrameData(frame_id=i + 1, timestamp=i / 30.0, frame=frame))
+
+    threads = [threading.Thread(target=stream, args=(d,)) for d in detectors]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+    batcher.close()
+    return streams * len(frames) / elapsed, batcher.mean_batch_size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", action="store_true", help="Use the configured YOLO backend")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--frames", type=int, default=60, help="Frames per stream")
+    parser.add_argument("--window-ms", type=float, default=settings.execution.batch_window_ms)
+    parser.add_argument("--call-ms", type=float, default=8.0, help="Synthetic per-call latency")
+    args = parser.parse_args()
+
+    # Every frame is a YOLO frame: measure inference, not the tracker
+    settings.objects.detect_every_n_frames = 1
+    settings.objects.detect_interval_s = None
+    settings.objects.cascade = False
+
+    if args.model:
+        backend = ObjectDetector().backend
+        backend.warmup()
+    else:
+        backend = SyntheticBackend(call_ms=args.call_ms)
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(args.frames)]
+
+    print(f"backend {backend.name} (batched forward: {backend.dynamic_batch}), {args.frames} frames/stream")
+    print(f"{'streams':>7}  {'serial fps':>10}  {'batched fps':>11}  {'mean batch':>10}  {'speedup':>7}")
+    for streams in args.streams:
+        serial, _ = run(streams, frames, backend, max_batch=1, window_ms=0.0)
+        batched, mean_batch = run(streams, frames, backend, max_batch=streams, window_ms=args.window_ms)
+        print(f"{streams:>7}  {serial:>10.1f}  {batched:>11.1f}  {mean_batch:>10.2f}  {batched / serial:>6.2f}x")
+
+if __name__ == "__main__":
+    main()
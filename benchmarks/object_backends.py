@@ -0,0 +1,141 @@
+"""
+Object detection backends on the same frames: latency per frame and agreement
+with the ultralytics (PyTorch eager) reference.
+
+Every backend goes through the shared letterbox / NMS in ObjectBackend, so any
+disagreement comes from the runtime itself (and quantization, for INT8).
+Detections are matched to the reference greedily by label and IoU.
+
+Missing exported models can be produced on the fly:
+    --export    runs `yolo export` for the onnx / openvino / torchscript backends
+    --quantize  builds the INT8 ONNX model (static, calibrated on the first frames)
+
+Usage:
+    python -m benchmarks.object_backends --video path/to/recording.mp4 [--frames 200]
+        [--backends ultralytics onnxruntime openvino torchscript] [--int8] [--export] [--quantize]
+"""
+import argparse
+import os
+import time
+import cv2
+import numpy as np
+from app.config import settings
+from app.core.schemas import FrameData
+from app.detectors.box_tracker import iou_matrix
+from app.detectors.object_backends import OBJECT_BACKENDS, create_backend, default_model_path, quantize_onnx
+from app.detectors.object_detector import ObjectDetector
+
+# A detection agrees with the reference if the labels match and IoU >= this
+MATCH_IOU = 0.9
+
+EXPORT_FORMATS = {"onnxruntime": "onnx", "openvino": "openvino", "torchscript": "torchscript"}
+
+def load_frames(path, limit):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise SystemExit(f"Could not open {path}")
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+def export_missing(backends, imgsz):
+    cfg = settings.objects
+    for backend in backends:
+        if backend in EXPORT_FORMATS and not os.path.exists(default_model_path(backend, cfg.model_path)):
+            from ultralytics import YOLO
+            YOLO(cfg.model_path).export(format=EXPORT_FORMATS[backend], imgsz=imgsz)
+
+def run_backend(label, backend, frames, repeats):
+    detector = ObjectDetector(backend=backend)
+    backend.warmup()
+
+    latencies = []
+    outputs = []
+    for i, frame in enumerate(frames):
+        frame_data = FrameData(frame_id=i + 1, timestamp=i / 30.0, frame=frame)
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            detections = detector._infer(frame_data)
+        latencies.append((time.perf_counter() - t0) / repeats * 1000)
+        outputs.append(detections)
+    return label, np.array(latencies), outputs
+
+def agreement(reference, outputs):
+    """(matched, reference total, candidate total) over all frames"""
+    matched = ref_total = out_total = 0
+    for ref, out in zip(reference, outputs):
+        ref_total += len(ref)
+        out_total += len(out)
+        if not ref or not out:
+            continue
+        iou = iou_matrix(np.array([d.box for d in ref], dtype=np.float64), np.array([d.box for d in out], dtype=np.float64))
+        for ri, rd in enumerate(ref):
+            for oi, od in enumerate(out):
+                if rd.label != od.label:
+                    iou[ri, oi] = 0.0
+        used = set()
+        for ri in range(len(ref)):
+            oi = int(iou[ri].argmax())
+            if iou[ri, oi] >= MATCH_IOU and oi not in used:
+                used.add(oi)
+                matched += 1
+    return matched, ref_total, out_total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", required=True, help="Recorded footage (any format OpenCV can decode)")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=1, help="Inferences per frame (timing only)")
+    parser.add_argument("--backends", nargs="+", default=list(OBJECT_BACKENDS), choices=list(OBJECT_BACKENDS))
+    parser.add_argument("--int8", action="store_true", help="Also run the INT8 ONNX model")
+    parser.add_argument("--export", action="store_true", help="Export missing models with ultralytics")
+    parser.add_argument("--quantize", action="store_true", help="Build the INT8 ONNX model if missing")
+    parser.add_argument("--calibration-frames", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    cfg = settings.objects
+    frames = load_frames(args.video, args.frames)
+    print(f"{len(frames)} frames from {args.video}, input width {cfg.input_width}, imgsz {cfg.imgsz}")
+
+    if args.export:
+        export_missing(args.backends + (["onnxruntime"] if args.int8 or args.quantize else []), cfg.imgsz)
+    int8_path = default_model_path("onnxruntime", cfg.model_path, quantized=True)
+    if args.quantize and not os.path.exists(int8_path):
+        calibration = [
+            FrameData(frame_id=i, timestamp=0.0, frame=f).view("bgr", cfg.input_width)
+            for i, f in enumerate(frames[:args.calibration_frames])
+        ]
+        quantize_onnx(default_model_path("onnxruntime", cfg.model_path), int8_path, calibration, cfg.imgsz)
+
+    runs = [(name, dict(quantized=False)) for name in args.backends]
+    if args.int8 or args.quantize:
+        runs.append(("onnxruntime", dict(quantized=True)))
+
+    results = []
+    for name, options in runs:
+        label = f"{name}{'-int8' if options['quantized'] else ''}"
+        try:
+            backend = create_backend(name, cfg.model_path, imgsz=cfg.imgsz, num_threads=args.threads, **options)
+        except (ImportError, FileNotFoundError) as e:
+            print(f"{label:<16} skipped: {e}")
+            continue
+        results.append(run_backend(label, backend, frames, args.repeats))
+
+    reference = next((r for r in results if r[0] == "ultralytics"), results[0] if results else None)
+    if reference is None:
+        return
+    print(f"Agreement vs {reference[0]} (label match, IoU >= {MATCH_IOU})")
+    for label, lat, outputs in results:
+        matched, ref_total, out_total = agreement(reference[2], outputs)
+        print(f"{label:<16} mean {lat.mean():7.2f} ms  p50 {np.percentile(lat, 50):7.2f} ms  "
+              f"p95 {np.percentile(lat, 95):7.2f} ms  detections {out_total:5d}  "
+              f"matched {matched:5d}/{ref_total}")
+
+if __name__ == "__main__":
+    main()
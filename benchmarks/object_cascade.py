@@ -0,0 +1,72 @@
+"""
+Cascaded phone detection vs single-pass YOLO on the same frames.
+
+Compares a single pass at the cascade's scan size, a single pass at full size
+and the cascade (scan + native-resolution crops). Reports latency and how many
+frames contain a phone, using the full-size pass as the recall reference.
+
+Usage:
+    python -m benchmarks.object_cascade --video path/to/recording.mp4 [--frames 200]
+"""
+import argparse
+import time
+import numpy as np
+from app.config import settings
+from app.core.schemas import FrameData
+from app.detectors.object_backends import create_backend
+from app.detectors.object_detector import ObjectDetector
+from benchmarks.object_backends import load_frames
+
+PHONE = "cell phone"
+
+def run(label, detector, frames, cascade, imgsz):
+    """Single pass at `imgsz` (frame downscaled to that width), or the cascade"""
+    settings.objects.cascade = cascade
+    settings.objects.input_width = imgsz
+    if detector.backend.dynamic_input:
+        detector.backend.imgsz = imgsz
+    latencies = []
+    phone_frames = set()
+    for i, frame in enumerate(frames):
+        frame_data = FrameData(frame_id=i + 1, timestamp=i / 30.0, frame=frame)
+        t0 = time.perf_counter()
+        detections = detector._infer(frame_data)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if any(d.label == PHONE for d in detections):
+            phone_frames.add(i)
+    return label, np.array(latencies), phone_frames
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", required=True, help="Recorded footage (any format OpenCV can decode)")
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    cfg = settings.objects
+    frames = load_frames(args.video, args.frames)
+    backend = create_backend(cfg.backend, cfg.model_path, imgsz=cfg.imgsz, num_threads=cfg.num_threads,
+                             quantized=cfg.quantized, backend_model_path=cfg.backend_model_path)
+    backend.warmup()
+    if not backend.dynamic_input:
+        print(f"Note: '{backend.name}' has a fixed input size, every pass is letterboxed to {backend.imgsz}")
+
+    scan_size, full_size = cfg.cascade_scan_imgsz, cfg.imgsz
+    detector = ObjectDetector(backend=backend)
+    runs = [
+        run(f"single {scan_size}", detector, frames, False, scan_size),
+        run(f"single {full_size}", detector, frames, False, full_size),
+        run("cascade", detector, frames, True, full_size),
+    ]
+    crops = detector.cascade_crops
+
+    reference = runs[1][2]
+    print(f"{len(frames)} frames, reference: single {full_size} ({len(reference)} frames with a phone)")
+    for label, lat, phones in runs:
+        recall = len(phones & reference) / len(reference) if reference else float("nan")
+        print(f"{label:<12} mean {lat.mean():7.2f} ms  p95 {np.percentile(lat, 95):7.2f} ms  "
+              f"phone frames {len(phones):4d}  recall vs reference {recall:.0%}")
+    print(f"cascade crops {crops} ({crops / max(len(frames), 1):.2f}/frame), "
+          f"detections added by stage two {detector.cascade_confirmed}")
+
+if __name__ == "__main__":
+    main()
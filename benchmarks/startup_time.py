@@ -0,0 +1,69 @@
+"""
+Model startup: sequential vs concurrent load + warmup (ModelRegistry.load_async).
+
+Loads the face landmarker and the object detector the way SystemController did
+before (one after the other) and the way it does now (concurrently, each warmed
+on its own loader thread), then the cached path a second exam session takes.
+Each mode uses a fresh registry; --repeat runs alternate the order to even out
+disk-cache effects.
+
+Usage:
+    python -m benchmarks.startup_time [--repeat 3]
+"""
+import argparse
+import time
+from concurrent.futures import wait
+import numpy as np
+from app.core.model_registry import ModelRegistry
+from app.detectors.face_detector import FaceDetector
+from app.detectors.object_detector import ObjectDetector
+
+FACTORIES = {"face": FaceDetector, "object": ObjectDetector}
+
+def load_sequential() -> float:
+    registry = ModelRegistry()
+    t0 = time.perf_counter()
+    for name, factory in FACTORIES.items():
+        registry.get(name, factory)
+    elapsed = time.perf_counter() - t0
+    registry.clear()
+    return elapsed
+
+def load_concurrent() -> tuple:
+    registry = ModelRegistry()
+    t0 = time.perf_counter()
+    futures = {name: registry.load_async(name, factory) for name, factory in FACTORIES.items()}
+    wait(list(futures.values()))
+    elapsed = time.perf_counter() - t0
+
+    # Second session: every model is cached
+    t1 = time.perf_counter()
+    wait([registry.load_async(name, factory) for name, factory in FACTORIES.items()])
+    cached = time.perf_counter() - t1
+    per_model = dict(registry.load_times)
+    registry.clear()
+    return elapsed, cached, per_model
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sequential, concurrent, cached = [], [], []
+    for i in range(args.repeat):
+        if i % 2:
+            sequential.append(load_sequential())
+            c, h, per_model = load_concurrent()
+        else:
+            c, h, per_model = load_concurrent()
+            sequential.append(load_sequential())
+        concurrent.append(c)
+        cached.append(h)
+        print(f"run {i + 1}: " + ", ".join(f"{k} {v:.2f} s" for k, v in per_model.items()))
+
+    print(f"sequential load+warmup {np.mean(sequential):6.2f} s")
+    print(f"concurrent load+warmup {np.mean(concurrent):6.2f} s  ({np.mean(sequential) / np.mean(concurrent):.2f}x)")
+    print(f"cached (next session)  {np.mean(cached) * 1000:6.2f} ms")
+
+if __name__ == "__main__":
+    main()